@@ -1,8 +1,11 @@
+from numpy import set_printoptions
+
 from mmcp import lm, cm
 from mmcp.data import generate_linear_model_data, generate_combinatorial_model_data
 
 
 def main():
+    set_printoptions(precision=2, suppress=True)
     linear_data = generate_linear_model_data()
     combinatorial_data = generate_combinatorial_model_data()
     first_linear_data = {k: list(v)[0] for k, v in linear_data._asdict().items()}
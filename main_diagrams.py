@@ -1,72 +1,55 @@
-from matplotlib.lines import Line2D
-from matplotlib.pyplot import subplots, savefig, show, legend, tight_layout
-from numpy import linspace, mean, isnan
+from itertools import groupby
+from os import makedirs
+from os.path import join
+from sys import argv
 
-from mmcp.core import Solver
-from mmcp.data import generate_model_data
-from mmcp.utils import ModelType, Criterion, is_valid_combination, ith_data, measure_execution_time, LOGGER
+from matplotlib.figure import Figure
 
+from mmcp.benchmark import QUICK_SWEEPS, sweep_cases, run_benchmark, load_results, save_results
+from mmcp.utils import LOGGER
 
-def generate_performance_diagrams(iterations: int = 10, threads: int = 1, root: str = r".\docs\diagrams\performance"):
-    """Generates and saves performance diagrams for different model types and criteria.
+STAGE_STYLES = {"total": ("m", "-"), "build": ("tab:blue", "--"), "solve": ("tab:green", ":")}
+
+
+def generate_performance_diagrams(results: dict = None, root: str = join("docs", "diagrams", "performance"),
+                                  quick: bool = False, repeats: int = 5):
+    """Saves performance diagrams of benchmark results, one per model type, criterion and swept size.
 
     Args:
-        iterations: Number of iterations for time measurement.
-        threads: Number of threads to use for data generation (not used in current implementation).
+        results: The benchmark results (see ``mmcp.benchmark``); the benchmark is run if not given.
         root: Root directory to save the diagrams.
+        quick: Whether the benchmark sweeps fewer and smaller sizes (if it is run).
+        repeats: Number of measured runs of every case (if the benchmark is run).
     """
-    num_vars_range = linspace(1, 100, 50, dtype=int)
-
-    for model_type in ModelType:
-        for criterion in Criterion:
-            if not is_valid_combination(model_type, criterion) or criterion == Criterion.CRITERION_3 or \
-                    model_type in (ModelType.LINEAR_MODEL_3, ModelType.COMBINATORIAL_MODEL):
-                continue
-
-            fig, ax = subplots(1, 1, figsize=(16, 10), dpi=150)
-            fig.suptitle(f"Performance: {str(model_type)} - {str(criterion)}")
-
-            times = list()
-            if model_type.name.lower().startswith("linear"):
-                for num_vars in num_vars_range:
-                    LOGGER.info(f"Solving for {str(model_type)} and {str(criterion)} with {num_vars} variables")
-
-                    data = generate_model_data(num_elements=1, num_vars=num_vars, threads=threads)
-                    while data.d[0] is None:  # Retry if data generation fails
-                        data = generate_model_data(num_elements=1, num_vars=num_vars, threads=threads)
-                    data = ith_data(data, 0)
-                    solver = Solver(data, model_type, criterion)
-                    execution_times = measure_execution_time(solver, iterations=iterations)
-                    times.append(execution_times)
-
-                mean_times = mean(times, axis=1)
-                last_valid_idx = 0
-                for i, time_ms in enumerate(mean_times):
-                    if isnan(time_ms):
-                        continue
-
-                    if i > last_valid_idx + 1:
-                        ax.plot([num_vars_range[last_valid_idx], num_vars_range[i]],
-                                [mean_times[last_valid_idx], time_ms], linestyle="--", color="gray", linewidth=5)
-                    else:
-                        ax.plot([num_vars_range[last_valid_idx], num_vars_range[i]],
-                                [mean_times[last_valid_idx], time_ms], color="m", alpha=.5,
-                                linewidth=5)
-                    last_valid_idx = i
-
-                ax.boxplot(times, positions=num_vars_range, showfliers=False, widths=.5)
-
-                ax.set_xlabel("Number of Variables")
-                ax.set_ylabel("Time (seconds)")
-                ax.set_title("Linear Model Performance")
-                legend(handles=[Line2D([0], [0], color="m", lw=2, label="Mean"),
-                                Line2D([0], [0], color="gray", lw=2, linestyle="--", label="Outliers")])
-                tight_layout()
-                filename = f"{root}\\{model_type.name}_{criterion.name}_[{num_vars_range[0]};{num_vars_range[-1]}].png"
-                savefig(filename)
-                show()
-                LOGGER.info(f"Performance diagram for {model_type} and {criterion} saved to {filename}...")
+    makedirs(root, exist_ok=True)
+    if results is None:
+        results = run_benchmark(sweep_cases(sweeps=QUICK_SWEEPS if quick else None), repeats=repeats)
+        save_results(join(root, "benchmark.json"), results)
+
+    key = lambda record: (record["model_type"], record["criterion"], record["sweep"], record.get("lp_backend") or "")
+    for (model_type, criterion, sweep, lp_backend), records in groupby(sorted(results["results"], key=key), key=key):
+        records = sorted(records, key=lambda record: record[sweep])
+
+        fig = Figure(figsize=(16, 10), dpi=150)
+        ax = fig.add_subplot()
+        fig.suptitle(f"Performance: {model_type} - {criterion}{f" ({lp_backend})" if lp_backend else ""}")
+        for stage, (color, linestyle) in STAGE_STYLES.items():
+            points = [(record[sweep], record[stage]["median"]) for record in records if record[stage] is not None]
+            if points:
+                ax.plot(*zip(*points), color=color, linestyle=linestyle, marker="o", linewidth=3,
+                        label=f"{stage.capitalize()} (median)")
+        failed = [record[sweep] for record in records if record["total"] is None]
+        if failed:
+            ax.scatter(failed, [0] * len(failed), color="gray", marker="x", s=100, label="Failed")
+
+        ax.set_xlabel(sweep.replace("_", " ").capitalize())
+        ax.set_ylabel("Time (seconds)")
+        ax.legend()
+        fig.tight_layout()
+        filename = join(root, f"{model_type}_{criterion}_{f"{lp_backend}_" if lp_backend else ""}{sweep}.png")
+        fig.savefig(filename)
+        LOGGER.info(f"Performance diagram for {model_type} and {criterion} over {sweep} saved to {filename}...")
 
 
 if __name__ == "__main__":
-    generate_performance_diagrams()
+    generate_performance_diagrams(load_results(argv[1]) if len(argv) > 1 else None)
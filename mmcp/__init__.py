@@ -1,14 +1,21 @@
-from .utils import LOGGER
-from . import combinatorial_models as cm
-from . import core
-from . import data
-from . import linear_models as lm
-from . import ui
-from . import utils
+from .utils.lazy import lazy_exports
+from .utils.logger_setup import LOGGER
+
+# The subpackages are imported on first access, so the headless entry points never load PyQt5 or matplotlib
+__getattr__, __dir__ = lazy_exports(__name__, dict(), {
+    "benchmark": ".benchmark",
+    "cm": ".combinatorial_models",
+    "lm": ".linear_models",
+    "core": ".core",
+    "data": ".data",
+    "utils": ".utils",
+    "ui": ".ui",
+})
 
 LOGGER.debug(f"Initialized {__name__}")
 
 __all__ = [
+    "benchmark",
     "cm",
     "lm",
     "core",
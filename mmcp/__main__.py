@@ -0,0 +1,195 @@
+from argparse import ArgumentParser, ArgumentTypeError
+from ast import literal_eval
+from os import listdir, makedirs
+from os.path import isdir, isfile, join, basename, dirname, splitext, normpath, realpath
+from sys import exit as sys_exit, stderr
+from time import perf_counter
+
+from mmcp.core import solve_all
+from mmcp.core.batch import BACKENDS
+from mmcp.data import parse_data_file, generate_data_file
+from mmcp.data.binary_format import ARCHIVE_EXTENSIONS, MANIFEST_NAME
+from mmcp.linear_models.backends import AUTO, LP_BACKENDS
+from mmcp.utils import Vars, ModelType, Criterion
+
+DATA_EXTENSIONS = (".json", *ARCHIVE_EXTENSIONS)
+SOLUTION_SUFFIX = ".solution"
+
+
+def _enum_value(enum):
+    """Parses a member of the enum by its name (case-insensitive) or its number."""
+
+    def parse(text: str):
+        try:
+            return enum(int(text)) if text.strip().isdigit() else enum[text.strip().upper()]
+        except (KeyError, ValueError):
+            raise ArgumentTypeError(f"expected one of {[member.name for member in enum]} or their numbers, "
+                                    f"got \"{text}\"")
+
+    parse.__name__ = enum.__name__
+    return parse
+
+
+def _override(enum):
+    """Parses an ``ELEMENT=VALUE`` override of a single element (numbered from 1)."""
+    parse_value = _enum_value(enum)
+
+    def parse(text: str):
+        element, separator, value = text.partition("=")
+        if not separator or not element.strip().isdigit() or int(element) < 1:
+            raise ArgumentTypeError(f"expected ELEMENT=VALUE with an element number from 1, got \"{text}\"")
+        return int(element) - 1, parse_value(value)
+
+    parse.__name__ = f"{enum.__name__} override"
+    return parse
+
+
+def _parameter(text: str):
+    """Parses a ``NAME=VALUE`` assignment of a configuration parameter (see ``Vars``)."""
+    name, separator, value = text.partition("=")
+    if not separator or name.startswith("_") or not hasattr(Vars, name):
+        raise ArgumentTypeError(f"expected NAME=VALUE with a parameter of Vars, got \"{text}\"")
+    try:
+        return name, literal_eval(value)
+    except (ValueError, SyntaxError):
+        return name, value  # A plain string, like scheduling_method=exact
+
+
+def _arguments(argv=None):
+    parser = ArgumentParser(prog="python -m mmcp",
+                            description="Solves the elements of MMCP data files (JSON or binary) without the GUI and "
+                                        "writes their solutions.")
+    parser.add_argument("inputs", nargs="+",
+                        help="Data files, binary data directories, or directories of data files to solve.")
+    parser.add_argument("-o", "--output", default="solutions", help="The directory the solutions are written to.")
+    parser.add_argument("-f", "--format", default="json", choices=("json", "npz"), help="The solution file format.")
+    parser.add_argument("-w", "--workers", type=int, help="The number of workers (the number of CPUs by default).")
+    parser.add_argument("--backend", default="process", choices=BACKENDS, help="Solve in processes or threads.")
+    parser.add_argument("--lp-backend", type=str.upper, choices=[AUTO.upper(), *LP_BACKENDS],
+                        help="The LP backend of the linear models.")
+    parser.add_argument("--combine", action="store_true",
+                        help="Solve the elements of the first and the second linear models as block-diagonal LPs.")
+    parser.add_argument("--elements", nargs="+", type=int, help="Only solve these elements (numbered from 1).")
+    parser.add_argument("--model-type", type=_enum_value(ModelType), help="The model type of every element.")
+    parser.add_argument("--criterion", type=_enum_value(Criterion), help="The criterion of every element.")
+    parser.add_argument("--element-model-type", action="append", default=list(), type=_override(ModelType),
+                        metavar="ELEMENT=MODEL_TYPE", help="The model type of a single element (repeatable).")
+    parser.add_argument("--element-criterion", action="append", default=list(), type=_override(Criterion),
+                        metavar="ELEMENT=CRITERION", help="The criterion of a single element (repeatable).")
+    parser.add_argument("--set", action="append", default=list(), type=_parameter, metavar="NAME=VALUE",
+                        help="Sets a configuration parameter of Vars, like z_min=0.05 (repeatable).")
+    return parser.parse_args(argv)
+
+
+def _is_data_path(path: str) -> bool:
+    if isdir(path):
+        return isfile(join(path, MANIFEST_NAME))
+    name = basename(path).lower()
+    return name.endswith(DATA_EXTENSIONS) and splitext(splitext(name)[0])[1] != SOLUTION_SUFFIX
+
+
+def data_paths(inputs) -> list[str]:
+    """
+    Expands the inputs to data paths: files and binary data directories are kept, other directories are replaced by
+    their data files and binary data directories (not recursively, and without solution files).
+    """
+    paths = list()
+    for path in inputs:
+        if isdir(path) and not isfile(join(path, MANIFEST_NAME)):
+            paths += [join(path, name) for name in sorted(listdir(path)) if _is_data_path(join(path, name))]
+        else:
+            paths.append(path)
+    return paths
+
+
+def solution_path(path: str, arguments) -> str:
+    """
+    The solution file of a data path: ``<output>/<name>.solution.<format>``, where the name keeps the extension of the
+    input (``a.json`` and ``a.npz`` give ``a.json.solution.json`` and ``a.npz.solution.json``) and a manifest stands
+    for its directory.
+    """
+    path = normpath(path)
+    name = basename(dirname(path)) if basename(path) == MANIFEST_NAME else basename(path)
+    return join(arguments.output, f"{name}{SOLUTION_SUFFIX}.{arguments.format}")
+
+
+def _overridden(values, default, overrides, num_elements: int) -> list[int]:
+    """The per-element values of the data, with the value for every element and the single-element overrides."""
+    values = [int(value) for value in values] if default is None else [int(default)] * num_elements
+    for i, value in overrides:
+        if i >= num_elements:
+            raise IndexError(f"Element {i + 1} does not exist, the data has {num_elements} elements.")
+        values[i] = int(value)
+    return values
+
+
+def solve_file(path: str, arguments) -> bool:
+    """
+    Solves the elements of a data file and writes their solutions.
+
+    Returns:
+        Whether every element was solved.
+    """
+    start = perf_counter()
+    try:
+        data = parse_data_file(path)
+        num_elements = len(data.c)
+        model_types = _overridden(data.model_types, arguments.model_type, arguments.element_model_type, num_elements)
+        criteria = _overridden(data.criteria, arguments.criterion, arguments.element_criterion, num_elements)
+        elements = None
+        if arguments.elements is not None:
+            elements = sorted({element - 1 for element in arguments.elements})
+            if elements[0] < 0 or elements[-1] >= num_elements:
+                raise IndexError(f"Elements are numbered from 1 to {num_elements}.")
+
+        failures = dict()
+        solution = solve_all(data, arguments.workers, arguments.backend, elements, model_types, criteria,
+                             on_error=failures.__setitem__, combine=arguments.combine)
+
+        makedirs(arguments.output, exist_ok=True)
+        output = solution_path(path, arguments)
+        generate_data_file(output, data=solution)
+    except Exception as e:
+        print(f"{path}: failed: {e}", file=stderr, flush=True)
+        return False
+
+    for i, error in sorted(failures.items()):
+        print(f"{path}: Element {i + 1} failed: {error}", file=stderr)
+    print(f"{path}: {len(solution.values)} solved, {len(failures)} failed in {perf_counter() - start:.3f}s -> "
+          f"{output}", flush=True)
+    return not failures
+
+
+def main(argv=None) -> int:
+    arguments = _arguments(argv)
+    for name, value in arguments.set:
+        setattr(Vars, name, value)
+    if arguments.lp_backend is not None:
+        Vars.lp_backend = arguments.lp_backend
+
+    paths, seen = list(), set()
+    for path in data_paths(arguments.inputs):  # A file given twice (directly and in its directory) is solved once
+        if realpath(path) not in seen:
+            seen.add(realpath(path))
+            paths.append(path)
+    if not paths:
+        print("No data files found.", file=stderr)
+        return 1
+
+    # Inputs with the same name in different directories would overwrite each other's solutions
+    outputs = dict()
+    for path in paths:
+        outputs.setdefault(solution_path(path, arguments), list()).append(path)
+    collisions = {output: inputs for output, inputs in outputs.items() if len(inputs) > 1}
+    for output, inputs in collisions.items():
+        print(f"{', '.join(inputs)}: the solutions would all be written to {output}; solve them separately or with "
+              f"different -o directories.", file=stderr)
+    if collisions:
+        return 1
+    failed = [path for path in paths if not solve_file(path, arguments)]
+    print(f"{len(paths) - len(failed)} of {len(paths)} files solved completely")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys_exit(main())
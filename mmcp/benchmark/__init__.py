@@ -0,0 +1,30 @@
+from .cases import (BenchmarkCase, SIZE_FIELDS, DEFAULT_SIZES, SWEEPS, QUICK_SWEEPS, benchmark_pairs, sweep_cases,
+                    make_instance)
+from .imports import IMPORT_MODULES, ImportRegression, measure_import, run_import_benchmark, compare_imports
+from .results import Regression, save_results, load_results, compare_results
+from .runner import run_case, run_benchmark
+from ..utils.logger_setup import LOGGER
+
+LOGGER.debug(f"Initialized {__name__}")
+
+__all__ = [
+    "BenchmarkCase",
+    "SIZE_FIELDS",
+    "DEFAULT_SIZES",
+    "SWEEPS",
+    "QUICK_SWEEPS",
+    "benchmark_pairs",
+    "sweep_cases",
+    "make_instance",
+    "run_case",
+    "run_benchmark",
+    "Regression",
+    "save_results",
+    "load_results",
+    "compare_results",
+    "IMPORT_MODULES",
+    "ImportRegression",
+    "measure_import",
+    "run_import_benchmark",
+    "compare_imports",
+]
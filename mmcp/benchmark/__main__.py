@@ -0,0 +1,89 @@
+from argparse import ArgumentParser
+from sys import exit as sys_exit
+
+from mmcp.linear_models.backends import AUTO, LP_BACKENDS
+from mmcp.utils import ModelType, Criterion
+from .imports import IMPORT_MODULES, run_import_benchmark, compare_imports
+from .cases import SWEEPS, QUICK_SWEEPS, benchmark_pairs, sweep_cases
+from .results import STAGES, save_results, load_results, compare_results
+from .runner import run_benchmark
+
+
+def _arguments(argv=None):
+    parser = ArgumentParser(prog="python -m mmcp.benchmark",
+                            description="Benchmarks every valid model type and criterion over sizes of the instance.")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="The results file to write.")
+    parser.add_argument("-b", "--baseline", help="A results file to compare against; regressions exit with 1.")
+    parser.add_argument("--quick", action="store_true", help="Sweep fewer and smaller sizes.")
+    parser.add_argument("--repeats", type=int, default=5, help="The number of measured runs of every case.")
+    parser.add_argument("--warmup", type=int, default=1, help="The number of runs before measuring.")
+    parser.add_argument("--memory", action="store_true", help="Measure the peak memory of every solve.")
+    parser.add_argument("--seed", type=int, default=0, help="The base seed of the instances.")
+    parser.add_argument("--models", nargs="+", choices=[model_type.name for model_type in ModelType],
+                        help="Only benchmark these model types.")
+    parser.add_argument("--criteria", nargs="+", choices=[criterion.name for criterion in Criterion],
+                        help="Only benchmark these criteria.")
+    parser.add_argument("--lp-backends", nargs="+", type=str.upper, choices=[AUTO.upper(), *LP_BACKENDS],
+                        help="Measure the linear models with each of these LP backends.")
+    parser.add_argument("--sweeps", nargs="+", choices=list(SWEEPS), help="Only sweep these sizes.")
+    parser.add_argument("--stage", default="total", choices=STAGES, help="The time compared against the baseline.")
+    parser.add_argument("--imports", nargs="*", metavar="MODULE",
+                        help=f"Measure the import time of these modules in fresh processes instead (by default "
+                             f"{", ".join(module for module in IMPORT_MODULES if module)} and a bare interpreter).")
+    parser.add_argument("--threshold", type=float, default=.25, help="The allowed relative slowdown.")
+    return parser.parse_args(argv)
+
+
+def _imports(arguments) -> int:
+    def progress(done, total, record):
+        time = "failed" if record["total"] is None else f"{record["total"]["median"]:.6f}s"
+        print(f"[{done}/{total}] import {record["module"] or "(interpreter)"}: {time} {record["loaded"] or ""}",
+              flush=True)
+
+    results = run_import_benchmark(arguments.imports or None, arguments.repeats, arguments.warmup, progress)
+    save_results(arguments.output, results)
+    print(f"Results written to {arguments.output}")
+
+    if arguments.baseline is None:
+        return 0
+    regressions = compare_imports(load_results(arguments.baseline), results, arguments.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regressions against {arguments.baseline}")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    arguments = _arguments(argv)
+    if arguments.imports is not None:
+        return _imports(arguments)
+
+    pairs = [(model_type, criterion) for model_type, criterion in benchmark_pairs()
+             if (arguments.models is None or model_type.name in arguments.models)
+             and (arguments.criteria is None or criterion.name in arguments.criteria)]
+    sweeps = QUICK_SWEEPS if arguments.quick else SWEEPS
+    if arguments.sweeps is not None:
+        sweeps = {sweep: values for sweep, values in sweeps.items() if sweep in arguments.sweeps}
+
+    def progress(done, total, record):
+        time = "failed" if record["total"] is None else f"{record["total"]["median"]:.6f}s"
+        lp_backend = "" if record["lp_backend"] is None else f" {record["lp_backend"]}"
+        print(f"[{done}/{total}] {record["model_type"]} {record["criterion"]}{lp_backend} {record["sweep"]}="
+              f"{record[record["sweep"]]}: {time}", flush=True)
+
+    cases = sweep_cases(pairs, sweeps, lp_backends=arguments.lp_backends)
+    results = run_benchmark(cases, arguments.repeats, arguments.warmup, arguments.seed, progress, arguments.memory)
+    save_results(arguments.output, results)
+    print(f"Results written to {arguments.output}")
+
+    if arguments.baseline is None:
+        return 0
+    regressions = compare_results(load_results(arguments.baseline), results, arguments.stage, arguments.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regressions against {arguments.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys_exit(main())
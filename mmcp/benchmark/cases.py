@@ -0,0 +1,126 @@
+from typing import NamedTuple
+
+from numpy import int64, arange, full
+from numpy.random import default_rng
+
+from mmcp.data import ModelData
+from mmcp.utils import ModelType, Criterion, is_valid_combination
+from ..utils.logger_setup import LOGGER
+
+SIZE_FIELDS = ("num_elements", "num_vars", "num_constraints", "num_jobs")
+DEFAULT_SIZES = {"num_elements": 5, "num_vars": 50, "num_constraints": 50, "num_jobs": 15}
+SWEEPS = {
+    "num_vars": (10, 25, 50, 100, 200, 400),
+    "num_constraints": (10, 25, 50, 100, 200, 400),
+    "num_elements": (1, 2, 5, 10, 20, 50),
+    "num_jobs": (5, 10, 15, 20, 50, 100, 200),
+}
+QUICK_SWEEPS = {
+    "num_vars": (10, 50, 100),
+    "num_constraints": (10, 50, 100),
+    "num_elements": (1, 5, 10),
+    "num_jobs": (5, 10, 50),
+}
+# The sizes that change the work of a model type; the other sizes are kept at their defaults
+LINEAR_SWEEPS = ("num_vars", "num_constraints", "num_elements")
+COMBINATORIAL_SWEEPS = ("num_jobs",)
+MAX_PREDECESSORS = 3
+
+
+class BenchmarkCase(NamedTuple):
+    """
+    A single measured point: a model type and criterion at the given sizes, reached by sweeping ``sweep``, solved
+    with the LP backend ``lp_backend`` (``Vars.lp_backend`` if None; unused by the combinatorial model).
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+    model_type: ModelType
+    criterion: Criterion
+    sweep: str
+    num_elements: int
+    num_vars: int
+    num_constraints: int
+    num_jobs: int
+    lp_backend: str = None
+
+    @property
+    def sizes(self) -> tuple:
+        """The sizes of the instance, in the order of ``SIZE_FIELDS``."""
+        return self.num_elements, self.num_vars, self.num_constraints, self.num_jobs
+
+
+def benchmark_pairs():
+    """Returns every valid ``(ModelType, Criterion)`` pair."""
+    return [(model_type, criterion) for model_type in ModelType for criterion in Criterion
+            if is_valid_combination(model_type, criterion)]
+
+
+def sweep_cases(pairs=None, sweeps=None, defaults=None, lp_backends=None):
+    """
+    Builds the benchmark cases: every pair is measured along each of its sweeps, one size at a time, with the other
+    sizes at their defaults.
+
+    Args:
+        pairs: The ``(ModelType, Criterion)`` pairs (every valid pair by default).
+        sweeps: The values of each swept size (``SWEEPS`` by default).
+        defaults: The sizes that are not swept (``DEFAULT_SIZES`` by default).
+        lp_backends: The LP backends every linear case is measured with (``Vars.lp_backend`` only by default).
+
+    Returns:
+        The list of benchmark cases.
+    """
+    pairs = benchmark_pairs() if pairs is None else pairs
+    sweeps = SWEEPS if sweeps is None else sweeps
+    defaults = {**DEFAULT_SIZES, **(defaults or dict())}
+
+    cases = list()
+    for model_type, criterion in pairs:
+        combinatorial = model_type == ModelType.COMBINATORIAL_MODEL
+        relevant = COMBINATORIAL_SWEEPS if combinatorial else LINEAR_SWEEPS
+        backends = (None,) if combinatorial or not lp_backends else lp_backends
+        for sweep in relevant:
+            for value in sweeps.get(sweep, ()):
+                sizes = {**defaults, sweep: int(value)}
+                cases.extend(BenchmarkCase(model_type, criterion, sweep, *(sizes[key] for key in SIZE_FIELDS),
+                                           lp_backend) for lp_backend in backends)
+    LOGGER.debug(f"Built {len(cases)} benchmark cases for {len(pairs)} model type and criterion pairs.")
+    return cases
+
+
+def make_instance(num_elements: int, num_vars: int, num_constraints: int, num_jobs: int, seed: int = 0) -> ModelData:
+    """
+    Generates a reproducible benchmark instance.
+
+    Every element has private resources ``d``, so every model type can be solved on it. ``A`` and ``b`` are
+    non-negative and positive, so ``x = 0`` is always feasible and every variable is bounded. The same sizes and seed
+    always give the same instance.
+
+    Args:
+        num_elements: The number of elements.
+        num_vars: The number of variables of each element.
+        num_constraints: The number of constraints of each element.
+        num_jobs: The number of jobs of the combinatorial model.
+        seed: The base seed.
+
+    Returns:
+        The model data.
+    """
+    LOGGER.debug(f"Generating benchmark instance with num_elements={num_elements}, num_vars={num_vars}, "
+                 f"num_constraints={num_constraints}, num_jobs={num_jobs}, seed={seed}")
+    rng = default_rng([seed, num_elements, num_vars, num_constraints, num_jobs])
+
+    precedence_graph = dict()
+    for job in range(1, num_jobs):
+        size = int(rng.integers(0, min(job, MAX_PREDECESSORS) + 1))
+        precedence_graph[job] = rng.choice(job, size=size, replace=False).astype(int64)
+
+    return ModelData(
+        c=rng.random((num_elements, num_vars)),
+        A=rng.random((num_elements, num_constraints, num_vars)),
+        b=rng.uniform(1., num_vars, (num_elements, num_constraints)),
+        d=list(rng.random((num_elements, num_vars))),
+        criteria=full(num_elements, int(Criterion.CRITERION_1)),
+        model_types=1 + arange(num_elements) % 2,  # The connected model mixes both linear models
+        processing_times=rng.integers(1, 10, num_jobs),
+        precedence_graph=precedence_graph,
+        weights=rng.random(num_jobs),
+    )
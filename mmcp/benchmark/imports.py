@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+from json import loads
+from pathlib import Path
+from subprocess import run, CalledProcessError
+from sys import executable
+from typing import NamedTuple
+
+from mmcp.utils import measure
+from .runner import RESULTS_VERSION, environment, _summary
+from ..utils.logger_setup import LOGGER
+
+# The modules whose import is measured; "" is a bare interpreter, the startup every import includes
+IMPORT_MODULES = ("", "mmcp", "mmcp.utils", "mmcp.data", "mmcp.core", "mmcp.core.batch", "mmcp.__main__", "mmcp.ui")
+# The heavy dependencies reported as loaded by an import
+HEAVY_MODULES = ("ortools", "scipy", "PyQt5", "matplotlib")
+# The directory the package is imported from
+PACKAGE_ROOT = Path(__file__).resolve().parents[2]
+
+
+class ImportRegression(NamedTuple):
+    """A module whose import became slower compared to the baseline."""
+    LOGGER.debug(f"Initialized {__name__}")
+    module: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """How many times slower the current import is."""
+        return self.current / self.baseline if self.baseline > 0 else float("inf")
+
+    def __str__(self):
+        module = self.module or "(interpreter)"
+        return f"import {module}: {self.baseline:.6f}s -> {self.current:.6f}s ({self.ratio:.2f}x)"
+
+
+def _python(code: str):
+    """Runs the code in a fresh interpreter process, which imports the package from ``PACKAGE_ROOT``."""
+    return run([executable, "-c", code], cwd=PACKAGE_ROOT, check=True, capture_output=True, text=True)
+
+
+def measure_import(module: str, repeats: int = 5, warmup: int = 1) -> dict:
+    """
+    Measures the import of a module in fresh interpreter processes, like a worker process that only imports it.
+
+    Args:
+        module: The module name ("" for a bare interpreter).
+        repeats: The number of measured imports.
+        warmup: The number of imports before measuring (which also fill the bytecode cache).
+
+    Returns:
+        The record of the module: the timing summary of the whole process and the heavy dependencies it loaded.
+    """
+    statement = f"import {module}" if module else "pass"
+    stats = measure(lambda: _python(statement), repeats, warmup, errors=(CalledProcessError,))
+    loaded = None
+    if stats.failures < len(stats.times):
+        loaded = loads(_python(f"{statement}; import sys, json; "
+                               f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))"
+                               ).stdout)
+    return {"module": module, "total": _summary(stats), "loaded": loaded, "error": stats.error}
+
+
+def run_import_benchmark(modules=None, repeats: int = 5, warmup: int = 1, progress=None) -> dict:
+    """
+    Measures the import time of the modules.
+
+    Args:
+        modules: The module names (``IMPORT_MODULES`` by default).
+        repeats: The number of measured imports of every module.
+        warmup: The number of imports before measuring.
+        progress: A callable ``progress(done, total, record)`` called after every module.
+
+    Returns:
+        The results document, with a record per module.
+    """
+    modules = IMPORT_MODULES if modules is None else modules
+    LOGGER.debug(f"Measuring the import of {len(modules)} modules with repeats={repeats}, warmup={warmup}")
+
+    records = list()
+    for done, module in enumerate(modules, start=1):
+        records.append(measure_import(module, repeats, warmup))
+        if progress is not None:
+            progress(done, len(modules), records[-1])
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "settings": {"repeats": repeats, "warmup": warmup, "imports": True},
+        "results": records,
+    }
+
+
+def compare_imports(baseline: dict, current: dict, threshold: float = .25, min_difference: float = 1e-2):
+    """
+    Compares two import results documents (see ``run_import_benchmark``) and finds the regressions, like
+    ``compare_results``: an import regresses if its median time grew by more than ``threshold`` (relative) and by
+    more than ``min_difference`` seconds, or if it failed on every current run.
+
+    Returns:
+        The list of regressions, the largest slowdown first.
+    """
+    current_modules = {record["module"]: record for record in current["results"]}
+    regressions = list()
+    for before in baseline["results"]:
+        after = current_modules.get(before.get("module"))
+        if after is None or before.get("total") is None:
+            continue
+        baseline_time = before["total"]["median"]
+        current_time = float("inf") if after.get("total") is None else after["total"]["median"]
+        if current_time > baseline_time * (1 + threshold) and current_time - baseline_time > min_difference:
+            regressions.append(ImportRegression(before["module"], baseline_time, current_time))
+
+    LOGGER.debug(f"Found {len(regressions)} regressions of the import time.")
+    return sorted(regressions, key=lambda regression: regression.ratio, reverse=True)
@@ -0,0 +1,108 @@
+from json import dump, load
+from typing import NamedTuple
+
+from mmcp.core import FileSavingError, DataParsingError
+from .cases import SIZE_FIELDS
+from ..utils.logger_setup import LOGGER
+
+STAGES = ("build", "solve", "total")
+
+
+class Regression(NamedTuple):
+    """A case that became slower (or started failing) compared to the baseline."""
+    LOGGER.debug(f"Initialized {__name__}")
+    model_type: str
+    criterion: str
+    sizes: dict
+    stage: str
+    baseline: float
+    current: float
+    lp_backend: str = None
+
+    @property
+    def ratio(self) -> float:
+        """How many times slower the current run is."""
+        return self.current / self.baseline if self.baseline > 0 else float("inf")
+
+    def __str__(self):
+        sizes = ", ".join(f"{key}={value}" for key, value in self.sizes.items())
+        lp_backend = "" if self.lp_backend is None else f" on {self.lp_backend}"
+        return (f"{self.model_type} {self.criterion} ({sizes}){lp_backend}: {self.stage} {self.baseline:.6f}s -> "
+                f"{self.current:.6f}s ({self.ratio:.2f}x)")
+
+
+def save_results(path, results: dict):
+    """Writes a results document (see ``run_benchmark``) as JSON."""
+    LOGGER.debug(f"Saving benchmark results to {path}")
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            dump(results, f, indent=1)
+        LOGGER.info(f"Benchmark results saved to {path}.")
+    except OSError as e:
+        LOGGER.exception(f"Error saving benchmark results: {e}")
+        raise FileSavingError(f"Error saving benchmark results: {e}") from e
+
+
+def load_results(path) -> dict:
+    """Reads a results document written by ``save_results``."""
+    LOGGER.debug(f"Loading benchmark results from {path}")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            results = load(f)
+    except OSError as e:
+        LOGGER.exception(f"Error opening benchmark results: {e}")
+        raise FileSavingError(f"Error opening benchmark results: {e}") from e
+    except ValueError as e:
+        LOGGER.exception(f"Error parsing benchmark results: {e}")
+        raise DataParsingError(f"Error parsing benchmark results: {e}") from e
+
+    if not isinstance(results, dict) or not isinstance(results.get("results"), list):
+        LOGGER.error(f"Not a benchmark results file: {path}")
+        raise DataParsingError(f"Not a benchmark results file: {path}")
+    return results
+
+
+def _by_case(results: dict) -> dict:
+    """The records of a results document by model type, criterion, sizes and LP backend."""
+    return {(record["model_type"], record["criterion"], tuple(record[key] for key in SIZE_FIELDS),
+             record.get("lp_backend")): record
+            for record in results["results"]}
+
+
+def compare_results(baseline: dict, current: dict, stage: str = "total", threshold: float = .25,
+                    min_difference: float = 1e-3):
+    """
+    Compares two results documents and finds the regressions.
+
+    A case regresses if its median time of the stage grew by more than ``threshold`` (relative) and by more than
+    ``min_difference`` seconds, or if it was measured in the baseline and failed on every current run. Cases that
+    only one of the documents has are ignored.
+
+    Args:
+        baseline: The results to compare against.
+        current: The new results.
+        stage: "build", "solve" or "total".
+        threshold: The allowed relative slowdown.
+        min_difference: The allowed absolute slowdown in seconds, which keeps tiny cases from flagging noise.
+
+    Returns:
+        The list of regressions, the largest slowdown first.
+    """
+    if stage not in STAGES:
+        LOGGER.error(f"Unsupported stage: {stage}")
+        raise ValueError(f"Unsupported stage: \"{stage}\". Expected one of {STAGES}.")
+
+    regressions = list()
+    current_cases = _by_case(current)
+    for key, before in _by_case(baseline).items():
+        after = current_cases.get(key)
+        if after is None or before.get(stage) is None:
+            continue
+        baseline_time = before[stage]["median"]
+        current_time = float("inf") if after.get(stage) is None else after[stage]["median"]
+        if current_time > baseline_time * (1 + threshold) and current_time - baseline_time > min_difference:
+            regressions.append(Regression(key[0], key[1], dict(zip(SIZE_FIELDS, key[2])), stage, baseline_time,
+                                          current_time, key[3]))
+
+    LOGGER.debug(f"Found {len(regressions)} regressions of the {stage} time.")
+    return sorted(regressions, key=lambda regression: regression.ratio, reverse=True)
@@ -0,0 +1,145 @@
+from datetime import datetime, timezone
+from os import cpu_count
+from platform import platform, python_version
+
+from numpy import __version__ as numpy_version
+from ortools import __version__ as ortools_version
+
+from mmcp.core import Solver
+from mmcp.utils import Vars, ModelType, measure
+from .cases import SIZE_FIELDS, sweep_cases, make_instance
+from .. import linear_models as lm, combinatorial_models as cm
+from ..utils.logger_setup import LOGGER
+
+RESULTS_VERSION = 1
+PER_ELEMENT_MODEL_TYPES = (ModelType.LINEAR_MODEL_1, ModelType.LINEAR_MODEL_2)
+
+
+def _build(model_type: ModelType, data, lp_backend: str = None):
+    """Builds the models of the instance for the model type without solving them."""
+    if model_type == ModelType.LINEAR_MODEL_1:
+        for i in range(len(data.c)):
+            lm.model_builder.build_model(data.c[i], data.A[i], data.b[i], backend=lp_backend)
+    elif model_type == ModelType.LINEAR_MODEL_2:
+        for i in range(len(data.c)):
+            lm.model_builder.build_model(data.c[i] + data.d[i], data.A[i], data.b[i], backend=lp_backend)
+    elif model_type == ModelType.LINEAR_MODEL_3:
+        lm.third.connected_model.build_model(data.c, data.A, data.b, data.d, data.model_types, Vars.beta,
+                                             lp_backend)
+    else:
+        cm.scheduling.SingleMachineModel(data.processing_times, data.precedence_graph)
+
+
+def _solve(model_type: ModelType, criterion, data, lp_backend: str = None):
+    """
+    Solves the instance end to end: every element for the first and the second linear models, the whole instance for
+    the connected and the combinatorial models. The cache of the lexicographic solves is cleared first and the
+    solution cache is bypassed, so every run is cold.
+    """
+    lm.lexicographic.clear_cache()
+    if model_type in PER_ELEMENT_MODEL_TYPES:
+        for i in range(len(data.c)):
+            Solver(data.element(i), model_type, criterion, lp_backend, use_cache=False).solve()
+    else:
+        Solver(data, model_type, criterion, lp_backend, use_cache=False).solve()
+
+
+def _summary(stats):
+    """The summary of the timing statistics of a stage, or None if every measured call failed."""
+    if stats.failures == len(stats.times):
+        return None
+    return {**{k: v for k, v in stats.as_dict().items() if k not in ("failures", "error")}, "n": len(stats.times)}
+
+
+def run_case(case, data, repeats: int = 5, warmup: int = 1, trace_memory: bool = False) -> dict:
+    """
+    Measures a single benchmark case.
+
+    The model build is timed on its own with the model builder of the model type; the total is the end-to-end solve,
+    which builds the model again; the solve time is the difference of their medians. Both are timed with
+    ``mmcp.utils.timing.measure`` (wall and CPU time, garbage collector disabled).
+
+    Args:
+        case: The benchmark case.
+        data: The instance of the case (see ``make_instance``).
+        repeats: The number of measured runs.
+        warmup: The number of runs before measuring.
+        trace_memory: Whether the peak memory of the solve is measured.
+
+    Returns:
+        The record of the case.
+    """
+    lp_backend = None if case.model_type == ModelType.COMBINATORIAL_MODEL else case.lp_backend or Vars.lp_backend
+    LOGGER.info(f"Benchmarking {case.model_type} with {case.criterion} at "
+                f"{", ".join(f"{key}={value}" for key, value in zip(SIZE_FIELDS, case.sizes))}"
+                f"{"" if lp_backend is None else f" on {lp_backend}"}")
+    build_stats = measure(lambda: _build(case.model_type, data, lp_backend), repeats, warmup)
+    total_stats = measure(lambda: _solve(case.model_type, case.criterion, data, lp_backend), repeats, warmup,
+                          trace_memory)
+
+    build, total = _summary(build_stats), _summary(total_stats)
+    solve = None
+    if build is not None and total is not None:
+        solve = {"median": max(total["median"] - build["median"], 0.), "n": total["n"]}
+
+    return {
+        "model_type": case.model_type.name,
+        "criterion": case.criterion.name,
+        "sweep": case.sweep,
+        **dict(zip(SIZE_FIELDS, case.sizes)),
+        "lp_backend": lp_backend,
+        "build": build,
+        "solve": solve,
+        "total": total,
+        "failures": total_stats.failures + build_stats.failures,
+        "error": total_stats.error or build_stats.error,
+    }
+
+
+def environment() -> dict:
+    """Describes the machine and the library versions the benchmark runs with."""
+    return {"platform": platform(), "python": python_version(), "numpy": numpy_version, "ortools": ortools_version,
+            "cpu_count": cpu_count()}
+
+
+def run_benchmark(cases=None, repeats: int = 5, warmup: int = 1, seed: int = 0, progress=None,
+                  trace_memory: bool = False) -> dict:
+    """
+    Runs the benchmark cases.
+
+    Every instance is generated once per size and shared by all cases of that size, and a point shared by several
+    sweeps (like the defaults) is measured once.
+
+    Args:
+        cases: The benchmark cases (see ``sweep_cases``; every valid pair over ``SWEEPS`` by default).
+        repeats: The number of measured runs of every case.
+        warmup: The number of runs before measuring.
+        seed: The base seed of the instances.
+        progress: A callable ``progress(done, total, record)`` called after every case.
+        trace_memory: Whether the peak memory of every solve is measured.
+
+    Returns:
+        The results document (see ``mmcp.benchmark.results``).
+    """
+    cases = sweep_cases() if cases is None else cases
+    LOGGER.debug(f"Running {len(cases)} benchmark cases with repeats={repeats}, warmup={warmup}, seed={seed}")
+
+    instances, measured, records = dict(), dict(), list()
+    for done, case in enumerate(cases, start=1):
+        key = (case.model_type, case.criterion, case.sizes, case.lp_backend)
+        if key not in measured:
+            if case.sizes not in instances:
+                instances[case.sizes] = make_instance(*case.sizes, seed=seed)
+            measured[key] = run_case(case, instances[case.sizes], repeats, warmup, trace_memory)
+        records.append({**measured[key], "sweep": case.sweep})
+        if progress is not None:
+            progress(done, len(cases), records[-1])
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "settings": {"repeats": repeats, "warmup": warmup, "seed": seed, "trace_memory": trace_memory},
+        "parameters": {key: value for key, value in vars(Vars).items() if not key.startswith("_")},
+        "results": records,
+    }
@@ -1,8 +1,9 @@
-from . import first
+from . import first, scheduling
 from ..utils.logger_setup import LOGGER
 
 LOGGER.debug(f"Initialized {__name__}")
 
 __all__ = [
-    "first"
+    "first",
+    "scheduling",
 ]
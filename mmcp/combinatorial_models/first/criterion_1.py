@@ -1,62 +1,30 @@
-from ortools.linear_solver import pywraplp
+from ..scheduling import schedule
+from ...utils.logger_setup import LOGGER, summary
 
-from mmcp.core import SolverError
-from ...utils.logger_setup import LOGGER
 
-
-def solve(processing_times, precedence_graph, weights, M):
+def solve(processing_times, precedence_graph, weights, M=None, method="auto", exact_max_jobs=20, time_limit=10.):
     """
-    Solves the first criterion for the combinatorial model (approximation using LP relaxation).
+    Solves the first criterion for the combinatorial model (single machine weighted completion time scheduling).
+
+    The jobs are ordered by the ratio rule with precedence constraints in O(n log n + edges). Small instances are
+    solved exactly with CP-SAT, starting from that order.
 
     Args:
         processing_times: A list of processing times for each job.
         precedence_graph: A dictionary representing the precedence graph (key: job, value: list of predecessors).
         weights: A list of weights for each job.
-        M: A large constant.
+        M: Unused; kept for compatibility with the former big-M formulation.
+        method: "list", "exact" or "auto" (see ``mmcp.combinatorial_models.scheduling.schedule``).
+        exact_max_jobs: The largest number of jobs solved exactly by the "auto" method.
+        time_limit: The time limit of the exact method in seconds.
 
     Returns:
-        A list of job completion times (approximation).
+        A list of job completion times.
     """
-    LOGGER.debug(f"Entering solve function in criterion_1.py with: "
-                 f"processing_times={processing_times}, "
-                 f"precedence_graph={precedence_graph}, "
-                 f"weights={weights}, M={M}")
-
-    num_jobs = len(processing_times) if isinstance(processing_times, list) else 1
-    solver = pywraplp.Solver.CreateSolver("GLOP")
-
-    # Variables: completion times (continuous relaxation)
-    completion_times = [solver.NumVar(0, solver.infinity(), f"C_{j}") for j in range(num_jobs)]
-
-    # Constraints:
-    # 1. Precedence constraints
-    for j in range(num_jobs):
-        for pred in precedence_graph.get(j, list()):
-            solver.Add(completion_times[j] >= completion_times[pred] + processing_times[j])
-
-    # 2. Non-overlap constraints (simplified for LP relaxation)
-    #    Note: This is an approximation as it doesn’t guarantee an optimal schedule in the combinatorial sense
-    for j in range(num_jobs):
-        for k in range(j + 1, num_jobs):
-            solver.Add(completion_times[j] >= completion_times[k] + processing_times[j] - M * (
-                    1 - solver.IntVar(0, 1, f"y_{j}_{k}")))
-            solver.Add(completion_times[k] >= completion_times[j] + processing_times[k] - M * solver.IntVar(0, 1,
-                                                                                                            f"y_{j}_{k}"))
-
-    # Objective: Minimize weighted completion times
-    objective = solver.Objective()
-    for j in range(num_jobs):
-        objective.SetCoefficient(completion_times[j], weights[j])
-    objective.SetMinimization()
-
-    solver_status = solver.Solve()
-
-    if solver_status != pywraplp.Solver.OPTIMAL:
-        LOGGER.error(f"Unable to find the optimal solution for the combinatorial model, first criterion. "
-                     f"{solver_status=}")
-        raise SolverError(f"Unable to find the optimal solution for the combinatorial model, first criterion. "
-                          f"{solver_status=}")
+    LOGGER.debug("Entering solve function in criterion_1.py with: processing_times=%s, precedence_graph=%s, "
+                 "weights=%s, M=%s, method=%s",
+                 summary(processing_times), summary(precedence_graph), summary(weights), M, method)
 
-    approximate_completion_times = [c.solution_value() for c in completion_times]
-    LOGGER.info(f"Approximate completion times calculated: {approximate_completion_times}")
-    return approximate_completion_times
+    completion_times = schedule(processing_times, precedence_graph, weights, method, exact_max_jobs, time_limit)
+    LOGGER.info("Completion times calculated: %s", summary(completion_times))
+    return completion_times
@@ -1,107 +1,131 @@
-from ortools.linear_solver import pywraplp
+from time import perf_counter
+from typing import NamedTuple
+
+from numpy import asarray, ndim, full, float64, int64, zeros, abs as np_abs, where, add
 
 from mmcp.core import SolverError
 from mmcp.utils import Vars
-from ...utils.logger_setup import LOGGER
+from ..scheduling import SingleMachineModel, job_weights, schedule
+from ...utils.logger_setup import LOGGER, summary
+
+
+class AdjustmentReport(NamedTuple):
+    """The course of the weight adjustment loop."""
+    LOGGER.debug(f"Initialized {__name__}")
+    iterations: int
+    round_times: list[float]
+    max_differences: list[float]
+    converged: bool
 
 
-def solve(processing_times, precedence_graph, initial_weights, target_differences):
+def target_pairs(target_differences, sources, targets):
     """
-    Solves the second criterion for the combinatorial model (approximation using LP relaxation and iterative adjustment).
+    Converts the target differences into index arrays.
+
+    Args:
+        target_differences: A list of ``(i, j, target)`` triples (the target difference ``C_i - C_j``), or a scalar
+            target applied to every precedence edge (``i`` is the successor, ``j`` the predecessor).
+        sources: The predecessor job of every precedence edge.
+        targets: The successor job of every precedence edge.
+
+    Returns:
+        A tuple containing:
+            - The indices i.
+            - The indices j.
+            - The target differences.
+    """
+    if ndim(target_differences) == 0:
+        return targets, sources, full(len(targets), float(target_differences))
+
+    triples = asarray(target_differences, dtype=float64).reshape(-1, 3)
+    return triples[:, 0].astype(int64), triples[:, 1].astype(int64), triples[:, 2]
+
+
+def solve(processing_times, precedence_graph, initial_weights, target_differences, method="auto", max_iterations=None,
+          return_report=False):
+    """
+    Solves the second criterion for the combinatorial model (iterative adjustment of the weights of the first criterion
+    schedule).
+
+    The scheduling model is built once; every round only replaces the weights, checks all target differences at once
+    and, until they are all within ``Vars.tolerance``, moves the weights of both jobs of every target pair by
+    ``Vars.dW``, toward its target (pairs already within the tolerance as well, like the original loop).
 
     Args:
         processing_times: A list of processing times for each job.
         precedence_graph: A dictionary representing the precedence graph (key: job, value: list of predecessors).
         initial_weights: A list of initial weights for each job.
-        target_differences: A list of target differences in completion times between pairs of jobs.
+        target_differences: A list of target differences in completion times between pairs of jobs, given as
+            ``(i, j, target)`` triples, or a scalar target for every precedence edge.
+        method: "list", "exact" or "auto" (see ``mmcp.combinatorial_models.scheduling.schedule``).
+        max_iterations: The limit of adjustment rounds (the number of jobs by default).
+        return_report: Whether the adjustment report is returned along with the completion times.
 
     Returns:
-        A list of job completion times (approximation).
+        A list of job completion times (approximation), and the ``AdjustmentReport`` if ``return_report`` is set.
     """
-    LOGGER.debug(f"Entering solve function in criterion_2.py with: "
-                 f"processing_times={processing_times}, "
-                 f"precedence_graph={precedence_graph}, "
-                 f"initial_weights={initial_weights}, "
-                 f"target_differences={target_differences}")
-
-    num_jobs = len(processing_times) if isinstance(processing_times, list) else 1
-    weights = initial_weights.copy()
-    completion_times = None
-
-    for _ in range(num_jobs):  # Limit iterations
-        completion_times = solve_weighted_completion_time(processing_times, precedence_graph, weights, Vars.M)
-
-        max_diff = 0
-        for i, j, target_diff in target_differences:
-            diff = abs(completion_times[i] - completion_times[j] - target_diff)
-            if diff > max_diff:
-                max_diff = diff
-
-        if max_diff < Vars.tolerance:
+    LOGGER.debug("Entering solve function in criterion_2.py with: processing_times=%s, precedence_graph=%s, "
+                 "initial_weights=%s, target_differences=%s",
+                 summary(processing_times), summary(precedence_graph), summary(initial_weights),
+                 summary(target_differences))
+
+    model = SingleMachineModel(processing_times, precedence_graph)
+    weights = job_weights(initial_weights, model.num_jobs).copy()
+    try:
+        i, j, target = target_pairs(target_differences, model.sources, model.targets)
+    except (TypeError, ValueError) as e:
+        LOGGER.exception(f"Invalid target differences: {target_differences}")
+        raise SolverError(f"Invalid target differences: {target_differences}") from e
+    if len(i) and (min(i.min(), j.min()) < 0 or max(i.max(), j.max()) >= model.num_jobs):
+        LOGGER.error(f"Target differences refer to unknown jobs (there are {model.num_jobs} jobs).")
+        raise SolverError(f"Target differences refer to unknown jobs (there are {model.num_jobs} jobs).")
+
+    max_iterations = model.num_jobs if max_iterations is None else max_iterations
+    completion_times, order = zeros(model.num_jobs), None
+    round_times, max_differences, converged = list(), list(), False
+
+    for _ in range(max(max_iterations, 1)):
+        start = perf_counter()
+        completion_times, order = model.solve(weights, method, Vars.exact_max_jobs, Vars.exact_time_limit, order)
+
+        differences = completion_times[i] - completion_times[j] - target
+        max_differences.append(float(np_abs(differences).max()) if len(differences) else 0.)
+        converged = max_differences[-1] < Vars.tolerance
+        if not converged:
+            # Decrease the weight of job i and increase the weight of job j where the difference is too large,
+            # the other way around otherwise
+            step = where(differences > 0, -Vars.dW, Vars.dW)
+            add.at(weights, i, step)
+            add.at(weights, j, -step)
+        round_times.append(perf_counter() - start)
+        if converged:
             break
 
-        # Adjust weights based on differences (example logic)
-        for i, j, target_diff in target_differences:
-            if completion_times[i] - completion_times[j] > target_diff:
-                weights[i] -= Vars.dW  # Decrease weight for a job i
-                weights[j] += Vars.dW  # Increase weight for a job j
-            else:
-                weights[i] += Vars.dW
-                weights[j] -= Vars.dW
-
-    LOGGER.info(f"Completion times calculated: {completion_times}")
-    return completion_times
+    report = AdjustmentReport(len(round_times), round_times, max_differences, converged)
+    LOGGER.info(f"Weight adjustment {'converged' if converged else 'stopped'} after {report.iterations} rounds "
+                f"({sum(round_times) / report.iterations * 1e3:.3f} ms per round), "
+                f"max difference {max_differences[-1]:.6g}")
+    LOGGER.info("Completion times calculated: %s", summary(completion_times))
+    return (completion_times.tolist(), report) if return_report else completion_times.tolist()
 
 
-def solve_weighted_completion_time(processing_times, precedence_graph, weights, M):
+def solve_weighted_completion_time(processing_times, precedence_graph, weights, M=None):
     """
-    Helper function: Solves the weighted completion time problem using LP relaxation (similar to Criterion 1).
+    Helper function: Solves the weighted completion time problem (the same schedule as Criterion 1).
 
     Args:
         processing_times: A list of processing times for each job.
         precedence_graph: A dictionary representing the precedence graph (key: job, value: list of predecessors).
         weights: A list of weights for each job.
-        M: A large constant.
+        M: Unused; kept for compatibility with the former big-M formulation.
 
     Returns:
-        A list of job completion times (approximation).
+        A list of job completion times.
     """
-    LOGGER.debug(f"Entering solve_weighted_completion_time function with: "
-                 f"processing_times={processing_times}, "
-                 f"precedence_graph={precedence_graph}, "
-                 f"weights={weights}, M={M}")
-
-    num_jobs = len(processing_times)
-    solver = pywraplp.Solver.CreateSolver("GLOP")
-    completion_times = [solver.NumVar(0, solver.infinity(), f"C_{j}") for j in range(num_jobs)]
-
-    # Precedence constraints
-    for j in range(num_jobs):
-        for pred in precedence_graph.get(j, list()):
-            solver.Add(completion_times[j] >= completion_times[pred] + processing_times[j])
-
-    # Non-overlap constraints (simplified for LP relaxation)
-    for j in range(num_jobs):
-        for k in range(j + 1, num_jobs):
-            solver.Add(completion_times[j] >= completion_times[k] + processing_times[j]
-                       - M * (1 - solver.IntVar(0, 1, f"y_{j}_{k}")))
-            solver.Add(completion_times[k] >= completion_times[j] + processing_times[k]
-                       - M * solver.IntVar(0, 1, f"y_{j}_{k}"))
-
-    # Objective: Minimize weighted completion times
-    objective = solver.Objective()
-    for j in range(num_jobs):
-        objective.SetCoefficient(completion_times[j], weights[j])
-    objective.SetMinimization()
-
-    solver_status = solver.Solve()
-
-    if solver_status != pywraplp.Solver.OPTIMAL:
-        LOGGER.error(f"Unable to find the optimal solution for the combinatorial model, second criterion. "
-                     f"{solver_status=}")
-        raise SolverError(f"Unable to find the optimal solution for the combinatorial model, second criterion. "
-                          f"{solver_status=}")
-
-    completion_times_values = [c.solution_value() for c in completion_times]
-    LOGGER.debug(f"Completion times calculated (inner function): {completion_times_values}")
-    return completion_times_values
+    LOGGER.debug("Entering solve_weighted_completion_time function with: processing_times=%s, precedence_graph=%s, "
+                 "weights=%s, M=%s", summary(processing_times), summary(precedence_graph), summary(weights), M)
+
+    completion_times = schedule(processing_times, precedence_graph, weights, Vars.scheduling_method,
+                                Vars.exact_max_jobs, Vars.exact_time_limit)
+    LOGGER.debug("Completion times calculated (inner function): %s", summary(completion_times))
+    return completion_times
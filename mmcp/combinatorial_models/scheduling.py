@@ -0,0 +1,241 @@
+from heapq import heapify, heappush, heappop
+
+from numpy import (asarray, atleast_1d, float64, int64, zeros, bincount, argsort, searchsorted, arange, concatenate,
+                   repeat, rint, allclose, divide, full, inf)
+from ortools.sat.python import cp_model
+
+from mmcp.core import SolverError
+from ..utils.logger_setup import LOGGER
+
+SCHEDULING_METHODS = ("auto", "list", "exact")
+WEIGHT_SCALE = 10 ** 6
+TIME_SCALE = 10 ** 3
+
+
+def job_data(processing_times, precedence_graph):
+    """
+    Normalizes the jobs of a single machine scheduling problem.
+
+    A scalar processing time is a single job. The keys of the precedence graph may be integers or strings (as parsed
+    from JSON); anything other than a dictionary means no precedence constraints.
+
+    Args:
+        processing_times: A list of processing times for each job.
+        precedence_graph: A dictionary representing the precedence graph (key: job, value: list of predecessors).
+
+    Returns:
+        A tuple containing:
+            - The vector of processing times.
+            - The predecessor (source) job of every precedence edge.
+            - The successor (target) job of every precedence edge.
+    """
+    processing_times = atleast_1d(asarray(processing_times, dtype=float64)).ravel()
+    num_jobs = len(processing_times)
+
+    sources, targets = zeros(0, dtype=int64), zeros(0, dtype=int64)
+    if isinstance(precedence_graph, dict) and precedence_graph:
+        predecessors = [atleast_1d(asarray(value, dtype=int64)).ravel() for value in precedence_graph.values()]
+        sources = concatenate(predecessors)
+        targets = repeat(asarray([int(job) for job in precedence_graph], dtype=int64),
+                         [len(value) for value in predecessors])
+
+    in_range = (sources >= 0) & (sources < num_jobs) & (targets >= 0) & (targets < num_jobs)
+    if not in_range.all():
+        LOGGER.warning(f"Ignoring {int((~in_range).sum())} precedence edges with unknown jobs "
+                       f"(there are {num_jobs} jobs).")
+        sources, targets = sources[in_range], targets[in_range]
+
+    return processing_times, sources, targets
+
+
+def job_weights(weights, num_jobs):
+    """
+    Normalizes the weights of the jobs. If the weights are given as a matrix, the weight of each job is the sum of its
+    row.
+
+    Args:
+        weights: A list of weights for each job.
+        num_jobs: The number of jobs.
+
+    Returns:
+        The vector of weights.
+    """
+    weights = atleast_1d(asarray(weights, dtype=float64))
+    if weights.ndim > 1:
+        weights = weights.reshape(len(weights), -1).sum(axis=1)
+    if len(weights) < num_jobs:
+        LOGGER.error(f"Expected {num_jobs} weights, got {len(weights)}.")
+        raise SolverError(f"Expected {num_jobs} weights, got {len(weights)}.")
+    return weights[:num_jobs]
+
+
+def completion_times_of(order, processing_times):
+    """Returns the completion times of the jobs processed in the given order without idle time."""
+    completion_times = zeros(len(processing_times))
+    completion_times[order] = processing_times[order].cumsum()
+    return completion_times
+
+
+class SingleMachineModel:
+    """
+    Keeps a single machine scheduling problem alive between solves with different weights.
+
+    The precedence structure (successor lists and in-degrees) is built once, and so is the CP-SAT model of the exact
+    method; a solve with new weights only replaces the objective coefficients and hints the previous schedule.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+
+    def __init__(self, processing_times, precedence_graph):
+        self.processing_times, self.sources, self.targets = job_data(processing_times, precedence_graph)
+        self.num_jobs = num_jobs = len(self.processing_times)
+        LOGGER.debug(f"Building single machine model with {num_jobs} jobs and {len(self.sources)} precedence edges")
+
+        self.in_degree = bincount(self.targets, minlength=num_jobs).tolist()
+        by_source = argsort(self.sources, kind="stable")
+        self.successors = self.targets[by_source].tolist()
+        self.indptr = searchsorted(self.sources[by_source], arange(num_jobs + 1)).tolist()
+        self._cp = None
+
+    def list_order(self, weights):
+        """
+        Computes a precedence-feasible order by the ratio rule (Smith's rule with precedence constraints).
+
+        Among the jobs whose predecessors are all scheduled, the job with the largest ratio ``weight / processing
+        time`` is processed next. The schedule is optimal without precedence constraints and runs in
+        O(n log n + edges).
+
+        Args:
+            weights: The vector of weights.
+
+        Returns:
+            The list of jobs in processing order.
+        """
+        num_jobs, processing_times = self.num_jobs, self.processing_times
+        ratios = divide(weights, processing_times, out=full(num_jobs, inf), where=processing_times > 0)
+
+        # The heap holds ranks in the unconstrained ratio order, which are cheaper to compare than (ratio, job) pairs
+        by_ratio = argsort(-ratios, kind="stable")
+        rank = zeros(num_jobs, dtype=int64)
+        rank[by_ratio] = arange(num_jobs)
+        by_ratio, rank = by_ratio.tolist(), rank.tolist()
+
+        in_degree, successors, indptr = self.in_degree.copy(), self.successors, self.indptr
+        available = [rank[job] for job in range(num_jobs) if in_degree[job] == 0]
+        heapify(available)
+        order = list()
+        while available:
+            job = by_ratio[heappop(available)]
+            order.append(job)
+            for successor in successors[indptr[job]:indptr[job + 1]]:
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    heappush(available, rank[successor])
+
+        if len(order) < num_jobs:
+            LOGGER.error("The precedence graph contains a cycle.")
+            raise SolverError("The precedence graph contains a cycle.")
+        return order
+
+    def _cp_model(self):
+        if self._cp is None:
+            processing_times = self.processing_times
+            time_scale = 1 if allclose(processing_times, rint(processing_times)) else TIME_SCALE
+            durations = rint(processing_times * time_scale).astype(int64).tolist()
+            horizon = sum(durations)
+
+            model = cp_model.CpModel()
+            starts = [model.new_int_var(0, horizon - duration, f"S_{j}") for j, duration in enumerate(durations)]
+            ends = [model.new_int_var(duration, horizon, f"C_{j}") for j, duration in enumerate(durations)]
+            model.add_no_overlap([model.new_interval_var(start, duration, end, f"I_{j}")
+                                  for j, (start, duration, end) in enumerate(zip(starts, durations, ends))])
+            for source, target in zip(self.sources.tolist(), self.targets.tolist()):
+                model.add(ends[source] <= starts[target])
+            self._cp = model, starts, ends, durations, time_scale
+        return self._cp
+
+    def exact_order(self, weights, time_limit=10., hint=None):
+        """
+        Solves the single machine weighted completion time problem exactly with CP-SAT (interval and no-overlap
+        constraints). Processing times and weights are scaled to integers.
+
+        Args:
+            weights: The vector of weights.
+            time_limit: The time limit in seconds; the best schedule found so far is returned when it is reached.
+            hint: An optional order of the jobs to start the search from.
+
+        Returns:
+            The list of jobs in processing order.
+        """
+        model, starts, ends, durations, time_scale = self._cp_model()
+        weight_scale = WEIGHT_SCALE / abs(weights).max() if abs(weights).max() > 0 else 0
+        integer_weights = rint(weights * weight_scale).astype(int64).tolist()
+        model.minimize(sum(weight * end for weight, end in zip(integer_weights, ends)))
+
+        model.clear_hints()
+        if hint is not None:
+            hinted_ends = completion_times_of(asarray(hint), asarray(durations)).astype(int64).tolist()
+            for j, (start, end) in enumerate(zip(starts, ends)):
+                model.add_hint(start, hinted_ends[j] - durations[j])
+                model.add_hint(end, hinted_ends[j])
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        status = solver.solve(model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            LOGGER.error(f"Unable to find a schedule with CP-SAT. status={solver.status_name(status)}")
+            raise SolverError(f"Unable to find a schedule with CP-SAT. status={solver.status_name(status)}")
+
+        LOGGER.debug(f"CP-SAT schedule found: status={solver.status_name(status)}, "
+                     f"objective={solver.objective_value / (weight_scale or 1) / time_scale}")
+        return sorted(range(len(durations)), key=lambda j: solver.value(starts[j]))
+
+    def solve(self, weights, method="auto", exact_max_jobs=20, time_limit=10., hint=None):
+        """
+        Schedules the jobs minimizing the weighted sum of completion times.
+
+        Args:
+            weights: A list of weights for each job.
+            method: "list" for the ratio rule list schedule, "exact" for CP-SAT, or "auto" for CP-SAT up to
+                ``exact_max_jobs`` jobs and the list schedule above.
+            exact_max_jobs: The largest number of jobs solved exactly by the "auto" method.
+            time_limit: The time limit of the exact method in seconds.
+            hint: An optional order of the jobs to start the exact search from (the list schedule by default).
+
+        Returns:
+            A tuple containing:
+                - The vector of job completion times.
+                - The list of jobs in processing order.
+        """
+        if method not in SCHEDULING_METHODS:
+            LOGGER.error(f"Unsupported scheduling method: {method}")
+            raise SolverError(f"Unsupported scheduling method: {method}")
+
+        weights = job_weights(weights, self.num_jobs)
+        if method == "exact" or (method == "auto" and self.num_jobs <= exact_max_jobs):
+            order = self.exact_order(weights, time_limit, hint=self.list_order(weights) if hint is None else hint)
+        else:
+            order = self.list_order(weights)
+
+        return completion_times_of(asarray(order, dtype=int64), self.processing_times), order
+
+
+def schedule(processing_times, precedence_graph, weights, method="auto", exact_max_jobs=20, time_limit=10.):
+    """
+    Schedules the jobs on a single machine minimizing the weighted sum of completion times.
+
+    Args:
+        processing_times: A list of processing times for each job.
+        precedence_graph: A dictionary representing the precedence graph (key: job, value: list of predecessors).
+        weights: A list of weights for each job.
+        method: "list" for the ratio rule list schedule, "exact" for CP-SAT, or "auto" for CP-SAT up to
+            ``exact_max_jobs`` jobs and the list schedule above.
+        exact_max_jobs: The largest number of jobs solved exactly by the "auto" method.
+        time_limit: The time limit of the exact method in seconds.
+
+    Returns:
+        A list of job completion times.
+    """
+    LOGGER.debug(f"Entering schedule with {method=}, {exact_max_jobs=}, {time_limit=}")
+    completion_times, _ = SingleMachineModel(processing_times, precedence_graph).solve(weights, method,
+                                                                                      exact_max_jobs, time_limit)
+    return completion_times.tolist()
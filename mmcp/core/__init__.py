@@ -1,9 +1,17 @@
-from .exception import (DataParsingError, DataValidationError, ModelTypeError, CriterionError, SolverError,
-                        ConfigurationError, FileSavingError)
-from .model import Model
-from .solver import Solver, LinearModel1, LinearModel2, LinearModel3, CombinatorialModel
+from ..utils.lazy import lazy_exports
 from ..utils.logger_setup import LOGGER
 
+# The solvers import OR-Tools, so every submodule is only imported on first access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".exception": ("DataParsingError", "DataValidationError", "ModelTypeError", "CriterionError", "SolverError",
+                   "ConfigurationError", "FileSavingError"),
+    ".model": ("Model",),
+    ".solution_cache": ("SolutionCache", "CacheInfo", "solution_key"),
+    ".solver": ("Solver", "LinearModel1", "LinearModel2", "LinearModel3", "CombinatorialModel"),
+    ".session": ("SolverSession",),
+    ".batch": ("iter_solve", "solve_all"),
+})
+
 LOGGER.debug(f"Initialized {__name__}")
 
 __all__ = [
@@ -20,4 +28,10 @@
     "LinearModel3",
     "CombinatorialModel",
     "Solver",
+    "SolutionCache",
+    "CacheInfo",
+    "solution_key",
+    "SolverSession",
+    "iter_solve",
+    "solve_all",
 ]
@@ -0,0 +1,313 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from os import cpu_count
+
+from numpy import asarray, ndarray, stack, float64
+
+from mmcp.core import Solver, SolverSession, ConfigurationError, SolverError
+from mmcp.data import ModelData, SolutionData, is_sparse_tensor
+from mmcp.utils import Vars, ModelType, Criterion
+from .solution_cache import solution_key
+from .. import linear_models as lm
+from ..utils import functions
+from ..utils.logger_setup import LOGGER, summary
+
+BACKENDS = ("process", "thread")
+NATIVE_MODEL_TYPES = (ModelType.LINEAR_MODEL_1, ModelType.LINEAR_MODEL_2)
+
+# The constraint tensor attached by a worker process, see _init_worker
+_shared_A = None
+
+
+def _vars_snapshot() -> dict:
+    """Returns the configuration parameters, so that worker processes solve with the same values."""
+    return {k: v for k, v in vars(Vars).items() if not k.startswith("_")}
+
+
+def _init_worker(parameters: dict, name: str = None, shape: tuple = None, dtype: str = None):
+    """Applies the configuration parameters in a worker process and attaches it to the shared constraint tensor."""
+    global _shared_A
+    for k, v in parameters.items():
+        setattr(Vars, k, v)
+    if name is not None:
+        shm = shared_memory.SharedMemory(name=name)
+        _shared_A = shm, ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _solve_shared(element_idx: int, element_data: ModelData, model_type: ModelType, criterion: Criterion,
+                  lp_backend: str = None):
+    """Solves one element in a worker process, reading its constraint matrix from the shared tensor."""
+    if _shared_A is not None:
+        element_data = element_data._replace(A=_shared_A[1][element_idx])
+    return Solver(element_data, model_type, criterion, lp_backend, use_cache=False).solve()
+
+
+def _share(A):
+    """
+    Copies the constraint tensor into shared memory.
+
+    Returns:
+        The shared memory block, or None if A is not a numeric tensor (it is pickled per element then, which keeps
+        sparse matrices small).
+    """
+    if A is None or is_sparse_tensor(A):
+        return None, A
+    A = asarray(A)
+    if A.dtype == object or A.ndim < 2 or A.nbytes == 0:
+        return None, A
+    shm = shared_memory.SharedMemory(create=True, size=A.nbytes)
+    ndarray(A.shape, dtype=A.dtype, buffer=shm.buf)[:] = A
+    LOGGER.debug(f"Shared constraint tensor of shape {A.shape} ({A.nbytes:,} bytes) as {shm.name}")
+    return shm, A
+
+
+def _objectives(model_type: ModelType, elements) -> list:
+    """The element objectives ``z``: ``c``, or ``c + d`` for the second linear model."""
+    private = model_type == ModelType.LINEAR_MODEL_2
+    return [asarray(element.c, dtype=float64) + (asarray(element.d, dtype=float64) if private else 0.)
+            for _, element in elements]
+
+
+def _solve_native(data: ModelData, tasks):
+    """
+    Solves elements of the first and the second linear models on a native backend: the elements of the same model
+    type, criterion and shape are stacked and solved as one batch (see ``mmcp.linear_models.dense_simplex``).
+
+    Yields:
+        The element index, the solution (or None) and the error (or None) of every element.
+    """
+    groups = dict()
+    for i, model_type, criterion, _ in tasks:
+        element = functions.ith_data(data, i)
+        shape = element.A.shape if hasattr(element.A, "shape") else asarray(element.A).shape
+        groups.setdefault((model_type, criterion, shape), list()).append((i, element))
+
+    for (model_type, criterion, shape), elements in groups.items():
+        LOGGER.debug(f"Solving {len(elements)} elements of {model_type} with {criterion} and A of shape {shape} "
+                     f"as one batch")
+        z = stack(_objectives(model_type, elements))
+        A, b = [element.A for _, element in elements], stack([asarray(element.b) for _, element in elements])
+        if criterion == Criterion.CRITERION_1:
+            solution = lm.dense_simplex.solve_criterion_1(z, A, b)
+        elif criterion == Criterion.CRITERION_2:
+            solution = lm.dense_simplex.solve_criterion_2(z, A, b, Vars.z_min, Vars.alpha)
+        else:
+            solution = lm.dense_simplex.solve_criterion_3(z, A, b, Vars.weights, Vars.weights_tolerance,
+                                                           Vars.weights_max_iterations)
+
+        for k, (i, _) in enumerate(elements):
+            solver_status = int(solution.status[k])
+            if solver_status == lm.dense_simplex.OPTIMAL:
+                yield i, (solution.x[k].tolist(), float(solution.objective[k])), None
+            else:
+                yield i, None, SolverError(f"Unable to find the optimal solution for {model_type}, {criterion}. "
+                                           f"{solver_status=}")
+
+
+def _solve_combined(data: ModelData, tasks):
+    """
+    Solves elements of the first and the second linear models with the same model type, criterion and LP backend as
+    one block-diagonal LP (see ``mmcp.linear_models.block``), so a single solver is started for all of them. A block
+    without an optimal solution is solved again element by element, which finds the elements that fail.
+
+    Yields:
+        The element index, the solution (or None) and the error (or None) of every element.
+    """
+    groups = dict()
+    for i, model_type, criterion, lp_backend in tasks:
+        groups.setdefault((model_type, criterion, lp_backend), list()).append((i, functions.ith_data(data, i)))
+
+    for (model_type, criterion, lp_backend), elements in groups.items():
+        LOGGER.debug(f"Solving {len(elements)} elements of {model_type} with {criterion} as one block-diagonal model")
+        z = _objectives(model_type, elements)
+        A, b = [element.A for _, element in elements], [element.b for _, element in elements]
+        try:
+            if criterion == Criterion.CRITERION_1:
+                solutions = lm.block.solve_criterion_1(z, A, b, lp_backend)
+            elif criterion == Criterion.CRITERION_2:
+                solutions = lm.block.solve_criterion_2(z, A, b, Vars.z_min, Vars.alpha, lp_backend)
+            else:
+                solutions = lm.block.solve_criterion_3(z, A, b, Vars.weights, lp_backend, Vars.weights_tolerance,
+                                                      Vars.weights_max_iterations)
+        except SolverError as e:
+            LOGGER.warning(f"Solving the elements one by one, the block model failed: {e}")
+            for i, element in elements:
+                try:
+                    yield i, Solver(element, model_type, criterion, lp_backend, use_cache=False).solve(), None
+                except Exception as error:
+                    yield i, None, error
+            continue
+
+        for (i, _), solution in zip(elements, solutions):
+            yield i, solution, None
+
+
+def iter_solve(data: ModelData, workers: int = None, backend: str = "process", elements=None, model_types=None,
+               criteria=None, sessions: dict = None, lp_backends=None, combine: bool = False):
+    """
+    Solves the elements of the model data in parallel and yields every element as soon as it is solved.
+
+    With the "process" backend, the constraint tensor A is placed in shared memory once and every worker process
+    attaches to it, so only the small per-element vectors are pickled. With the "thread" backend, the elements are
+    solved through solver sessions, which keep their models alive between calls when ``sessions`` is given; with the
+    "process" backend, the elements that already have a session in ``sessions`` are still solved through it, in threads
+    of the calling process, and only the others are sent to the worker processes. Closing the generator early cancels
+    the elements that have not started yet. Elements of the first and the second linear models on a native LP backend
+    (like "NUMPY") are solved first, together in batches, in the calling thread. With ``combine``, the other elements of
+    these models are solved in the calling thread as well, one block-diagonal LP per model type, criterion and LP
+    backend, instead of one solver per element.
+
+    Elements whose data, model type, criterion, LP backend and parameters are unchanged since they were last solved are
+    yielded from the solution cache of ``Solver`` (``Solver.cache``) first, without solving them again.
+
+    Args:
+        data: The model data.
+        workers: The number of worker processes or threads (the number of CPUs by default).
+        backend: "process" or "thread".
+        elements: The indices of the elements to solve (all elements by default).
+        model_types: The model type of each element, indexed by the element index (``data.model_types`` by default).
+        criteria: The criterion of each element, indexed by the element index (``data.criteria`` by default).
+        sessions: A dictionary of solver sessions by element index, kept by the caller (the "thread" backend adds a
+            session for every solved element, the "process" backend only uses the existing ones).
+        lp_backends: The LP backend of each element, indexed by the element index (``Vars.lp_backend`` by default,
+            see ``mmcp.linear_models.backends``).
+        combine: Whether the elements of the first and the second linear models are solved as block-diagonal LPs.
+
+    Yields:
+        A tuple containing:
+            - The element index.
+            - The solution, or None if the element failed.
+            - The error of a failed element, or None.
+    """
+    if backend not in BACKENDS:
+        LOGGER.error(f"Unsupported backend: {backend}")
+        raise ConfigurationError(f"Unsupported backend: {backend}")
+
+    elements = range(len(data.c)) if elements is None else list(elements)
+    model_types = data.model_types if model_types is None else model_types
+    criteria = data.criteria if criteria is None else criteria
+    workers = workers or cpu_count() or 1
+    LOGGER.debug(f"Solving {len(elements)} elements with {workers} {backend} workers")
+
+    tasks = [(i, ModelType(int(model_types[i])), Criterion(int(criteria[i])),
+              None if lp_backends is None else lp_backends[i]) for i in elements]
+
+    keys = dict()
+    if Solver.cache.enabled:
+        keys = {i: solution_key(functions.ith_data(data, i), model_type, criterion, lp_backend)
+                for i, model_type, criterion, lp_backend in tasks}
+        cached = {i: Solver.cache.get(key) for i, key in keys.items()}
+        for i, solution in cached.items():
+            if solution is not None:
+                yield i, solution, None
+        tasks = [task for task in tasks if cached[task[0]] is None]
+        LOGGER.debug(f"{len(keys) - len(tasks)} of {len(keys)} elements found in the solution cache")
+    if not tasks:
+        return
+
+    solutions = _solve_tasks(data, tasks, workers, backend, sessions, combine)
+    try:
+        for i, solution, error in solutions:
+            if solution is not None and i in keys:
+                Solver.cache.put(keys[i], solution)
+            yield i, solution, error
+    finally:
+        solutions.close()  # Cancels the elements that have not started yet
+
+
+def _solve_tasks(data: ModelData, tasks, workers: int, backend: str, sessions: dict = None, combine: bool = False):
+    """Solves the tasks ``(element index, model type, criterion, LP backend)`` of ``iter_solve``."""
+    native = {task[0] for task in tasks if task[1] in NATIVE_MODEL_TYPES and lm.backends.is_native(task[3])}
+    if native:
+        yield from _solve_native(data, [task for task in tasks if task[0] in native])
+        tasks = [task for task in tasks if task[0] not in native]
+    if combine:
+        combined = [task for task in tasks if task[1] in NATIVE_MODEL_TYPES]
+        yield from _solve_combined(data, combined)
+        tasks = [task for task in tasks if task[1] not in NATIVE_MODEL_TYPES]
+    if not tasks:  # Every element was solved natively or combined, no pool is needed
+        return
+
+    sessions = dict() if sessions is None else sessions
+    if backend == "thread":
+        session_tasks, tasks = tasks, list()
+    else:  # The elements with a live session are solved through it in this process, which keeps its model
+        session_tasks = [task for task in tasks if task[0] in sessions and sessions[task[0]].lp_backend == task[3]]
+        tasks = [task for task in tasks if task not in session_tasks]
+
+    shm, pools, futures = None, list(), dict()
+    try:
+        if session_tasks:
+            for i, model_type, criterion, lp_backend in session_tasks:
+                if i in sessions and sessions[i].lp_backend == lp_backend:
+                    sessions[i].set_model_type(model_type)
+                    sessions[i].set_criterion(criterion)
+                else:
+                    sessions[i] = SolverSession(functions.ith_data(data, i), model_type, criterion, lp_backend)
+            pools.append(ThreadPoolExecutor(max_workers=min(workers, len(session_tasks))))
+            futures.update({pools[-1].submit(sessions[i].solve): i for i, *_ in session_tasks})
+        if tasks:
+            shm, A = _share(data.A)
+            shared_data = data._replace(A=list()) if shm is not None else data
+            initargs = (_vars_snapshot(),) + ((shm.name, A.shape, A.dtype.str) if shm is not None else ())
+            pools.append(ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs))
+            futures.update({pools[-1].submit(_solve_shared, i, functions.ith_data(shared_data, i), model_type,
+                                             criterion, lp_backend): i
+                            for i, model_type, criterion, lp_backend in tasks})
+
+        try:
+            for future in as_completed(futures):
+                solution, error = None, None
+                try:
+                    solution = future.result()
+                except Exception as e:
+                    error = e
+                yield futures[future], solution, error
+        finally:
+            for pool in pools:
+                pool.shutdown(cancel_futures=True)
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+
+def solve_all(data: ModelData, workers: int = None, backend: str = "process", elements=None, model_types=None,
+              criteria=None, sessions: dict = None, on_error=None, lp_backends=None,
+              combine: bool = False) -> SolutionData:
+    """
+    Solves the elements of the model data in parallel (see ``iter_solve``).
+
+    Args:
+        data: The model data.
+        workers: The number of worker processes or threads (the number of CPUs by default).
+        backend: "process" or "thread".
+        elements: The indices of the elements to solve (all elements by default).
+        model_types: The model type of each element, indexed by the element index (``data.model_types`` by default).
+        criteria: The criterion of each element, indexed by the element index (``data.criteria`` by default).
+        sessions: A dictionary of solver sessions by element index, kept by the caller (the "thread" backend adds a
+            session for every solved element, the "process" backend only uses the existing ones).
+        on_error: A callable ``on_error(element_idx, error)`` that handles a failed element; the error is raised if
+            not given.
+        lp_backends: The LP backend of each element, indexed by the element index (``Vars.lp_backend`` by default).
+        combine: Whether the elements of the first and the second linear models are solved as block-diagonal LPs.
+
+    Returns:
+        The solutions of the solved elements in element order.
+    """
+    results = dict()
+    for element_idx, solution, error in iter_solve(data, workers, backend, elements, model_types, criteria, sessions,
+                                                   lp_backends, combine):
+        if error is not None:
+            LOGGER.error(f"Failed to solve for Element {element_idx + 1}. Error: {error}")
+            if on_error is None:
+                raise error
+            on_error(element_idx, error)
+        elif solution:
+            LOGGER.info("Solution found for element %s: %s", element_idx + 1, summary(solution))
+            results[element_idx] = solution
+        else:
+            LOGGER.warning(f"No solution found for Element {element_idx + 1}.")
+
+    return SolutionData(names=[f"Element №{i + 1}" for i in sorted(results)],
+                        values=[results[i] for i in sorted(results)])
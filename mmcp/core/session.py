@@ -0,0 +1,128 @@
+from mmcp.core import Solver, CriterionError, ConfigurationError
+from mmcp.utils import Vars, ModelType, Criterion
+from .. import linear_models as lm
+from ..utils.logger_setup import LOGGER
+
+_ORDINALS = {1: "first", 2: "second", 3: "third"}
+
+
+class SolverSession:
+    """
+    Keeps the solver model of one element alive between solves.
+
+    For the first and the second linear models the built model is kept, changes of single coefficients, bounds,
+    criteria and model types are applied to it in place, and every re-solve starts from the previous basis. Other
+    models are solved from scratch through ``Solver`` on every call.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+
+    INCREMENTAL_MODEL_TYPES = (ModelType.LINEAR_MODEL_1, ModelType.LINEAR_MODEL_2)
+
+    def __init__(self, data, model_type: ModelType, criterion_type: Criterion, lp_backend: str = None):
+        LOGGER.debug(f"Initializing SolverSession with model_type={model_type}, criterion_type={criterion_type}, "
+                     f"lp_backend={lp_backend}")
+        self.data = data
+        self.model_type = model_type
+        self.criterion_type = criterion_type
+        self.lp_backend = lp_backend
+        self._model = None
+
+    @property
+    def is_incremental(self) -> bool:
+        """Whether the session keeps its model alive between solves."""
+        return self.model_type in self.INCREMENTAL_MODEL_TYPES and not lm.backends.is_native(self.lp_backend)
+
+    def _incremental_model(self):
+        if self._model is None:
+            self._model = lm.incremental.IncrementalLinearModel(self.data.c, self.data.A, self.data.b,
+                                                                self.data.d, self.lp_backend)
+        self._model.set_private_resources(self.model_type == ModelType.LINEAR_MODEL_2)
+        return self._model
+
+    def set_model_type(self, model_type: ModelType):
+        """Sets the model type; switching between the first and the second linear models keeps the model."""
+        LOGGER.debug(f"Setting session model type to {model_type}")
+        self.model_type = model_type
+
+    def set_criterion(self, criterion_type: Criterion):
+        """Sets the criterion; the kept model serves every criterion."""
+        LOGGER.debug(f"Setting session criterion to {criterion_type}")
+        self.criterion_type = criterion_type
+
+    def set_objective_coefficient(self, j: int, value: float):
+        """Sets ``c[j]`` in the element data and in the kept model."""
+        LOGGER.debug(f"Setting c[{j}] to {value}")
+        self.data.c[j] = value
+        if self._model is not None:
+            self._model.set_objective_coefficient(j, value)
+
+    def set_private_resource(self, j: int, value: float):
+        """Sets ``d[j]`` in the element data and in the kept model."""
+        LOGGER.debug(f"Setting d[{j}] to {value}")
+        if self.data.d is None:
+            LOGGER.error("The element has no private resources d.")
+            raise ConfigurationError("The element has no private resources d.")
+        self.data.d[j] = value
+        if self._model is not None:
+            self._model.set_private_resource(j, value)
+
+    def set_constraint_bound(self, i: int, value: float):
+        """Sets ``b[i]`` in the element data and in the kept model."""
+        LOGGER.debug(f"Setting b[{i}] to {value}")
+        self.data.b[i] = value
+        if self._model is not None:
+            self._model.set_constraint_bound(i, value)
+
+    def set_constraint_coefficient(self, i: int, j: int, value: float):
+        """Sets ``A[i][j]`` in the element data and in the kept model."""
+        LOGGER.debug(f"Setting A[{i}][{j}] to {value}")
+        self.data.A[i, j] = value  # Dense arrays and sparse matrices alike
+        if self._model is not None:
+            self._model.set_constraint_coefficient(i, j, value)
+
+    def update(self, key: str, index, value: float):
+        """
+        Sets a single entry of the element data by its key.
+
+        Args:
+            key: One of "c", "d", "b" or "A".
+            index: The index of the entry (a pair of indices for "A").
+            value: The new value.
+        """
+        index = tuple(index) if isinstance(index, (tuple, list)) else (index,)
+        try:
+            if key == "c":
+                self.set_objective_coefficient(*index, value)
+            elif key == "d":
+                self.set_private_resource(*index, value)
+            elif key == "b":
+                self.set_constraint_bound(*index, value)
+            elif key == "A":
+                self.set_constraint_coefficient(*index, value)
+            else:
+                raise ConfigurationError(f"Unsupported key for an in-place update: \"{key}\"")
+        except (TypeError, IndexError) as e:
+            LOGGER.exception(f"Invalid index {index} for \"{key}\": {e}")
+            raise ConfigurationError(f"Invalid index {index} for \"{key}\": {e}") from e
+
+    def solve(self):
+        """Solves the element, re-using the kept model where possible."""
+        LOGGER.debug(f"Solving session with {self.model_type} and {self.criterion_type}")
+        if not self.is_incremental:
+            return Solver(self.data, self.model_type, self.criterion_type, self.lp_backend, use_cache=False).solve()
+
+        model = self._incremental_model()
+        description = (f"the {_ORDINALS[int(self.model_type)]} linear model, "
+                       f"{_ORDINALS[int(self.criterion_type)]} criterion")
+        if self.criterion_type == Criterion.CRITERION_1:
+            return model.solve_criterion_1(description)
+        elif self.criterion_type == Criterion.CRITERION_2:
+            return model.solve_criterion_2(Vars.z_min, Vars.alpha, description)
+        elif self.criterion_type == Criterion.CRITERION_3:
+            return model.solve_criterion_3(Vars.weights, description=description)
+        else:
+            LOGGER.error(f"Unsupported criterion for {self.model_type}: {str(self.criterion_type)}")
+            raise CriterionError(f"Unsupported criterion for {self.model_type}: {str(self.criterion_type)}")
+
+    def __str__(self):
+        return f"Session of \"{self.model_type}\" with criterion: \"{self.criterion_type}\""
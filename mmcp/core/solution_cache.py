@@ -0,0 +1,211 @@
+from collections import OrderedDict
+from json import dumps as json_dumps, loads as json_loads
+from os import makedirs, replace, getpid
+from pathlib import Path
+from pickle import dumps, loads, HIGHEST_PROTOCOL
+from threading import Lock, get_ident
+from typing import NamedTuple
+
+from numpy import array, dtype, generic, ndarray
+
+from mmcp.utils import Vars, ModelType, Criterion
+from ..utils.hashing import content_hash
+from ..utils.logger_setup import LOGGER
+
+# The data fields and the configuration parameters a solution depends on, by model type and criterion
+DATA_FIELDS = {
+    ModelType.LINEAR_MODEL_1: ("c", "A", "b"),
+    ModelType.LINEAR_MODEL_2: ("c", "A", "b", "d"),
+    ModelType.LINEAR_MODEL_3: ("c", "A", "b", "d", "model_types"),
+    ModelType.COMBINATORIAL_MODEL: ("processing_times", "precedence_graph", "weights"),
+}
+_LINEAR_PARAMETERS = {
+    Criterion.CRITERION_1: ("M",),
+    Criterion.CRITERION_2: ("z_min", "alpha"),
+    Criterion.CRITERION_3: ("weights", "weights_tolerance", "weights_max_iterations"),
+}
+PARAMETERS = {
+    **{(model_type, criterion): parameters for criterion, parameters in _LINEAR_PARAMETERS.items()
+       for model_type in (ModelType.LINEAR_MODEL_1, ModelType.LINEAR_MODEL_2)},
+    (ModelType.LINEAR_MODEL_3, Criterion.CRITERION_1): ("beta", "connected_method", "decomposition_tolerance",
+                                                        "decomposition_max_iterations"),
+    (ModelType.COMBINATORIAL_MODEL, Criterion.CRITERION_1): ("M", "scheduling_method", "exact_max_jobs",
+                                                             "exact_time_limit"),
+    (ModelType.COMBINATORIAL_MODEL, Criterion.CRITERION_2): ("target_difference", "dW", "tolerance",
+                                                             "scheduling_method", "exact_max_jobs",
+                                                             "exact_time_limit"),
+}
+
+
+class CacheInfo(NamedTuple):
+    """The counters of a solution cache."""
+    LOGGER.debug(f"Initialized {__name__}")
+    hits: int
+    disk_hits: int
+    misses: int
+    size: int
+    max_size: int
+
+
+def _encode(value):
+    """
+    Converts a solution to JSON values, tagging the containers and the NumPy values JSON does not have.
+
+    Raises:
+        TypeError: If the solution holds another type (like a NamedTuple or an object array).
+    """
+    if isinstance(value, generic):
+        return {"scalar": _encode(value.item()), "dtype": value.dtype.str}
+    if isinstance(value, ndarray):
+        if value.dtype.hasobject:
+            raise TypeError(f"Unable to encode an array of dtype {value.dtype}")
+        return {"ndarray": value.tolist(), "dtype": value.dtype.str, "shape": list(value.shape)}
+    if value is None or type(value) in (bool, int, float, str):
+        return value
+    if type(value) is list:
+        return [_encode(item) for item in value]
+    if type(value) is tuple:
+        return {"tuple": [_encode(item) for item in value]}
+    if type(value) is dict:
+        return {"dict": [[_encode(key), _encode(item)] for key, item in value.items()]}
+    raise TypeError(f"Unable to encode a value of type {type(value).__name__}")
+
+
+def _decode(tagged: dict):
+    """Rebuilds a value tagged by ``_encode`` (the ``object_hook`` of ``json.loads``); only builds plain data."""
+    if "scalar" in tagged:
+        return dtype(tagged["dtype"]).type(tagged["scalar"])
+    if "ndarray" in tagged:
+        return array(tagged["ndarray"], dtype=dtype(tagged["dtype"])).reshape(tagged["shape"])
+    if "tuple" in tagged:
+        return tuple(tagged["tuple"])
+    if "dict" in tagged:
+        return {key: item for key, item in tagged["dict"]}
+    raise ValueError(f"Unknown cached value: {sorted(tagged)}")
+
+
+def solution_key(data, model_type: ModelType, criterion: Criterion, lp_backend: str = None) -> str:
+    """
+    Computes the cache key of a solution: a content hash of the data fields the model type reads, the model type,
+    the criterion, the LP backend and the configuration parameters the criterion depends on (every parameter of
+    ``Vars`` for an unknown pair).
+
+    Args:
+        data: The data of the element (or the whole model data for the connected and the combinatorial models).
+        model_type: The model type.
+        criterion: The criterion.
+        lp_backend: The LP backend the element is solved with (None for ``Vars.lp_backend``).
+
+    Returns:
+        The key.
+    """
+    fields = DATA_FIELDS.get(model_type, data._fields)
+    names = PARAMETERS.get((model_type, criterion))
+    if names is None:
+        names = sorted(k for k in vars(Vars) if not k.startswith("_"))
+    parameters = {name: getattr(Vars, name) for name in names}
+    lp_backend = str(Vars.lp_backend if lp_backend is None else lp_backend).upper()
+    return content_hash(model_type.name, criterion.name, lp_backend, parameters,
+                        [getattr(data, field, None) for field in fields])
+
+
+class SolutionCache:
+    """
+    A least recently used cache of solutions by ``solution_key``, optionally backed by a directory, so unchanged
+    elements are not solved again, within a run and across runs.
+
+    The solutions are kept pickled in memory, so every hit returns a new copy. The directory stores them as tagged
+    JSON instead (see ``_encode``), which only decodes to plain data, so a file placed there cannot run code; the
+    solutions JSON cannot hold stay in memory only. The size and the directory are read from
+    ``Vars.solution_cache_size`` (0 disables the cache) and ``Vars.solution_cache_dir`` (None keeps the solutions in
+    memory only) unless they are given.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+
+    def __init__(self, max_size: int = None, directory=None):
+        self._max_size = max_size
+        self._directory = directory
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.hits = self.disk_hits = self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        return Vars.solution_cache_size if self._max_size is None else self._max_size
+
+    @property
+    def directory(self):
+        directory = Vars.solution_cache_dir if self._directory is None else self._directory
+        return None if directory is None else Path(directory)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _store(self, key: str, payload: bytes):
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str):
+        """
+        Returns the cached solution of the key (loaded from the directory if it is not in memory), or None.
+        """
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return loads(payload)
+
+        if self.directory is not None and self._path(key).is_file():
+            try:
+                solution = json_loads(self._path(key).read_text(encoding="utf-8"), object_hook=_decode)
+            except Exception as e:
+                LOGGER.warning(f"Ignoring the unreadable cached solution {self._path(key)}: {e}")
+            else:
+                self._store(key, dumps(solution, protocol=HIGHEST_PROTOCOL))
+                with self._lock:
+                    self.disk_hits += 1
+                return solution
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, solution):
+        """Caches the solution of the key (and writes it to the directory, if there is one)."""
+        self._store(key, dumps(solution, protocol=HIGHEST_PROTOCOL))
+        if self.directory is not None:
+            try:
+                text = json_dumps(_encode(solution))
+            except TypeError as e:
+                LOGGER.debug(f"Keeping the solution {key} in memory only: {e}")
+                return
+            try:
+                makedirs(self.directory, exist_ok=True)
+                temporary = self._path(key).with_suffix(f".{getpid()}-{get_ident()}.tmp")
+                temporary.write_text(text, encoding="utf-8")
+                replace(temporary, self._path(key))  # Readers never see a partially written solution
+            except OSError as e:
+                LOGGER.warning(f"Unable to write the cached solution {self._path(key)}: {e}")
+
+    def clear(self, disk: bool = False):
+        """Clears the solutions in memory (and in the directory with ``disk``) and resets the counters."""
+        LOGGER.debug(f"Clearing the solution cache ({disk=}).")
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+        if disk and self.directory is not None and self.directory.is_dir():
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def info(self) -> CacheInfo:
+        """The hit and miss counters and the number of solutions in memory."""
+        with self._lock:
+            return CacheInfo(self.hits, self.disk_hits, self.misses, len(self._entries), self.max_size)
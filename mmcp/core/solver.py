@@ -1,17 +1,25 @@
-from mmcp.core import Model, ModelTypeError, CriterionError
+from mmcp.core import Model, ModelTypeError, CriterionError, ConfigurationError
 from mmcp.utils import Vars, ModelType, Criterion
+from .solution_cache import SolutionCache, solution_key
 from .. import linear_models as lm, combinatorial_models as cm
-from ..utils.logger_setup import LOGGER
+from ..utils.logger_setup import LOGGER, summary
 
 
 class Solver:
     LOGGER.debug(f"Initialized {__name__}")
+    # The solutions shared by all solvers, see SolutionCache
+    cache = SolutionCache()
 
-    def __init__(self, data, model_type: ModelType, criterion_type: Criterion):
-        LOGGER.debug(f"Initializing Solver with data={data}, model_type={model_type}, criterion_type={criterion_type}")
+    def __init__(self, data, model_type: ModelType, criterion_type: Criterion, lp_backend: str = None,
+                 use_cache: bool = True):
+        LOGGER.debug("Initializing Solver with data=%s, model_type=%s, criterion_type=%s, lp_backend=%s",
+                     summary(data), model_type, criterion_type, lp_backend)
         self.data = data
+        self.model_type = model_type
         self.model = self._create_model(model_type)
         self.criterion_type = criterion_type
+        self.lp_backend = lp_backend
+        self.use_cache = use_cache
 
     @staticmethod
     def _create_model(model_type: ModelType) -> Model:
@@ -28,9 +36,23 @@ def _create_model(model_type: ModelType) -> Model:
             LOGGER.error(f"Invalid model type: {model_type}")
             raise ModelTypeError(f"Invalid model type: {model_type}")
 
+    def cache_key(self) -> str:
+        """The key of the solution in the solution cache (see ``solution_key``)."""
+        return solution_key(self.data, self.model_type, self.criterion_type, self.lp_backend)
+
     def solve(self):
         LOGGER.debug(f"Solving model with criterion: {self.criterion_type}")
-        return self.model.solve(self.criterion_type, self.data)
+        key = self.cache_key() if self.use_cache and Solver.cache.enabled else None
+        if key is not None:
+            solution = Solver.cache.get(key)
+            if solution is not None:
+                LOGGER.debug(f"Solution found in the cache: {key}")
+                return solution
+
+        solution = self.model.solve(self.criterion_type, self.data, lp_backend=self.lp_backend)
+        if key is not None:
+            Solver.cache.put(key, solution)
+        return solution
 
     def __str__(self):
         return f"\"{self.model}\" with criterion: \"{self.criterion_type}\""
@@ -39,14 +61,14 @@ def __str__(self):
 class LinearModel1(Model):
     LOGGER.debug(f"Initialized {__name__}")
 
-    def solve(self, criterion: Criterion, data, **kwargs):
+    def solve(self, criterion: Criterion, data, lp_backend: str = None, **kwargs):
         LOGGER.debug(f"Solving LinearModel1 with criterion: {criterion}")
         if criterion == Criterion.CRITERION_1:
-            return lm.first.criterion_1.solve(data.c, data.A, data.b, Vars.M)
+            return lm.first.criterion_1.solve(data.c, data.A, data.b, Vars.M, lp_backend)
         elif criterion == Criterion.CRITERION_2:
-            return lm.first.criterion_2.solve(data.c, data.A, data.b, Vars.z_min, Vars.alpha)
+            return lm.first.criterion_2.solve(data.c, data.A, data.b, Vars.z_min, Vars.alpha, lp_backend)
         elif criterion == Criterion.CRITERION_3:
-            return lm.first.criterion_3.solve(data.c, data.A, data.b, Vars.weights)
+            return lm.first.criterion_3.solve(data.c, data.A, data.b, Vars.weights, lp_backend)
         else:
             LOGGER.error(f"Unsupported criterion for Linear Model 1: {str(criterion)}")
             raise CriterionError(f"Unsupported criterion for Linear Model 1: {str(criterion)}")
@@ -58,14 +80,14 @@ def __str__(self):
 class LinearModel2(Model):
     LOGGER.debug(f"Initialized {__name__}")
 
-    def solve(self, criterion: Criterion, data, **kwargs):
+    def solve(self, criterion: Criterion, data, lp_backend: str = None, **kwargs):
         LOGGER.debug(f"Solving LinearModel2 with criterion: {criterion}")
         if criterion == Criterion.CRITERION_1:
-            return lm.second.criterion_1.solve(data.c, data.A, data.b, data.d, Vars.M)
+            return lm.second.criterion_1.solve(data.c, data.A, data.b, data.d, Vars.M, lp_backend)
         elif criterion == Criterion.CRITERION_2:
-            return lm.second.criterion_2.solve(data.c, data.A, data.b, data.d, Vars.z_min, Vars.alpha)
+            return lm.second.criterion_2.solve(data.c, data.A, data.b, data.d, Vars.z_min, Vars.alpha, lp_backend)
         elif criterion == Criterion.CRITERION_3:
-            return lm.second.criterion_3.solve(data.c, data.A, data.b, data.d, Vars.weights)
+            return lm.second.criterion_3.solve(data.c, data.A, data.b, data.d, Vars.weights, lp_backend)
         else:
             LOGGER.error(f"Unsupported criterion for Linear Model 2: {str(criterion)}")
             raise CriterionError(f"Unsupported criterion for Linear Model 2: {str(criterion)}")
@@ -77,14 +99,29 @@ def __str__(self):
 class LinearModel3(Model):
     LOGGER.debug(f"Initialized {__name__}")
 
-    def solve(self, criterion: Criterion, data, **kwargs):
+    def solve(self, criterion: Criterion, data, lp_backend: str = None, **kwargs):
         LOGGER.debug(f"Solving LinearModel3 with criterion: {criterion}")
         if criterion == Criterion.CRITERION_1:
-            return lm.third.connected_model.solve(data.c, data.A, data.b, data.d, data.model_types, Vars.beta)
+            if Vars.connected_method == "column_generation":
+                return lm.third.decomposition.solve(data.c, data.A, data.b, data.d, data.model_types, Vars.beta,
+                                                    lp_backend)
+            elif Vars.connected_method != "monolithic":
+                LOGGER.error(f"Unsupported method for the connected model: {Vars.connected_method}")
+                raise ConfigurationError(f"Unsupported method for the connected model: \"{Vars.connected_method}\". "
+                                         f"Expected \"monolithic\" or \"column_generation\".")
+            return lm.third.connected_model.solve(data.c, data.A, data.b, data.d, data.model_types, Vars.beta,
+                                                  lp_backend)
         else:
             LOGGER.error(f"Unsupported criterion for Linear Model 3: {str(criterion)}")
             raise CriterionError(f"Unsupported criterion for Linear Model 3: {str(criterion)}")
 
+    @staticmethod
+    def solve_beta_path(data, betas, lp_backend: str = None):
+        """Solves the connected model for every beta of ``betas`` with a single model (see ``solve_beta_path``)."""
+        LOGGER.debug(f"Solving LinearModel3 for {len(betas)} betas")
+        return lm.third.connected_model.solve_beta_path(data.c, data.A, data.b, data.d, data.model_types, betas,
+                                                        lp_backend)
+
     def __str__(self):
         return "Linear Model 3 (Connected Model)"
 
@@ -95,10 +132,11 @@ class CombinatorialModel(Model):
     def solve(self, criterion: Criterion, data, **kwargs):
         LOGGER.debug(f"Solving CombinatorialModel with criterion: {criterion}")
         if criterion == Criterion.CRITERION_1:
-            return cm.first.criterion_1.solve(data.processing_times, data.precedence_graph, data.weights, Vars.M)
+            return cm.first.criterion_1.solve(data.processing_times, data.precedence_graph, data.weights, Vars.M,
+                                              Vars.scheduling_method, Vars.exact_max_jobs, Vars.exact_time_limit)
         elif criterion == Criterion.CRITERION_2:
             return cm.first.criterion_2.solve(data.processing_times, data.precedence_graph, data.weights,
-                                              Vars.target_difference)
+                                              Vars.target_difference, Vars.scheduling_method)
         else:
             LOGGER.error(f"Unsupported criterion for Combinatorial Model: {str(criterion)}")
             raise CriterionError(f"Unsupported criterion for Combinatorial Model: {str(criterion)}")
@@ -3,6 +3,7 @@
 from numpy import ndarray
 
 from mmcp.utils import ModelType, Criterion
+from .element_view import ElementView, element_view, clear_element_cache
 from ..utils.logger_setup import LOGGER
 from ..utils.outs import message
 
@@ -25,6 +26,7 @@ def set_model_type_for_all(self, model_types: ndarray):
         """
         LOGGER.debug(f"Setting model type for all elements to {model_types}")
         self.model_types[:] = model_types
+        clear_element_cache(self)
 
     def set_criteria_for_all(self, criteria: ndarray):
         """
@@ -35,10 +37,20 @@ def set_criteria_for_all(self, criteria: ndarray):
         """
         LOGGER.debug(f"Setting criterion for all elements to {criteria}")
         self.criteria[:] = criteria
+        clear_element_cache(self)
 
     def __repr__(self) -> str:
         return message("Linear Model Data", self._asdict())
 
+    def element(self, element_idx: int) -> ElementView:
+        """
+        Returns the cached, zero-copy view of an element (see ``mmcp.data.element_view``).
+
+        Args:
+            element_idx: The index of the element.
+        """
+        return element_view(self, element_idx)
+
 
 class CombinatorialModelData(NamedTuple):
     LOGGER.debug(f"Initialized {__name__}")
@@ -65,6 +77,15 @@ class ModelData(NamedTuple):
     def __repr__(self) -> str:
         return message("Model Data", self._asdict())
 
+    def element(self, element_idx: int) -> ElementView:
+        """
+        Returns the cached, zero-copy view of an element (see ``mmcp.data.element_view``).
+
+        Args:
+            element_idx: The index of the element.
+        """
+        return element_view(self, element_idx)
+
     def set_model_type(self, element_idx: int, model_type: ModelType):
         """
         Sets or updates the model_type for a specific element.
@@ -76,6 +97,7 @@ def set_model_type(self, element_idx: int, model_type: ModelType):
         LOGGER.debug(f"Setting model type for element {element_idx} to {model_type}")
         assert 0 <= element_idx < len(self.model_types), f"Invalid element index: {element_idx}"
         self.model_types[element_idx] = int(model_type)
+        clear_element_cache(self, element_idx)
 
     def set_criteria(self, element_idx: int, criterion: Criterion):
         """
@@ -88,6 +110,7 @@ def set_criteria(self, element_idx: int, criterion: Criterion):
         LOGGER.debug(f"Setting criterion for element {element_idx} to {criterion}")
         assert 0 <= element_idx < len(self.criteria), f"Invalid element index: {element_idx}"
         self.criteria[element_idx] = int(criterion)
+        clear_element_cache(self, element_idx)
 
     def set_model_type_for_all(self, model_types: ndarray):
         """
@@ -98,6 +121,7 @@ def set_model_type_for_all(self, model_types: ndarray):
         """
         LOGGER.debug(f"Setting model type for all elements to {model_types}")
         self.model_types[:] = model_types
+        clear_element_cache(self)
 
     def set_criteria_for_all(self, criteria: ndarray):
         """
@@ -108,6 +132,7 @@ def set_criteria_for_all(self, criteria: ndarray):
         """
         LOGGER.debug(f"Setting criterion for all elements to {criteria}")
         self.criteria[:] = criteria
+        clear_element_cache(self)
 
 
 class SolutionData(NamedTuple):
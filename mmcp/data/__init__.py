@@ -1,19 +1,51 @@
-from .Data import LinearModelData, CombinatorialModelData, ModelData, SolutionData
-from .data_file_parser import parse_data_json_file
-from .data_generation import generate_linear_model_data, generate_combinatorial_model_data, generate_model_data
-from .out_file_generation import generate_data_json_file
+# The element views are imported eagerly: their submodule and the function share the name "element_view"
+from .element_view import ELEMENT_FIELDS, ElementView, element_view, clear_element_cache
+from ..utils.lazy import lazy_exports
 from ..utils.logger_setup import LOGGER
 
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".Data": ("LinearModelData", "CombinatorialModelData", "ModelData", "SolutionData"),
+    ".sparse": ("is_sparse", "is_sparse_tensor", "to_sparse", "to_dense", "tensor_shape"),
+    ".binary_format": ("save_binary_data", "load_binary_data", "BinaryDataWriter"),
+    ".data_file_parser": ("parse_data_json_file", "parse_data_file"),
+    ".data_generation": ("GenerationOptions", "PRESETS", "generation_options", "iter_linear_model_data",
+                         "generate_linear_model_data", "generate_combinatorial_model_data", "generate_model_data"),
+    ".out_file_generation": ("generate_data_json_file", "generate_data_binary_file", "generate_data_file",
+                             "JsonDataWriter", "StreamReport", "stream_data_file"),
+})
+
 LOGGER.debug(f"Initialized {__name__}")
 
 __all__ = [
+    "ELEMENT_FIELDS",
+    "ElementView",
+    "element_view",
+    "clear_element_cache",
     "LinearModelData",
     "CombinatorialModelData",
     "ModelData",
     "SolutionData",
     "parse_data_json_file",
+    "parse_data_file",
+    "GenerationOptions",
+    "PRESETS",
+    "generation_options",
+    "iter_linear_model_data",
     "generate_linear_model_data",
     "generate_combinatorial_model_data",
     "generate_model_data",
     "generate_data_json_file",
+    "generate_data_binary_file",
+    "generate_data_file",
+    "JsonDataWriter",
+    "StreamReport",
+    "stream_data_file",
+    "save_binary_data",
+    "load_binary_data",
+    "BinaryDataWriter",
+    "is_sparse",
+    "is_sparse_tensor",
+    "to_sparse",
+    "to_dense",
+    "tensor_shape",
 ]
@@ -0,0 +1,53 @@
+from argparse import ArgumentParser
+from sys import exit as sys_exit, stderr
+
+from mmcp.core import FileSavingError
+from .data_generation import SEED, PRESETS
+from .out_file_generation import DATA_FORMATS, stream_data_file
+
+# The number of progress lines printed while streaming
+PROGRESS_STEPS = 10
+
+
+def _arguments(argv=None):
+    parser = ArgumentParser(prog="python -m mmcp.data",
+                            description="Generates a synthetic data file chunk by chunk, with bounded memory, and "
+                                        "reports the throughput.")
+    parser.add_argument("output", help="The data file to write: a binary archive (.npz, .zip), a binary data "
+                                       "directory (a name ending with \"/\" or an existing directory), or a JSON file "
+                                       "(any other extension).")
+    parser.add_argument("-f", "--format", choices=DATA_FORMATS, help="The format of the output, instead of the one "
+                                                                     "given by its name.")
+    parser.add_argument("-e", "--elements", type=int, default=5, help="The number of elements.")
+    parser.add_argument("-n", "--vars", type=int, default=10, help="The number of variables of each element.")
+    parser.add_argument("-j", "--jobs", type=int, default=10, help="The number of jobs.")
+    parser.add_argument("-c", "--chunk-size", type=int, help="The number of elements generated and written at once.")
+    parser.add_argument("-t", "--threads", type=int, default=1, help="The number of threads drawing the elements.")
+    parser.add_argument("--seed", type=int, default=SEED, help="The seed of the instance.")
+    parser.add_argument("--preset", default="default", choices=list(PRESETS), help="The family of the instance.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    arguments = _arguments(argv)
+    printed = [0]
+
+    def progress(done, total, seconds):
+        step = done * PROGRESS_STEPS // max(total, 1)
+        if step > printed[0]:
+            printed[0] = step
+            print(f"[{done}/{total}] elements in {seconds:.2f}s", flush=True)
+
+    try:
+        report = stream_data_file(arguments.output, arguments.elements, arguments.vars, arguments.jobs,
+                                  arguments.chunk_size, arguments.threads, arguments.seed, arguments.preset, progress,
+                                  arguments.format)
+    except (FileSavingError, ValueError) as e:
+        print(f"Unable to generate {arguments.output}: {e}", file=stderr)
+        return 1
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys_exit(main())
@@ -0,0 +1,338 @@
+from json import dumps, loads
+from os import makedirs, listdir
+from os.path import join, isdir, basename, dirname
+from struct import pack, unpack
+from zipfile import ZipFile, ZIP_STORED, ZIP_DEFLATED, BadZipFile
+
+from numpy import ndarray, asarray, ascontiguousarray, dtype as np_dtype, stack, save, load, memmap, generic
+from numpy.lib import format as npy_format
+
+from mmcp.core import FileSavingError, DataParsingError, DataValidationError
+from mmcp.data import LinearModelData, CombinatorialModelData, ModelData, SolutionData
+from .sparse import is_sparse_tensor, pack_csr, unpack_csr
+from ..utils.logger_setup import LOGGER
+
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 1
+ARCHIVE_EXTENSIONS = (".npz", ".zip")
+# The length of the headers of appended .npy files, which are rewritten with the final number of rows on closing
+APPEND_HEADER_BYTES = 256
+DATA_TYPES = {data_type.__name__: data_type
+              for data_type in (LinearModelData, CombinatorialModelData, ModelData, SolutionData)}
+
+
+def is_binary_data_path(path) -> bool:
+    """Whether the path names a binary data container (an archive, a directory, or the manifest of a directory)."""
+    path = str(path)
+    return path.lower().endswith(ARCHIVE_EXTENSIONS) or basename(path) == MANIFEST_NAME or isdir(path)
+
+
+def _to_json(value):
+    """Converts NumPy values nested in lists, tuples and dictionaries to plain JSON values."""
+    if isinstance(value, (ndarray, generic)):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {str(k): _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    return value
+
+
+def _split_fields(data):
+    """
+    Splits the fields of a data tuple into arrays (stored as .npy files) and the manifest.
+
+    A list of equally shaped arrays with missing (None) items, like ``d``, is stacked into one array; the indices of
+    the present items are kept in the manifest. A list of sparse matrices, like a sparse ``A``, is stored as the
+    concatenated CSR arrays ``<key>_data``, ``<key>_indices`` and ``<key>_indptr``; the shapes are kept in the manifest.
+
+    Returns:
+        A tuple containing:
+            - The dictionary of arrays by field name.
+            - The manifest.
+    """
+    arrays = dict()
+    manifest = {"version": FORMAT_VERSION, "type": type(data).__name__, "arrays": list(), "optional": dict(),
+                "sparse": dict(), "fields": dict()}
+
+    # noinspection PyProtectedMember
+    for key, value in data._asdict().items():
+        if isinstance(value, ndarray) and value.dtype != object:
+            arrays[key] = value
+            manifest["arrays"].append(key)
+            continue
+
+        if is_sparse_tensor(value):
+            values, indices, indptr, shapes = pack_csr(value)
+            arrays.update({f"{key}_data": values, f"{key}_indices": indices, f"{key}_indptr": indptr})
+            manifest["sparse"][key] = {"format": "csr", "shapes": shapes}
+            continue
+
+        if isinstance(value, list) and value and all(item is None or isinstance(item, ndarray) for item in value):
+            present = [i for i, item in enumerate(value) if item is not None]
+            try:
+                stacked = stack([value[i] for i in present]) if present else None
+            except ValueError:
+                stacked = None
+            if stacked is not None and stacked.dtype != object:
+                arrays[key] = stacked
+                manifest["optional"][key] = {"length": len(value), "present": present}
+                continue
+
+        manifest["fields"][key] = _to_json(value)
+
+    return arrays, manifest
+
+
+def save_binary_data(path, data, compressed: bool = False, archive: bool = None):
+    """
+    Saves a data tuple (``ModelData``, ``SolutionData``, ...) in the binary container format.
+
+    Every array field is written as a ``.npy`` file and the remaining fields (like ``precedence_graph``) are written
+    to a small JSON manifest. A path ending with ``.npz`` or ``.zip`` is written as a single archive, any other path
+    as a directory, unless ``archive`` is given.
+
+    Args:
+        path: The archive or directory path.
+        data: The data to write.
+        compressed: Whether the archive members are compressed (compressed members cannot be memory-mapped).
+        archive: Whether to write an archive (None to decide by the extension of the path).
+    """
+    LOGGER.debug(f"Entering save_binary_data with path={path}, compressed={compressed}")
+    arrays, manifest = _split_fields(data)
+
+    try:
+        if str(path).lower().endswith(ARCHIVE_EXTENSIONS) if archive is None else archive:
+            with ZipFile(path, "w", compression=ZIP_DEFLATED if compressed else ZIP_STORED, allowZip64=True) as zf:
+                for key, value in arrays.items():
+                    with zf.open(f"{key}.npy", "w", force_zip64=True) as f:
+                        npy_format.write_array(f, asarray(value), allow_pickle=False)
+                zf.writestr(MANIFEST_NAME, dumps(manifest))
+        else:
+            path = dirname(path) if basename(str(path)) == MANIFEST_NAME else path
+            makedirs(path, exist_ok=True)
+            for key, value in arrays.items():
+                save(join(path, f"{key}.npy"), value, allow_pickle=False)
+            with open(join(path, MANIFEST_NAME), "w", encoding="utf-8") as f:
+                f.write(dumps(manifest))
+        LOGGER.info(f"Generated binary data container: {path}")
+    except OSError as e:
+        LOGGER.exception(f"Error saving data to binary container: {e}")
+        raise FileSavingError(f"Error saving data to binary container: {e}") from e
+
+
+def archive_directory(directory, path, compressed: bool = False):
+    """
+    Stores the files of a binary data directory in an archive, copying one file at a time (so the memory use does not
+    grow with the size of the arrays).
+    """
+    LOGGER.debug(f"Archiving binary data directory {directory} to {path}")
+    with ZipFile(path, "w", compression=ZIP_DEFLATED if compressed else ZIP_STORED, allowZip64=True) as zf:
+        for name in sorted(listdir(directory)):
+            zf.write(join(directory, name), name)
+
+
+class _NpyAppender:
+    """
+    A ``.npy`` file whose rows are appended as they arrive. The header is written with a fixed length first and
+    rewritten with the final number of rows on closing.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+
+    def __init__(self, path, dtype, row_shape):
+        self.dtype, self.row_shape, self.rows = np_dtype(dtype), tuple(row_shape), 0
+        self.file = open(path, "wb")
+        self.file.write(self._header())
+
+    def _header(self) -> bytes:
+        header = repr({"descr": npy_format.dtype_to_descr(self.dtype), "fortran_order": False,
+                       "shape": (self.rows, *self.row_shape)})
+        magic = npy_format.magic(1, 0)
+        length = APPEND_HEADER_BYTES - len(magic) - 2
+        return magic + pack("<H", length) + header.ljust(length - 1).encode("latin1") + b"\n"
+
+    def append(self, rows):
+        rows = ascontiguousarray(rows, dtype=self.dtype)
+        if rows.shape[1:] != self.row_shape:
+            raise ValueError(f"Expected rows of shape {self.row_shape}, got {rows.shape[1:]}.")
+        self.file.write(rows.data)
+        self.rows += len(rows)
+
+    def close(self):
+        if not self.file.closed:
+            self.file.seek(0)
+            self.file.write(self._header())
+            self.file.close()
+
+
+class BinaryDataWriter:
+    """
+    Writes linear model data to a binary data directory chunk by chunk, so an instance is never held in memory at once.
+
+    Every array is appended to its ``.npy`` file as the chunks arrive, in the same layout as ``save_binary_data``:
+    the present items of ``d`` are stacked and a sparse ``A`` is stored as concatenated CSR arrays. ``close`` writes
+    the manifest, with the fields of the shared data (like the combinatorial data) if it is given.
+
+    Usage::
+
+        writer = BinaryDataWriter(path)
+        for start, chunk in iter_linear_model_data(num_elements, num_vars):
+            writer.write(chunk)
+        writer.close(generate_combinatorial_model_data(num_vars, num_jobs))
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+
+    def __init__(self, path):
+        self.path = path
+        self.length = 0
+        self._appenders = dict()
+        self._present = list()
+        self._shapes = list()
+        makedirs(path, exist_ok=True)
+
+    def _append(self, key: str, rows):
+        rows = asarray(rows)
+        if key not in self._appenders:
+            self._appenders[key] = _NpyAppender(join(self.path, f"{key}.npy"), rows.dtype, rows.shape[1:])
+        self._appenders[key].append(rows)
+
+    def write(self, chunk):
+        """Appends the elements of a chunk (``LinearModelData``)."""
+        for key in ("c", "b", "criteria", "model_types"):
+            self._append(key, getattr(chunk, key))
+        if is_sparse_tensor(chunk.A):
+            values, indices, indptr, shapes = pack_csr(chunk.A)
+            for part, rows in (("data", values), ("indices", indices), ("indptr", indptr)):
+                self._append(f"A_{part}", rows)
+            self._shapes += shapes
+        else:
+            self._append("A", chunk.A)
+
+        present = [k for k, item in enumerate(chunk.d) if item is not None]
+        if present:
+            self._append("d", stack([chunk.d[k] for k in present]))
+        self._present += [self.length + k for k in present]
+        self.length += len(chunk.c)
+
+    def abort(self):
+        """Closes the files without writing the manifest, so the directory is not a data container."""
+        for appender in self._appenders.values():
+            appender.close()
+
+    def close(self, shared=None):
+        """
+        Finishes the arrays and writes the manifest.
+
+        Args:
+            shared: The data of the fields that are not per element (``CombinatorialModelData``), or None for
+                ``LinearModelData``.
+        """
+        self.abort()
+        arrays, manifest = _split_fields(shared) if shared is not None else (dict(), {"fields": dict()})
+        manifest = {"version": FORMAT_VERSION, "type": "ModelData" if shared is not None else "LinearModelData",
+                    "arrays": [key for key in ("c", "A", "b", "criteria", "model_types") if key in self._appenders]
+                              + manifest.get("arrays", list()),
+                    "optional": dict(), "sparse": dict(), "fields": manifest["fields"]}
+        if self._present:
+            manifest["optional"]["d"] = {"length": self.length, "present": self._present}
+        else:
+            manifest["fields"]["d"] = [None] * self.length
+        if self._shapes:
+            manifest["sparse"]["A"] = {"format": "csr", "shapes": self._shapes}
+
+        for key, value in arrays.items():
+            save(join(self.path, f"{key}.npy"), value, allow_pickle=False)
+        with open(join(self.path, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            f.write(dumps(manifest))
+        LOGGER.info(f"Generated binary data container: {self.path}")
+
+
+def _memmap_member(path, zf, info, mmap_mode):
+    """Memory-maps an uncompressed ``.npy`` member of a zip archive in place; compressed members are read."""
+    if info.compress_type != ZIP_STORED or mmap_mode is None:
+        with zf.open(info) as f:
+            return npy_format.read_array(f, allow_pickle=False)
+
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        name_length, extra_length = unpack("<2H", local_header[26:30])
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+        version = npy_format.read_magic(f)
+        shape, fortran_order, dtype = npy_format.read_array_header_1_0(f) if version == (1, 0) \
+            else npy_format.read_array_header_2_0(f)
+        offset = f.tell()
+    if dtype.hasobject:
+        raise DataValidationError(f"Object arrays are not supported: \"{info.filename}\".")
+    return memmap(path, dtype=dtype, mode=mmap_mode, offset=offset, shape=shape,
+                  order="F" if fortran_order else "C")
+
+
+def _array_names(manifest) -> list:
+    """The names of the ``.npy`` files listed in the manifest."""
+    return (manifest.get("arrays", list()) + list(manifest.get("optional", dict()))
+            + [f"{key}_{part}" for key in manifest.get("sparse", dict()) for part in ("data", "indices", "indptr")])
+
+
+def load_binary_data(path, mmap_mode: str = "r"):
+    """
+    Loads a data tuple from the binary container format.
+
+    The arrays are memory-mapped by default, so a large ``A`` is only read from disk when an element is accessed.
+    Memory-mapping works for directories and for uncompressed archives.
+
+    Args:
+        path: The archive or directory path (or the manifest file of a directory).
+        mmap_mode: The NumPy memory-map mode ("r", "c", "r+"), or None to read the arrays into memory.
+
+    Returns:
+        The data tuple of the type recorded in the manifest.
+
+    Raises:
+        FileSavingError: If the container cannot be opened.
+        DataParsingError: If the manifest or an array cannot be read.
+        DataValidationError: If the container does not describe known data.
+    """
+    LOGGER.debug(f"Entering load_binary_data with path={path}, mmap_mode={mmap_mode}")
+    path = dirname(path) if basename(str(path)) == MANIFEST_NAME else path
+
+    try:
+        if str(path).lower().endswith(ARCHIVE_EXTENSIONS):
+            with ZipFile(path) as zf:
+                manifest = loads(zf.read(MANIFEST_NAME).decode("utf-8"))
+                arrays = {key: _memmap_member(path, zf, zf.getinfo(f"{key}.npy"), mmap_mode)
+                          for key in _array_names(manifest)}
+        else:
+            with open(join(path, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                manifest = loads(f.read())
+            arrays = {key: load(join(path, f"{key}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+                      for key in _array_names(manifest)}
+    except (OSError, BadZipFile) as e:
+        LOGGER.exception(f"Error opening binary data container: {e}")
+        raise FileSavingError(f"Error opening binary data container: {e}") from e
+    except (KeyError, ValueError) as e:
+        LOGGER.exception(f"Error parsing binary data container: {e}")
+        raise DataParsingError(f"Error parsing binary data container: {e}") from e
+
+    data_type = DATA_TYPES.get(manifest.get("type"))
+    if data_type is None or manifest.get("version") != FORMAT_VERSION:
+        LOGGER.error(f"Unsupported binary data container: type={manifest.get("type")}, "
+                     f"version={manifest.get("version")}")
+        raise DataValidationError(f"Unsupported binary data container: type={manifest.get("type")}, "
+                                  f"version={manifest.get("version")}")
+
+    fields = dict(manifest.get("fields", dict()))
+    for key, optional in manifest.get("optional", dict()).items():
+        items = [None] * optional["length"]
+        for row, i in enumerate(optional["present"]):
+            items[i] = arrays[key][row]
+        fields[key] = items
+    for key, sparse in manifest.get("sparse", dict()).items():
+        fields[key] = unpack_csr(arrays[f"{key}_data"], arrays[f"{key}_indices"], arrays[f"{key}_indptr"],
+                                 sparse["shapes"])
+    fields.update({key: arrays[key] for key in manifest.get("arrays", list())})
+    if isinstance(fields.get("precedence_graph"), dict):
+        fields["precedence_graph"] = {key: asarray(value) for key, value in fields["precedence_graph"].items()}
+
+    LOGGER.info(f"Data loaded from binary data container {path}.")
+    return data_type(**{key: value for key, value in fields.items() if key in data_type._fields})
@@ -1,18 +1,174 @@
 from codecs import open as codecs_open
-from json import load
+from json import JSONDecoder, JSONDecodeError
+from json.decoder import WHITESPACE
 
-from numpy import array, set_printoptions
+from numpy import array, asarray, ndarray, stack, zeros, isin, argmax, set_printoptions
+from scipy.sparse import csr_array
 
 from mmcp.core import FileSavingError, DataParsingError, DataValidationError
 from mmcp.data import ModelData
+from .binary_format import load_binary_data, is_binary_data_path
+from .sparse import is_sparse, sparse_from_json
 from ..utils.logger_setup import LOGGER
 
 type_error = lambda key, expected_type: f"❌ Incorrect data type for \"{key}\"! Expected {expected_type}."
 
+NUMBER_KINDS = "biuf"
+INTEGER_KINDS = "biu"
+VALID_CRITERIA = {
+    1: ([1, 2, 3], "For model type 0, the criteria should be 1, 2, or 3."),
+    2: ([1, 2, 3], "For model type 1, the criteria should be 1, 2, or 3."),
+    3: ([1], "For model type 2, the criteria should be 1."),
+    4: ([1, 2], "For model type 3, the criteria should be 1 or 2."),
+}
+
+CHUNK_SIZE = 1 << 24
+_DECODER = JSONDecoder()
+
+
+def _to_array(value):
+    """Converts a decoded value to an ndarray; ragged lists and None are returned as they are."""
+    if value is None:
+        return None
+    try:
+        converted = asarray(value)
+    except ValueError:
+        return value
+    return value if converted.dtype == object else converted
+
+
+class _JSONStream:
+    """
+    Reads a JSON text from a file in chunks, so only the part that is being decoded is held in memory.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read(self, size: int = None) -> bool:
+        """Appends the next chunk to the buffer, dropping the consumed part; returns False at the end of the file."""
+        chunk = self.f.read(max(size or 0, self.chunk_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Returns the next character (empty at the end of the file)."""
+        return self.buffer[self.pos:self.pos + 1]
+
+    def skip(self, expected: str = None):
+        """Skips whitespace and, if given, the expected character and the whitespace after it."""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self._read():
+                break
+        if expected is not None:
+            if self.peek() != expected:
+                raise JSONDecodeError(f"Expecting '{expected}'", self.buffer, self.pos)
+            self.pos += 1
+            self.skip()
+
+    def decode(self):
+        """Decodes the next JSON value, reading more of the file until the value is complete."""
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+                # A number at the very end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except JSONDecodeError:
+                if self.eof:
+                    raise
+            self._read(len(self.buffer) - self.pos)
+
+    def decode_array_or_value(self):
+        """
+        Decodes the next JSON value. A JSON array is decoded item by item and every item is converted to an ndarray as
+        soon as it is read, so the nested Python lists of a single item are alive at a time.
+
+        Returns:
+            The value (a list of per-item ndarrays for a JSON array).
+        """
+        if self.peek() != "[":
+            return self.decode()
+
+        items = list()
+        self.skip("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return items
+        while True:
+            items.append(_to_array(self.decode()))
+            self.skip()
+            if self.peek() == "]":
+                self.pos += 1
+                return items
+            self.skip(",")
+
+    def read_fields(self) -> dict:
+        """
+        Reads the fields of the top-level JSON object one by one.
+
+        Returns:
+            A dictionary of the fields, where every JSON array is a list of per-item ndarrays.
+        """
+        fields = dict()
+        self.skip("{")
+        while self.peek() != "}":
+            key = self.decode()
+            if not isinstance(key, str):
+                raise JSONDecodeError("Expecting property name enclosed in double quotes", self.buffer, self.pos)
+            self.skip(":")
+            fields[key] = self.decode_array_or_value()
+            LOGGER.debug(f"Field \"{key}\" read.")
+            self.skip()
+            if self.peek() != "}":
+                self.skip(",")
+        self.pos += 1
+        self.skip()
+        if self.peek():
+            raise JSONDecodeError("Extra data", self.buffer, self.pos)
+        return fields
+
+
+def _is_numeric(item, ndim, kinds=NUMBER_KINDS) -> bool:
+    """Whether the item is an ndarray of the given number of dimensions with numbers of the given kinds."""
+    return isinstance(item, ndarray) and item.ndim == ndim and (item.size == 0 or item.dtype.kind in kinds)
+
+
+def _length(item) -> int:
+    """The length of an item (ndarray, sparse matrix or ragged list); raises TypeError for scalars like ``len`` does."""
+    if is_sparse(item):
+        return item.shape[0]
+    return len(item) if not isinstance(item, ndarray) or item.ndim else len(item.tolist())
+
+
+def _sparse_item(item):
+    """Builds the CSR matrix of a sparse item of "A" (see ``mmcp.data.sparse.sparse_to_json``)."""
+    if not isinstance(item, dict):
+        return item
+    try:
+        return sparse_from_json(item)
+    except (KeyError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid sparse matrix in \"A\": {e}") from e
+
 
 def parse_data_json_file(filename):
     """Parses a data JSON file and reconstructs NumPy arrays into ModelData.
 
+    The file is read in chunks and every list is converted to NumPy arrays item by item while it is read, so neither
+    the whole text nor the nested Python lists of the data are held in memory. All checks are vectorized array
+    operations.
+
     Performs checks for data correctness, particularly for linear programming:
       - Presence of required keys.
       - Correct data types and dimensions.
@@ -29,7 +185,7 @@ def parse_data_json_file(filename):
 
     try:
         with codecs_open(filename, "r", encoding="utf-8") as f:
-            data = load(f)
+            data = _JSONStream(f).read_fields()
             LOGGER.debug(f"JSON file {filename} loaded successfully.")
     except OSError as e:
         LOGGER.exception(f"Error opening JSON file: {e}")
@@ -39,29 +195,42 @@ def parse_data_json_file(filename):
         raise DataParsingError(f"Error parsing JSON file: {e}") from e
 
     try:
-        for key in ["c", "A", "b", "d", "model_types", "processing_times", "precedence_graph", "weights"]:
+        for key in ["c", "A", "b", "d", "criteria", "model_types", "processing_times", "precedence_graph", "weights"]:
             if key not in data:
                 LOGGER.error(f"Missing key \"{key}\" in the JSON data.")
                 raise DataValidationError(f"Missing key \"{key}\" in the JSON data.")
 
         # --- Dimension and Type Checks ---
         num_elements = len(data["c"])
-        num_vars = len(data["c"][0])  # Assuming c is a list of lists
+        num_vars = _length(data["c"][0])  # Assuming c is a list of lists
+
+        # A sparse "A" lists one {"format": "csr" or "coo", ...} object per element
+        sparse_A = any(isinstance(item, dict) for item in data["A"])
+        if sparse_A:
+            data["A"] = [_sparse_item(item) for item in data["A"]]
 
         # Dimension checks
-        if not all(len(item) == num_vars for item in data["c"]):
+        if not all(_length(item) == num_vars for item in data["c"]):
             raise ValueError("Inconsistent dimensions in \"c\". All elements should have the same number of variables.")
 
-        if not all(len(item) == num_vars for item in data["A"]):
+        # An element may have more or fewer constraints (the length of "b") than variables
+        if not len(data["b"]) == num_elements:
+            raise ValueError("Inconsistent dimensions in \"b\". Should match the number of elements.")
+
+        num_constraints = _length(data["b"][0])
+        if not all(_length(item) == num_constraints for item in data["b"]):
             raise ValueError(
-                "Inconsistent dimensions in \"A\". The number of sub-lists should match the number of variables.")
+                "Inconsistent dimensions in \"b\". All elements should have the same number of constraints.")
 
-        if not all(len(subitem) == num_vars for item in data["A"] for subitem in item):
+        if not len(data["A"]) == num_elements or not all(
+                _length(A_i) == _length(b_i) for A_i, b_i in zip(data["A"], data["b"])):
             raise ValueError(
-                "Inconsistent dimensions in \"A\". Sub-lists should have dimensions matching the number of variables.")
+                "Inconsistent dimensions in \"A\". The number of sub-lists should match the number of constraints.")
 
-        if not len(data["b"]) == num_elements or not all(len(item) == num_vars for item in data["b"]):
-            raise ValueError("Inconsistent dimensions in \"b\". Should match the number of elements and variables.")
+        if not all((isinstance(A_i, ndarray) or is_sparse(A_i)) and A_i.shape == (_length(b_i), num_vars)
+                   for A_i, b_i in zip(data["A"], data["b"])):
+            raise ValueError("Inconsistent dimensions in \"A\". Sub-lists should have dimensions matching the number "
+                             "of constraints and variables.")
 
         if not len(data["d"]) == num_elements:
             raise ValueError("Inconsistent dimensions in \"d\". Should match the number of elements.")
@@ -78,87 +247,77 @@ def parse_data_json_file(filename):
         if not len(data["weights"]) == num_vars:
             raise ValueError("Inconsistent dimensions in \"weights\". Should match the number of variables.")
 
-        # Positivity checks
-        if not all(item >= 0 for sub_sub_list in data["A"] for sub_list in sub_sub_list for item in sub_list):
-            raise ValueError("Matrix \"A\" should have all non-negative elements.")
-
-        if not all(item >= 0 for sublist in data["b"] for item in sublist):
-            raise ValueError("Vector \"b\" should have all non-negative elements.")
-
-        if not all(item >= 0 for item in data["model_types"]):
-            raise ValueError("Vector \"model_types\" should have all non-negative elements.")
-
-        if not all(item >= 0 for item in data["criteria"]):
-            raise ValueError("Vector \"criteria\" should have all non-negative elements.")
-
-        if not all(all(item >= 0 for item in sublist) if sublist is not None else True for sublist in data["d"]):
-            raise ValueError("Vector \"d\" should have all non-negative elements.")
-
         # Data type checks
-        if not isinstance(data["c"], list) or not all(isinstance(item, list) for item in data["c"]) or not all(
-                isinstance(subitem, (int, float)) for item in data["c"] for subitem in item):
+        if not all(_is_numeric(item, 1) for item in data["c"]):
             raise TypeError(type_error("c", "list of lists of numbers"))
 
-        if not isinstance(data["A"], list) or not all(
-                isinstance(item, list) and all(isinstance(subitem, list) for subitem in item)
-                for item in data["A"]
-        ) or not all(
-            isinstance(sub_sub_item, (int, float)) for sub_list in data["A"] for item in sub_list for sub_sub_item in
-            item):
+        if not all(item.dtype.kind in NUMBER_KINDS if is_sparse(item) else _is_numeric(item, 2) for item in data["A"]):
             raise TypeError(type_error("A", "list of lists of lists of numbers"))
 
-        if not isinstance(data["b"], list) or not all(isinstance(item, list) for item in data["b"]) or not all(
-                isinstance(subitem, (int, float)) for item in data["b"] for subitem in item):
+        if not all(_is_numeric(item, 1) for item in data["b"]):
             raise TypeError(type_error("b", "list of lists of numbers"))
 
-        if not isinstance(data["d"], list) or not all(
-                isinstance(item, (list, type(None))) for item in data["d"]) or not all(
-            all(isinstance(subitem, (int, float)) for subitem in item) if item is not None else True for item in
-            data["d"]):
+        if not all(item is None or _is_numeric(item, 1) for item in data["d"]):
             raise TypeError(type_error("d", "list of numbers (or None)"))
 
-        if not isinstance(data["model_types"], list) or not all(isinstance(item, int) for item in data["model_types"]):
+        if not all(_is_numeric(item, 0, INTEGER_KINDS) for item in data["model_types"]):
             raise TypeError(type_error("model_types", "list of integers"))
 
-        if not isinstance(data["criteria"], list) or not all(isinstance(item, int) for item in data["criteria"]):
+        if not all(_is_numeric(item, 0, INTEGER_KINDS) for item in data["criteria"]):
             raise TypeError(type_error("criteria", "list of integers"))
 
-        if not isinstance(data["processing_times"], list) or not all(
-                isinstance(item, (int, float)) for item in data["processing_times"]):
+        if not all(_is_numeric(item, 0) for item in data["processing_times"]):
             raise TypeError(type_error("processing_times", "NumPy array of numbers"))
 
         if not isinstance(data["precedence_graph"], dict):
             raise TypeError(type_error("precedence_graph", "dictionary"))
 
-        for key, value in data["precedence_graph"].items():
-            if not isinstance(value, list) or not all(isinstance(item, int) for item in value):
+        precedence_graph = {key: _to_array(value) for key, value in data["precedence_graph"].items()}
+        for key, value in precedence_graph.items():
+            if not _is_numeric(value, 1, INTEGER_KINDS):
                 raise TypeError(type_error(f"precedence_graph[\"{key}\"]", "list of integers"))
 
-        if not isinstance(data["weights"], list) or not all(
-                isinstance(item, (int, float)) for sub_list in data["weights"] for item in sub_list):
+        if not all(_is_numeric(item, 1) for item in data["weights"]):
             raise TypeError(type_error("weights", "NumPy array of numbers"))
 
+        c, b = stack(data["c"]), stack(data["b"])
+        A = [csr_array(item) for item in data["A"]] if sparse_A else stack(data["A"])
+        model_types, criteria = array(data["model_types"]), array(data["criteria"])
+        d = data["d"]
+
+        # Positivity checks
+        if any((item.data < 0).any() for item in A) if sparse_A else (A < 0).any():
+            raise ValueError("Matrix \"A\" should have all non-negative elements.")
+
+        if (b < 0).any():
+            raise ValueError("Vector \"b\" should have all non-negative elements.")
+
+        if (model_types < 0).any():
+            raise ValueError("Vector \"model_types\" should have all non-negative elements.")
+
+        if (criteria < 0).any():
+            raise ValueError("Vector \"criteria\" should have all non-negative elements.")
+
+        if any((item < 0).any() for item in d if item is not None):
+            raise ValueError("Vector \"d\" should have all non-negative elements.")
+
         # For each model_type the criteria should be as follows:
-        for model_type, criteria in zip(data["model_types"], data["criteria"]):
-            if model_type == 1 and criteria not in [1, 2, 3]:
-                raise ValueError("For model type 0, the criteria should be 1, 2, or 3.")
-            if model_type == 2 and criteria not in [1, 2, 3]:
-                raise ValueError("For model type 1, the criteria should be 1, 2, or 3.")
-            if model_type == 3 and criteria not in [1]:
-                raise ValueError("For model type 2, the criteria should be 1.")
-            if model_type == 4 and criteria not in [1, 2]:
-                raise ValueError("For model type 3, the criteria should be 1 or 2.")
+        invalid = zeros(num_elements, dtype=bool)
+        for model_type, (valid_criteria, _) in VALID_CRITERIA.items():
+            invalid |= (model_types == model_type) & ~isin(criteria, valid_criteria)
+        if invalid.any():
+            raise ValueError(VALID_CRITERIA[int(model_types[argmax(invalid)])][1])
 
         model_data = ModelData(
-            c=array(data["c"]),
-            A=array(data["A"]),
-            b=array(data["b"]),
-            d=[array(item) if item is not None else None for item in data["d"]],
-            criteria=array(data["criteria"]),
-            model_types=array(data["model_types"]),
+            c=c,
+            A=A,
+            b=b,
+            d=d,
+            criteria=criteria,
+            model_types=model_types,
             processing_times=array(data["processing_times"]),
-            precedence_graph={key: array(value) for key, value in data["precedence_graph"].items()},
-            weights=array(data["weights"])
+            precedence_graph=precedence_graph,
+            weights=stack(data["weights"])
         )
         LOGGER.info(f"Model data parsed and validated successfully from {filename}.")
 
@@ -169,6 +328,16 @@ def parse_data_json_file(filename):
         raise DataValidationError(f"Error validating data: {e}") from e
 
 
+def parse_data_file(filename, mmap_mode="r"):
+    """
+    Parses a data file in the format given by its name: a binary container for ``.npz`` and ``.zip`` archives,
+    directories and their manifests (memory-mapped with ``mmap_mode``), a JSON file otherwise.
+    """
+    if is_binary_data_path(filename):
+        return load_binary_data(filename, mmap_mode)
+    return parse_data_json_file(filename)
+
+
 if __name__ == "__main__":
     file_path = "../ui/example.json"
     parsed_data = parse_data_json_file(file_path)
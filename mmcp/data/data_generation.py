@@ -1,14 +1,82 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 
-from numpy import set_printoptions, arange, array
-from numpy.random import seed, rand, randint, choice
+from numpy import arange, concatenate, cumsum, diff, empty, int64, minimum, setdiff1d, sort, split, subtract, where
+from numpy.random import SeedSequence, default_rng
+from scipy.sparse import csr_array
 
 from mmcp.data import LinearModelData, CombinatorialModelData, ModelData
 from mmcp.utils import ModelType, Criterion
-from ..utils.logger_setup import LOGGER
+from ..utils.logger_setup import LOGGER, summary
 
-set_printoptions(precision=2, suppress=True)
-seed(1810)
+SEED = 1810
+# The largest constraint tensor of a chunk of elements (in bytes) when no chunk size is given
+CHUNK_BYTES = 64 * 2 ** 20
+LINEAR_MODEL_TYPES = (ModelType.LINEAR_MODEL_1, ModelType.LINEAR_MODEL_2, ModelType.LINEAR_MODEL_3)
+
+
+class GenerationOptions(NamedTuple):
+    """
+    The family of the synthetic instances.
+
+    ``constraints_ratio`` is the number of constraints per variable and ``density`` the fraction of nonzero
+    coefficients of ``A``; below 1, ``A`` is a list of per-element CSR matrices. An element has private resources
+    ``d`` with the probability ``private_probability``, and its model type is then drawn from ``model_types`` (the
+    linear models for linear data, every model type for model data, if None); elements without private resources
+    use the first linear model. ``A`` is non-negative and ``b`` positive, so ``x = 0`` is always feasible; with
+    ``bounded``, every variable of a sparse ``A`` gets a nonzero coefficient, so every element is bounded (a dense
+    ``A`` is). A job of the combinatorial model has up to ``max_predecessors`` predecessors.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+    constraints_ratio: float = 1.
+    density: float = 1.
+    private_probability: float = .5
+    model_types: tuple = None
+    bounded: bool = True
+    max_predecessors: int = 4
+
+
+PRESETS = {
+    "default": GenerationOptions(),
+    "sparse": GenerationOptions(density=.05),
+    "tall": GenerationOptions(constraints_ratio=2.),
+    "wide": GenerationOptions(constraints_ratio=.25),
+    "first_linear": GenerationOptions(private_probability=0.),
+    "second_linear": GenerationOptions(private_probability=1., model_types=(ModelType.LINEAR_MODEL_2,)),
+}
+
+
+def generation_options(options=None) -> GenerationOptions:
+    """
+    Resolves the generation options.
+
+    Args:
+        options: ``GenerationOptions``, the name of a preset in ``PRESETS``, or None for the default preset.
+
+    Returns:
+        The validated options.
+    """
+    if options is None or isinstance(options, str):
+        name = "default" if options is None else options
+        if name not in PRESETS:
+            LOGGER.error(f"Unknown generation preset: {name}")
+            raise ValueError(f"Unknown generation preset: \"{name}\". Expected one of {list(PRESETS)}.")
+        options = PRESETS[name]
+
+    if (options.constraints_ratio <= 0 or not 0 < options.density <= 1 or not 0 <= options.private_probability <= 1
+            or options.max_predecessors < 0 or (options.model_types is not None and not options.model_types)):
+        LOGGER.error(f"Invalid generation options: {options}")
+        raise ValueError(f"Invalid generation options: {options}")
+    return options
+
+
+def model_data_options(options=None) -> GenerationOptions:
+    """
+    Resolves the generation options of model data (see ``generation_options``): the elements with private resources
+    may use every model type, unless the options restrict them.
+    """
+    options = generation_options(options)
+    return options._replace(model_types=tuple(ModelType)) if options.model_types is None else options
 
 
 def _criteria(model_type: ModelType) -> list[int]:
@@ -33,91 +101,168 @@ def _criteria(model_type: ModelType) -> list[int]:
         return [int(Criterion.CRITERION_1), int(Criterion.CRITERION_2)]
 
 
-def generate_linear_model_data(num_elements=5, num_vars=50, threads=1) -> LinearModelData:
+def _streams(seed: int):
+    """The seed sequences of the elements and of the combinatorial data, independent of each other."""
+    linear, combinatorial = SeedSequence(seed).spawn(2)
+    return linear, combinatorial
+
+
+def num_constraints(num_vars: int, options=None) -> int:
+    """The number of constraints of every element with ``num_vars`` variables."""
+    return max(1, round(num_vars * generation_options(options).constraints_ratio))
+
+
+def _sparse_matrix(rng, m: int, n: int, options: GenerationOptions):
+    """Draws a sparse non-negative ``m x n`` CSR matrix with the density of the options."""
+    positions = rng.choice(m * n, size=max(1, round(options.density * m * n)), replace=False)
+    rows, columns = divmod(positions, n)
+    if options.bounded:
+        missing = setdiff1d(arange(n), columns)
+        rows, columns = concatenate((rows, rng.integers(0, m, len(missing)))), concatenate((columns, missing))
+    return csr_array((1. - rng.random(len(rows)), (rows, columns)), shape=(m, n))
+
+
+def _linear_chunk(streams, num_vars: int, threads: int, options: GenerationOptions) -> LinearModelData:
+    """
+    Draws the elements of the seed sequences into preallocated arrays. Every element only draws from its own stream,
+    so it does not depend on the chunk it is drawn in, nor on the number of threads.
+    """
+    size, m = len(streams), num_constraints(num_vars, options)
+    sparse = options.density < 1
+    model_types = LINEAR_MODEL_TYPES if options.model_types is None else tuple(options.model_types)
+    data = LinearModelData(c=empty((size, num_vars)), A=[None] * size if sparse else empty((size, m, num_vars)),
+                           b=empty((size, m)), d=[None] * size, criteria=empty(size, dtype=int64),
+                           model_types=empty(size, dtype=int64))
+
+    def draw(k: int):
+        rng = default_rng(streams[k])
+        private = rng.random() < options.private_probability
+        rng.random(out=data.c[k])
+        if sparse:
+            data.A[k] = _sparse_matrix(rng, m, num_vars, options)
+        else:
+            rng.random(out=data.A[k])
+        rng.random(out=data.b[k])
+        subtract(1., data.b[k], out=data.b[k])  # In (0, 1], so x = 0 is strictly feasible
+        if private:
+            data.d[k] = rng.random(num_vars)
+        model_type = model_types[rng.integers(len(model_types))] if private else ModelType.LINEAR_MODEL_1
+        criteria = _criteria(ModelType(model_type))
+        data.model_types[k], data.criteria[k] = int(model_type), criteria[rng.integers(len(criteria))]
+
+    if threads > 1 and size > 1:  # NumPy releases the GIL while it fills the arrays
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(draw, range(size)))
+    else:
+        for k in range(size):
+            draw(k)
+    return data
+
+
+def iter_linear_model_data(num_elements=5, num_vars=50, chunk_size: int = None, threads=1, seed: int = SEED,
+                           options=None):
+    """
+    Generates synthetic data for the linear models chunk by chunk, so instances larger than the memory can be written
+    as they are generated. The elements do not depend on the chunk size: element ``k`` is drawn from the ``k``-th
+    child stream (``SeedSequence.spawn``) of the seed.
+
+    Args:
+        num_elements: The number of elements in the system.
+        num_vars: The number of variables for each element.
+        chunk_size: The number of elements of a chunk (as many as fit ``CHUNK_BYTES`` of ``A`` by default).
+        threads: The number of threads drawing the elements of a chunk.
+        seed: The seed of the instance.
+        options: ``GenerationOptions`` or the name of a preset (see ``PRESETS``).
+
+    Yields:
+        The index of the first element of the chunk and the ``LinearModelData`` of its elements.
+    """
+    options = generation_options(options)
+    if chunk_size is None:
+        chunk_size = CHUNK_BYTES // (8 * num_vars * num_constraints(num_vars, options))
+    chunk_size = max(1, chunk_size)
+    LOGGER.debug(f"Generating linear model data with num_elements={num_elements}, num_vars={num_vars}, "
+                 f"chunk_size={chunk_size}, threads={threads}, seed={seed}, options={options}")
+
+    streams = _streams(seed)[0].spawn(num_elements)
+    for start in range(0, num_elements, chunk_size):
+        yield start, _linear_chunk(streams[start:start + chunk_size], num_vars, threads, options)
+
+
+def generate_linear_model_data(num_elements=5, num_vars=50, threads=1, seed: int = SEED,
+                               options=None) -> LinearModelData:
     """
     Generates synthetic data for the linear models.
 
     Args:
         num_elements: The number of elements in the system.
         num_vars: The number of variables for each element.
-        threads: The number of threads to use for data generation.
+        threads: The number of threads drawing the elements.
+        seed: The seed of the instance; the same arguments always give the same data.
+        options: ``GenerationOptions`` or the name of a preset (see ``PRESETS``).
 
     Returns:
         A LinearModelData object containing the generated data.
     """
     LOGGER.debug(f"Entering generate_linear_model_data with num_elements={num_elements}, num_vars={num_vars}, "
-                 f"threads={threads}")
-
-    with ThreadPoolExecutor(max_workers=threads) as executor:
-        futures = {
-            executor.submit(lambda: [rand(num_vars) if rand() < .5 else None for _ in range(num_elements)]): "d",
-            executor.submit(lambda: rand(num_elements, num_vars)): "c",
-            executor.submit(lambda: rand(num_elements, num_vars, num_vars)): "A",
-            executor.submit(lambda: rand(num_elements, num_vars)): "b",
-        }
-
-        results = dict()
-        for future in as_completed(futures):
-            data_type = futures[future]
-            results[data_type] = future.result()
-
-    d = results["d"]
-    model_types = [int(ModelType.LINEAR_MODEL_1) if d[i] is None
-                   else choice([int(model) for model in ModelType if model != ModelType.COMBINATORIAL_MODEL])
-                   for i in range(num_elements)]
-    data = LinearModelData(
-        c=results["c"],
-        A=results["A"],
-        b=results["b"],
-        d=d,
-        criteria=array([choice(_criteria(ModelType(model_type))) for model_type in model_types]),
-        model_types=array(model_types),
-    )
-    LOGGER.info(f"Generated linear model data: {data}")
+                 f"threads={threads}, seed={seed}")
+
+    options = generation_options(options)
+    data = _linear_chunk(_streams(seed)[0].spawn(num_elements), num_vars, threads, options)
+    LOGGER.info("Generated linear model data: %s", summary(data))
     return data
 
 
-def generate_combinatorial_model_data(num_vars=50, num_jobs=50, threads=1) -> CombinatorialModelData:
+def _precedence_graph(rng, num_nodes: int, max_predecessors: int) -> dict:
+    """
+    Draws a precedence graph (a DAG): every node ``j > 0`` gets up to ``max_predecessors`` distinct predecessors
+    among the nodes before it. All nodes are drawn at once; the rows that drew a predecessor twice are drawn again.
+    """
+    nodes = arange(1, num_nodes)
+    counts = rng.integers(0, minimum(nodes, max_predecessors) + 1)
+    used = arange(max_predecessors) < counts[:, None]
+    unused = -1 - arange(max_predecessors)  # Distinct values that mark the unused slots
+    predecessors = rng.integers(0, nodes[:, None], (len(nodes), max_predecessors))
+    while True:
+        repeated = (diff(sort(where(used, predecessors, unused), axis=1), axis=1) == 0).any(axis=1).nonzero()[0]
+        if not len(repeated):
+            break
+        predecessors[repeated] = rng.integers(0, nodes[repeated, None], (len(repeated), max_predecessors))
+
+    return dict(zip(nodes.tolist(), split(predecessors[used], cumsum(counts)[:-1])))
+
+
+def generate_combinatorial_model_data(num_vars=50, num_jobs=50, threads=1, seed: int = SEED,
+                                      options=None) -> CombinatorialModelData:
     """
     Generates synthetic data for the combinatorial models.
 
     Args:
         num_vars: The number of variables for each job.
         num_jobs: The number of jobs in the system.
-        threads: The number of threads to use for data generation.
+        threads: Unused, the data is drawn at once; kept for the callers of the linear data.
+        seed: The seed of the instance; the same arguments always give the same data.
+        options: ``GenerationOptions`` or the name of a preset (see ``PRESETS``).
 
     Returns:
         A CombinatorialModelData object containing the generated data.
     """
     LOGGER.debug(f"Entering generate_combinatorial_model_data with num_vars={num_vars}, num_jobs={num_jobs}, "
-                 f"threads={threads}")
-
-    with ThreadPoolExecutor(max_workers=threads) as executor:
-        futures = {
-            executor.submit(lambda: randint(1, num_jobs, num_vars)): "processing_times",
-            executor.submit(lambda: ((j, choice(arange(j), size=randint(0, min(j, 5)), replace=False))
-                                     for j in range(1, num_vars))
-                            ): "precedence_graph",
-            executor.submit(lambda: rand(num_vars, num_jobs)): "weights",
-        }
-        results = {}
-        for future in as_completed(futures):
-            data_type = futures[future]
-            results[data_type] = future.result()
-
-    precedence_graph_dict = {}
-    for node, predecessors in results["precedence_graph"]:
-        precedence_graph_dict[node] = predecessors
+                 f"threads={threads}, seed={seed}")
+
+    options = generation_options(options)
+    rng = default_rng(_streams(seed)[1])
     data = CombinatorialModelData(
-        processing_times=results["processing_times"],
-        precedence_graph=precedence_graph_dict,
-        weights=results["weights"],
+        processing_times=rng.integers(1, num_jobs, num_vars),
+        precedence_graph=_precedence_graph(rng, num_vars, options.max_predecessors),
+        weights=rng.random((num_vars, num_jobs)),
     )
-    LOGGER.info(f"Generated combinatorial model data: {data}")
+    LOGGER.info("Generated combinatorial model data: %s", summary(data))
     return data
 
 
-def generate_model_data(num_elements=5, num_vars=50, num_jobs=50, threads=1) -> ModelData:
+def generate_model_data(num_elements=5, num_vars=50, num_jobs=50, threads=1, seed: int = SEED,
+                        options=None) -> ModelData:
     """
     Generates synthetic data for the models.
 
@@ -125,24 +270,23 @@ def generate_model_data(num_elements=5, num_vars=50, num_jobs=50, threads=1) ->
         num_elements: The number of elements in the system.
         num_vars: The number of variables for each element.
         num_jobs: The number of jobs in the system.
-        threads: The number of threads to use for data generation.
+        threads: The number of threads drawing the elements.
+        seed: The seed of the instance; the same arguments always give the same data.
+        options: ``GenerationOptions`` or the name of a preset (see ``PRESETS``); the elements with private
+            resources may use every model type unless the options restrict them.
 
     Returns:
         A ModelData object containing the generated data.
     """
     LOGGER.debug(f"Entering generate_model_data with num_elements={num_elements}, num_vars={num_vars}, "
-                 f"num_jobs={num_jobs}, threads={threads}")
+                 f"num_jobs={num_jobs}, threads={threads}, seed={seed}")
 
-    linear_data = generate_linear_model_data(num_elements, num_vars, threads)
-    linear_data.set_model_type_for_all(
-        array([int(ModelType.LINEAR_MODEL_1) if linear_data.d[i] is None
-               else choice([int(model) for model in ModelType]) for i in range(num_elements)]))
-    linear_data.set_criteria_for_all(array([choice(_criteria(ModelType(model))) for model in linear_data.model_types]))
+    options = model_data_options(options)
     data = ModelData(
-        *linear_data,
-        *generate_combinatorial_model_data(num_vars, num_jobs, threads),
+        *generate_linear_model_data(num_elements, num_vars, threads, seed, options),
+        *generate_combinatorial_model_data(num_vars, num_jobs, threads, seed, options),
     )
-    LOGGER.info(f"Generated model data: {data}")
+    LOGGER.info("Generated model data: %s", summary(data))
     return data
 
 
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import NamedTuple, List, Dict
+
+from numpy import ndarray
+
+from ..utils.logger_setup import LOGGER
+from ..utils.outs import message
+
+# The fields that hold one item per element; the combinatorial fields describe one problem shared by all elements
+ELEMENT_FIELDS = ("c", "A", "b", "d", "criteria", "model_types")
+SHARED_FIELDS = ("processing_times", "precedence_graph", "weights")
+ELEMENT_CACHE_SIZE = 4
+
+# The views of the last data objects by id; every entry holds its data object, so the id cannot be reused by another
+# object while the entry is cached
+_element_cache = OrderedDict()
+_element_cache_lock = Lock()
+
+
+class ElementView(NamedTuple):
+    """
+    The data of a single element. The per-element fields are views into the arrays of the model data (rows of ``c``,
+    ``A`` and ``b``, the item of ``d``), so nothing is copied and in-place changes are seen by the model data; the
+    combinatorial fields are the shared objects themselves.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+    c: ndarray = None
+    A: ndarray = None
+    b: ndarray = None
+    d: List[ndarray] = None
+    criteria: int = None
+    model_types: int = None
+    processing_times: ndarray = None
+    precedence_graph: Dict[int, ndarray] = None
+    weights: ndarray = None
+
+    def __repr__(self) -> str:
+        return message("Element View", self._asdict())
+
+
+def _item(value, element_idx: int):
+    """The item of a per-element field (a view for arrays), or None if the field has no such item."""
+    if value is None or len(value) <= element_idx:
+        return None
+    return value[element_idx]
+
+
+# noinspection PyProtectedMember
+def _build_view(data: NamedTuple, element_idx: int) -> ElementView:
+    fields = data._asdict()
+    return ElementView(**{key: _item(fields.get(key), element_idx) for key in ELEMENT_FIELDS},
+                       **{key: fields.get(key) for key in SHARED_FIELDS})
+
+
+def element_view(data: NamedTuple, element_idx: int) -> ElementView:
+    """
+    Returns the view of an element of the model data.
+
+    The views are cached per element for the last ``ELEMENT_CACHE_SIZE`` data objects, so repeated calls for the same
+    element return the same view. ``criteria`` and ``model_types`` are copied into the view, so the setters of the
+    model data drop the cached views of the elements they change; code that writes these arrays directly has to call
+    ``clear_element_cache``.
+
+    Args:
+        data: The model data (``ModelData`` or ``LinearModelData``).
+        element_idx: The index of the element.
+
+    Returns:
+        The view of the element.
+    """
+    key = id(data)
+    with _element_cache_lock:
+        entry = _element_cache.get(key)
+        if entry is None or entry[0] is not data:
+            entry = _element_cache[key] = (data, dict())
+            while len(_element_cache) > ELEMENT_CACHE_SIZE:
+                _element_cache.popitem(last=False)
+        _element_cache.move_to_end(key)
+
+        view = entry[1].get(element_idx)
+        if view is None:
+            LOGGER.debug(f"Creating view of element {element_idx + 1}.")
+            view = entry[1][element_idx] = _build_view(data, element_idx)
+        return view
+
+
+def clear_element_cache(data: NamedTuple = None, element_idx: int = None):
+    """
+    Drops cached element views (and the references to their model data).
+
+    Args:
+        data: The model data whose views are dropped (None for every model data).
+        element_idx: The element whose view is dropped (None for every element of the model data).
+    """
+    with _element_cache_lock:
+        if data is None:
+            _element_cache.clear()
+            return
+        entry = _element_cache.get(id(data))
+        if entry is None or entry[0] is not data:
+            return
+        if element_idx is None:
+            del _element_cache[id(data)]
+        else:
+            entry[1].pop(element_idx, None)
@@ -1,15 +1,77 @@
 from codecs import open as codecs_open
-from json import dump, load
+from json import dump, dumps, load
+from os import listdir, sep
+from os.path import abspath, basename, dirname, getsize, isdir, join, splitext
+from shutil import copyfileobj, rmtree
+from tempfile import mkdtemp
+from time import perf_counter
+from typing import NamedTuple
 
-from numpy import ndarray
+from numpy import ndarray, generic
 
 from mmcp.core import FileSavingError
 from mmcp.data import generate_model_data
-from ..utils.logger_setup import LOGGER
+from .binary_format import ARCHIVE_EXTENSIONS, MANIFEST_NAME, BinaryDataWriter, archive_directory, save_binary_data
+from .data_generation import SEED, model_data_options, iter_linear_model_data, generate_combinatorial_model_data
+from .sparse import is_sparse, sparse_to_json
+from ..utils.logger_setup import LOGGER, summary
 from ..utils.outs import with_precision
 
+# The formats a data file is written in: a JSON file, a binary archive or a binary data directory
+DATA_FORMATS = ("json", "archive", "directory")
+
 
 # noinspection PyProtectedMember
+def _json_fields(data) -> dict:
+    """The fields of a data tuple as JSON values (the data itself is not changed)."""
+    dict_data = data._asdict()
+
+    # Convert numpy arrays to list for JSON serialization
+    for key, value in dict_data.items():
+        if isinstance(value, ndarray):
+            dict_data[key] = value.tolist()
+        elif isinstance(value, dict):  # Handle precedence_graph
+            dict_data[key] = {inner_key: inner_value.tolist() if isinstance(inner_value, ndarray) else inner_value
+                              for inner_key, inner_value in value.items()}
+        elif isinstance(value, list):  # Handle "d" list with potential None and ndarray, and sparse "A" matrices
+            dict_data[key] = [_json_item(item) for item in value]
+    return dict_data
+
+
+def _json_item(item):
+    """An item of a per-element field as a JSON value: a list for arrays, an object for sparse matrices."""
+    if isinstance(item, (ndarray, generic)):
+        return item.tolist()
+    return sparse_to_json(item) if is_sparse(item) else item
+
+
+def data_file_format(filename, format: str = None) -> str:
+    """
+    Returns the format a data file is written in (one of ``DATA_FORMATS``): ``format`` if it is given, else the format
+    given by the name: an archive for ``.npz`` and ``.zip``, a directory for a name ending with a separator, an
+    existing directory or a manifest, and JSON for any other extension.
+
+    Raises:
+        ValueError: If the format is unknown, or if it is not given for a name without an extension.
+    """
+    if format is not None:
+        if format not in DATA_FORMATS:
+            LOGGER.error(f"Unknown data file format: {format}")
+            raise ValueError(f"Unknown data file format: \"{format}\". Expected one of {list(DATA_FORMATS)}.")
+        return format
+
+    path = str(filename)
+    if path.lower().endswith(ARCHIVE_EXTENSIONS):
+        return "archive"
+    if path.endswith(("/", sep)) or isdir(path) or basename(path) == MANIFEST_NAME:
+        return "directory"
+    if splitext(path)[1]:
+        return "json"
+    LOGGER.error(f"Unable to tell the format of the data file: {path}")
+    raise ValueError(f"Unable to tell the format of \"{path}\": give the format, an extension, or end a directory "
+                     f"with \"/\".")
+
+
 def generate_data_json_file(filename, num_elements=5, num_vars=10, num_jobs=10, threads=1, data=None):
     """
     Generates a data file (JSON wrapper) with synthetic data.
@@ -22,24 +84,13 @@ def generate_data_json_file(filename, num_elements=5, num_vars=10, num_jobs=10,
         threads (int): The number of threads to use for data generation.
         data (dict): The data to write to the file. If None, synthetic data will be generated.
     """
-    LOGGER.debug(f"Entering generate_data_json_file with filename={filename}, num_elements={num_elements}, "
-                 f"num_vars={num_vars}, num_jobs={num_jobs}, data={data}")
+    LOGGER.debug("Entering generate_data_json_file with filename=%s, num_elements=%s, num_vars=%s, num_jobs=%s, "
+                 "data=%s", filename, num_elements, num_vars, num_jobs, summary(data))
 
     if data is None:
         data = generate_model_data(num_elements, num_vars, num_jobs, threads)
 
-    dict_data = data._asdict()
-
-    # Convert numpy arrays to list for JSON serialization
-    for key, value in dict_data.items():
-        if isinstance(value, ndarray):
-            dict_data[key] = value.tolist()
-        elif isinstance(value, dict):  # Handle precedence_graph
-            for inner_key, inner_value in value.items():
-                if isinstance(inner_value, ndarray):
-                    value[inner_key] = inner_value.tolist()
-        elif isinstance(value, list):  # Handle "d" list with potential None and ndarray
-            dict_data[key] = [item.tolist() if isinstance(item, ndarray) else item for item in value]
+    dict_data = _json_fields(data)
 
     with codecs_open(filename, "w", encoding="utf-8") as f:
         try:
@@ -50,6 +101,192 @@ def generate_data_json_file(filename, num_elements=5, num_vars=10, num_jobs=10,
             raise FileSavingError(f"Error saving data to JSON file: {e}") from e
 
 
+def generate_data_binary_file(path, num_elements=5, num_vars=10, num_jobs=10, threads=1, data=None, compressed=False,
+                              archive: bool = None):
+    """
+    Generates a binary data container (``.npy`` arrays and a JSON manifest) with synthetic data.
+
+    Args:
+        path (str): The archive (``.npz`` or ``.zip``) or directory to write.
+        num_elements (int): The number of elements.
+        num_vars (int): The number of variables in each element.
+        num_jobs (int): The number of jobs.
+        threads (int): The number of threads to use for data generation.
+        data (NamedTuple): The data to write. If None, synthetic data will be generated.
+        compressed (bool): Whether the archive members are compressed.
+        archive (bool): Whether to write an archive (None to decide by the extension of the path).
+    """
+    LOGGER.debug(f"Entering generate_data_binary_file with path={path}, num_elements={num_elements}, "
+                 f"num_vars={num_vars}, num_jobs={num_jobs}, compressed={compressed}")
+
+    if data is None:
+        data = generate_model_data(num_elements, num_vars, num_jobs, threads)
+
+    save_binary_data(path, data, compressed, archive)
+
+
+def generate_data_file(filename, num_elements=5, num_vars=10, num_jobs=10, threads=1, data=None, format: str = None):
+    """
+    Generates a data file in the given format, or in the format given by its name (see ``data_file_format``): a binary
+    container for ``.npz`` and ``.zip`` archives and directories, JSON for other extensions.
+    """
+    format = data_file_format(filename, format)
+    if format != "json":
+        generate_data_binary_file(filename, num_elements, num_vars, num_jobs, threads, data,
+                                  archive=format == "archive")
+    else:
+        generate_data_json_file(filename, num_elements, num_vars, num_jobs, threads, data)
+
+
+class JsonDataWriter:
+    """
+    Writes linear model data to a JSON data file chunk by chunk, so an instance is never held in memory at once.
+
+    Every per-element field is streamed to its own part file next to the data file, one element at a time; ``close``
+    joins the parts into the data file (with the fields of the shared data, if it is given) and removes them.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+    FIELDS = ("c", "A", "b", "d", "criteria", "model_types")
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.length = 0
+        self._directory = mkdtemp(prefix=".mmcp-", dir=dirname(abspath(filename)))
+        self._parts = {key: open(join(self._directory, key), "w", encoding="utf-8") for key in self.FIELDS}
+
+    def write(self, chunk):
+        """Appends the elements of a chunk (``LinearModelData``)."""
+        for key in self.FIELDS:
+            part = self._parts[key]
+            for k, item in enumerate(getattr(chunk, key)):
+                if self.length + k:
+                    part.write(",")
+                part.write(dumps(_json_item(item), separators=(",", ":")))
+        self.length += len(chunk.c)
+
+    def abort(self):
+        """Closes and removes the part files without writing the data file."""
+        for part in self._parts.values():
+            part.close()
+        rmtree(self._directory, ignore_errors=True)
+
+    def close(self, shared=None):
+        """
+        Joins the parts into the data file.
+
+        Args:
+            shared: The data of the fields that are not per element (``CombinatorialModelData``), or None.
+        """
+        for part in self._parts.values():
+            part.close()
+        try:
+            with open(self.filename, "w", encoding="utf-8") as f:
+                for i, key in enumerate(self.FIELDS):
+                    f.write(f"{"," if i else "{"}{dumps(key)}:[")
+                    with open(join(self._directory, key), "r", encoding="utf-8") as part:
+                        copyfileobj(part, f)
+                    f.write("]")
+                shared_fields = dumps(_json_fields(shared), separators=(",", ":"))[1:-1] if shared is not None else ""
+                f.write(f"{"," if shared_fields else ""}{shared_fields}}}")
+        finally:
+            rmtree(self._directory, ignore_errors=True)
+        LOGGER.info(f"Generated data file (JSON): {self.filename}")
+
+
+class StreamReport(NamedTuple):
+    """The size of a streamed data file and the throughput of generating and writing it."""
+    LOGGER.debug(f"Initialized {__name__}")
+    filename: str
+    num_elements: int
+    size: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """The written megabytes (10^6 bytes) per second."""
+        return self.size / 1e6 / self.seconds if self.seconds > 0 else float("inf")
+
+    def __str__(self):
+        return (f"{self.filename}: {self.num_elements} elements, {self.size / 1e6:.1f} MB in {self.seconds:.2f}s "
+                f"({self.throughput:.1f} MB/s)")
+
+
+def _size(path) -> int:
+    """The size of a file, or of the files of a directory, in bytes."""
+    return sum(getsize(join(path, name)) for name in listdir(path)) if isdir(path) else getsize(path)
+
+
+def stream_data_file(filename, num_elements=5, num_vars=10, num_jobs=10, chunk_size: int = None, threads=1,
+                     seed: int = SEED, options=None, progress=None, format: str = None) -> StreamReport:
+    """
+    Generates a synthetic data file chunk by chunk, writing every chunk before the next one is drawn, so the memory
+    holds one chunk (``CHUNK_BYTES`` of ``A`` by default) whatever the size of the instance. The data equals
+    ``generate_model_data`` with the same arguments.
+
+    The format is given by ``format`` or by the name, like ``generate_data_file``: binary containers append the
+    chunks to their ``.npy`` files (an archive is written as a directory next to it first, then stored in it file by
+    file), JSON files stream every field.
+
+    Args:
+        filename (str): The data file, archive or directory to write.
+        num_elements (int): The number of elements.
+        num_vars (int): The number of variables in each element.
+        num_jobs (int): The number of jobs.
+        chunk_size (int): The number of elements generated and written at once.
+        threads (int): The number of threads drawing the elements of a chunk.
+        seed (int): The seed of the instance.
+        options: ``GenerationOptions`` or the name of a preset (see ``mmcp.data.data_generation.PRESETS``).
+        progress: A callable ``progress(done, total, seconds)`` called after every chunk.
+        format (str): The format of the file (see ``data_file_format``), or None to take it from the name.
+
+    Returns:
+        The size of the written data and the throughput.
+    """
+    LOGGER.debug(f"Entering stream_data_file with filename={filename}, num_elements={num_elements}, "
+                 f"num_vars={num_vars}, num_jobs={num_jobs}, chunk_size={chunk_size}, seed={seed}")
+
+    options = model_data_options(options)
+    format = data_file_format(filename, format)
+    archive = format == "archive"
+    # A manifest names the directory it is in
+    target = dirname(filename) if format == "directory" and basename(str(filename)) == MANIFEST_NAME else filename
+    start = perf_counter()
+    try:
+        if archive:
+            directory = mkdtemp(prefix=".mmcp-", dir=dirname(abspath(filename)))
+            writer = BinaryDataWriter(directory)
+        elif format == "directory":
+            writer = BinaryDataWriter(target)
+        else:
+            writer = JsonDataWriter(filename)
+    except OSError as e:
+        LOGGER.exception(f"Error creating data file: {e}")
+        raise FileSavingError(f"Error creating data file: {e}") from e
+
+    try:
+        for first, chunk in iter_linear_model_data(num_elements, num_vars, chunk_size, threads, seed, options):
+            writer.write(chunk)
+            if progress is not None:
+                progress(first + len(chunk.c), num_elements, perf_counter() - start)
+        writer.close(generate_combinatorial_model_data(num_vars, num_jobs, threads, seed, options))
+        if archive:
+            archive_directory(directory, filename)
+    except OSError as e:
+        writer.abort()
+        LOGGER.exception(f"Error streaming data to file: {e}")
+        raise FileSavingError(f"Error streaming data to file: {e}") from e
+    except Exception:
+        writer.abort()
+        raise
+    finally:
+        if archive:
+            rmtree(directory, ignore_errors=True)
+
+    report = StreamReport(str(filename), num_elements, _size(target), perf_counter() - start)
+    LOGGER.info(f"Streamed data file: {report}")
+    return report
+
+
 if __name__ == "__main__":
     file_path = "../ui/example.json"
     generate_data_json_file(file_path, threads=4)
@@ -0,0 +1,122 @@
+from numpy import asarray, ndarray, int64, float64, stack, concatenate, cumsum, zeros
+from scipy.sparse import csr_array, coo_array
+
+from ..utils.logger_setup import LOGGER
+
+SPARSE_FORMATS = ("csr", "coo")
+
+
+def is_sparse(matrix) -> bool:
+    """Whether the matrix is a SciPy sparse matrix (or array)."""
+    return hasattr(matrix, "tocoo") and hasattr(matrix, "nnz")
+
+
+def is_sparse_tensor(A) -> bool:
+    """Whether the constraint tensor is a list of per-element sparse matrices."""
+    return isinstance(A, (list, tuple)) and any(is_sparse(matrix) for matrix in A)
+
+
+def to_sparse(A, sparse_format: str = "csr") -> list:
+    """
+    Converts a constraint tensor (dense ``(elements, m, n)`` or a list of matrices) to a list of sparse matrices.
+
+    Args:
+        A: The constraint tensor.
+        sparse_format: "csr" or "coo".
+
+    Returns:
+        The list of per-element sparse matrices.
+    """
+    LOGGER.debug(f"Converting constraint tensor to {sparse_format}")
+    if sparse_format not in SPARSE_FORMATS:
+        raise ValueError(f"Unsupported sparse format: \"{sparse_format}\". Expected one of {SPARSE_FORMATS}.")
+    convert = csr_array if sparse_format == "csr" else coo_array
+    return [convert(matrix) for matrix in A]
+
+
+def to_dense(A) -> ndarray:
+    """Converts a constraint tensor to a dense ``(elements, m, n)`` array."""
+    if is_sparse_tensor(A):
+        return stack([matrix.toarray() if is_sparse(matrix) else asarray(matrix) for matrix in A])
+    return asarray(A)
+
+
+def tensor_shape(A) -> tuple:
+    """Returns the shape ``(elements, m, n)`` of a dense or sparse constraint tensor."""
+    if is_sparse_tensor(A):
+        return (len(A),) + tuple(A[0].shape) if len(A) else (0,)
+    return asarray(A).shape
+
+
+def sparse_to_json(matrix) -> dict:
+    """
+    Converts a sparse matrix to its JSON form: ``{"format": "csr", "shape", "data", "indices", "indptr"}`` for CSR
+    matrices and ``{"format": "coo", "shape", "row", "col", "data"}`` for any other format.
+    """
+    if getattr(matrix, "format", None) == "csr":
+        return {"format": "csr", "shape": list(matrix.shape), "data": matrix.data.tolist(),
+                "indices": matrix.indices.tolist(), "indptr": matrix.indptr.tolist()}
+    coo = matrix.tocoo()
+    return {"format": "coo", "shape": list(coo.shape), "row": coo.row.tolist(), "col": coo.col.tolist(),
+            "data": coo.data.tolist()}
+
+
+def sparse_from_json(fields: dict):
+    """
+    Builds a CSR matrix from its JSON form (see ``sparse_to_json``).
+
+    Raises:
+        ValueError: If the format is unknown or the entries are inconsistent.
+        TypeError: If the fields have wrong types.
+    """
+    sparse_format = fields.get("format")
+    shape = tuple(int(size) for size in fields["shape"])
+    data = asarray(fields["data"])
+    if data.size and data.dtype.kind not in "biuf":
+        raise TypeError(f"Sparse matrix values should be numbers, got {data.dtype}.")
+    data = data.astype(float64) if data.dtype.kind == "b" else data
+
+    if sparse_format == "csr":
+        indices, indptr = asarray(fields["indices"], dtype=int64), asarray(fields["indptr"], dtype=int64)
+        if len(indptr) != shape[0] + 1:
+            raise ValueError(f"Expected {shape[0] + 1} row pointers, got {len(indptr)}.")
+        matrix = csr_array((data, indices, indptr), shape=shape)
+    elif sparse_format == "coo":
+        matrix = coo_array((data, (asarray(fields["row"], dtype=int64), asarray(fields["col"], dtype=int64))),
+                           shape=shape).tocsr()
+    else:
+        raise ValueError(f"Unsupported sparse format: \"{sparse_format}\". Expected one of {SPARSE_FORMATS}.")
+    matrix.check_format(full_check=True)
+    return matrix
+
+
+def pack_csr(matrices) -> tuple:
+    """
+    Concatenates the CSR arrays of per-element matrices.
+
+    Returns:
+        A tuple containing:
+            - The values of all elements.
+            - The column indices of all elements.
+            - The row pointers of all elements, each starting at 0.
+            - The shapes of the matrices.
+    """
+    matrices = [csr_array(matrix) for matrix in matrices]
+    return (concatenate([matrix.data for matrix in matrices]),
+            concatenate([matrix.indices.astype(int64) for matrix in matrices]),
+            concatenate([matrix.indptr.astype(int64) for matrix in matrices]),
+            [list(matrix.shape) for matrix in matrices])
+
+
+def unpack_csr(data, indices, indptr, shapes) -> list:
+    """Splits concatenated CSR arrays (see ``pack_csr``) into per-element matrices without copying the arrays."""
+    matrices = list()
+    pointer_offsets = concatenate([zeros(1, dtype=int64), cumsum([shape[0] + 1 for shape in shapes])])
+    value_offset = 0
+    for shape, start in zip(shapes, pointer_offsets[:-1].tolist()):
+        element_indptr = indptr[start:start + shape[0] + 1]
+        nnz = int(element_indptr[-1])
+        matrices.append(csr_array((data[value_offset:value_offset + nnz], indices[value_offset:value_offset + nnz],
+                                   element_indptr), shape=tuple(shape), copy=False))
+        value_offset += nnz
+    return matrices
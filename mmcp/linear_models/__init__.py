@@ -1,4 +1,4 @@
-from . import first, second, third
+from . import backends, block, dense_simplex, first, second, third, model_builder, lexicographic, incremental
 from ..utils.logger_setup import LOGGER
 
 LOGGER.debug(f"Initialized {__name__}")
@@ -6,5 +6,11 @@
 __all__ = [
     "first",
     "second",
-    "third"
+    "third",
+    "model_builder",
+    "lexicographic",
+    "incremental",
+    "backends",
+    "dense_simplex",
+    "block",
 ]
@@ -0,0 +1,181 @@
+from threading import Lock
+from typing import NamedTuple
+
+from numpy import asarray, count_nonzero, ndim
+from ortools.linear_solver import pywraplp
+
+from mmcp.core import ConfigurationError
+from ..utils.config import Vars
+from ..utils.logger_setup import LOGGER
+
+AUTO = "auto"
+
+# Thresholds of the automatic selection, see select_backend
+AUTO_FIRST_ORDER_MIN_SIZE = 5_000
+AUTO_FIRST_ORDER_MAX_DENSITY = .01
+
+
+class LPBackend(NamedTuple):
+    """An LP solver that the linear models can be built into."""
+    LOGGER.debug(f"Initialized {__name__}")
+    name: str
+    solver_id: str
+    description: str = ""
+    parameters: str = ""
+    warm_start_parameters: str = ""
+    tolerance: float = 0.
+
+    def __str__(self):
+        return self.name
+
+
+LP_BACKENDS = dict()
+
+_available = dict()
+_available_lock = Lock()
+
+
+def register_backend(name: str, solver_id: str, description: str = "", parameters: str = "",
+                     warm_start_parameters: str = "", tolerance: float = 0.) -> LPBackend:
+    """
+    Registers (or replaces) an LP backend.
+
+    Args:
+        name: The name the backend is selected by (case-insensitive).
+        solver_id: The OR-Tools solver identifier passed to ``pywraplp.Solver.CreateSolver``, or None for a backend
+            that solves the criteria itself without an OR-Tools model (see ``is_native``).
+        description: A short description of the backend.
+        parameters: Solver-specific parameters (in the solver's text format) set on every built model.
+        warm_start_parameters: Solver-specific parameters set on a model that is re-solved after a change, so the
+            re-solve starts from the previous solution.
+        tolerance: The relative optimality tolerance of the backend; a bound derived from an optimal value (like
+            ``z >= z_max``) is relaxed by it, so an approximate solver does not cut off its own optimum.
+
+    Returns:
+        The registered backend.
+    """
+    name = name.upper()
+    if name == AUTO.upper():
+        LOGGER.error(f"The backend name \"{AUTO}\" is reserved.")
+        raise ConfigurationError(f"The backend name \"{AUTO}\" is reserved.")
+    backend = LPBackend(name, solver_id, description, parameters, warm_start_parameters, tolerance)
+    LP_BACKENDS[name] = backend
+    with _available_lock:
+        _available.pop(name, None)
+    LOGGER.debug(f"Registered LP backend {name} ({solver_id})")
+    return backend
+
+
+register_backend("GLOP", "GLOP", "Google's primal and dual simplex.",
+                 warm_start_parameters="use_preprocessing: false")
+register_backend("HIGHS", "HIGHS_LP", "HiGHS dual simplex (with presolve).", parameters="output_flag=false")
+register_backend("CLP", "CLP", "COIN-OR dual simplex.")
+register_backend("PDLP", "PDLP", "Primal-dual hybrid gradient, a first-order method for very large sparse problems.",
+                 tolerance=1e-6)
+register_backend("NUMPY", None, "Batched dense simplex in NumPy for small problems of the first and second linear "
+                                "models (see dense_simplex).")
+
+
+def is_available(name: str) -> bool:
+    """Whether a registered backend can be created in this OR-Tools build."""
+    name = name.upper()
+    with _available_lock:
+        available = _available.get(name)
+    if available is None:
+        available = name in LP_BACKENDS and (LP_BACKENDS[name].solver_id is None
+                                             or pywraplp.Solver.CreateSolver(LP_BACKENDS[name].solver_id) is not None)
+        with _available_lock:
+            _available[name] = available
+    return available
+
+
+def available_backends() -> list[str]:
+    """The names of the registered backends that can be created in this OR-Tools build."""
+    return [name for name in LP_BACKENDS if is_available(name)]
+
+
+def problem_size(A, num_vars: int = None) -> tuple[int, int, int]:
+    """
+    Returns the size of the constraint matrix of an element.
+
+    Args:
+        A: Matrix of constraint coefficients (dense or sparse).
+        num_vars: The number of variables (the number of columns of A by default).
+
+    Returns:
+        A tuple containing:
+            - The number of variables.
+            - The number of constraints.
+            - The number of non-zero coefficients.
+    """
+    if hasattr(A, "nnz"):
+        num_constraints, num_columns = A.shape
+        num_nonzeros = A.nnz
+    else:
+        A = asarray(A)
+        num_constraints, num_columns = (1, A.size) if ndim(A) == 1 else A.shape[:2]
+        num_nonzeros = count_nonzero(A)
+    return num_columns if num_vars is None else num_vars, num_constraints, int(num_nonzeros)
+
+
+def select_backend(num_vars: int, num_constraints: int, num_nonzeros: int) -> str:
+    """
+    Picks a backend by the size and the sparsity of a problem.
+
+    GLOP is the fastest on dense problems of every size this project generates (up to a million non-zeros), and its
+    exact vertices and warm starts suit the lexicographic and the iterative criteria. PDLP, a first-order method
+    whose iterations only multiply by the matrix, wins once a problem is both large (at least
+    ``AUTO_FIRST_ORDER_MIN_SIZE`` variables and constraints together) and sparse (at most
+    ``AUTO_FIRST_ORDER_MAX_DENSITY`` of the entries are non-zero). If PDLP is not available, GLOP is used.
+
+    Args:
+        num_vars: The number of variables.
+        num_constraints: The number of constraints.
+        num_nonzeros: The number of non-zero constraint coefficients.
+
+    Returns:
+        The name of the backend.
+    """
+    density = num_nonzeros / max(num_vars * num_constraints, 1)
+    if (num_vars + num_constraints >= AUTO_FIRST_ORDER_MIN_SIZE and density <= AUTO_FIRST_ORDER_MAX_DENSITY
+            and is_available("PDLP")):
+        return "PDLP"
+    return "GLOP"
+
+
+def resolve_backend(backend=None, num_vars: int = 0, num_constraints: int = 0, num_nonzeros: int = 0) -> LPBackend:
+    """
+    Resolves a backend given by name (or "auto") to a registered backend.
+
+    Args:
+        backend: A backend name, "auto", an ``LPBackend`` (returned as is), or None for ``Vars.lp_backend``.
+        num_vars: The number of variables of the problem (used by "auto").
+        num_constraints: The number of constraints of the problem (used by "auto").
+        num_nonzeros: The number of non-zero constraint coefficients of the problem (used by "auto").
+
+    Returns:
+        The backend.
+    """
+    if isinstance(backend, LPBackend):
+        return backend
+    name = str(Vars.lp_backend if backend is None else backend).upper()
+    if name == AUTO.upper():
+        name = select_backend(num_vars, num_constraints, num_nonzeros)
+        LOGGER.debug(f"Selected LP backend {name} for {num_vars} variables, {num_constraints} constraints and "
+                     f"{num_nonzeros} non-zeros")
+    if name not in LP_BACKENDS:
+        LOGGER.error(f"Unsupported LP backend: {name}")
+        raise ConfigurationError(f"Unsupported LP backend: \"{name}\". Expected \"{AUTO}\" or one of "
+                                 f"{list(LP_BACKENDS)}.")
+    return LP_BACKENDS[name]
+
+
+def is_native(backend=None) -> bool:
+    """
+    Whether a backend solves the criteria of the first and the second linear models itself (without an OR-Tools
+    model), like the batched NumPy simplex.
+
+    Args:
+        backend: A backend name, "auto", an ``LPBackend``, or None for ``Vars.lp_backend``.
+    """
+    return resolve_backend(backend).solver_id is None
@@ -0,0 +1,167 @@
+from numpy import asarray, concatenate, ones, zeros, float64
+from ortools.linear_solver import pywraplp
+
+from mmcp.core import SolverError
+from .backends import resolve_backend
+from .model_builder import LinearModelBuilder, set_objective, add_constraint
+from ..utils.logger_setup import LOGGER
+
+
+def build_block_model(objectives, A_list, b_list, maximize: bool = True, backend=None):
+    """
+    Builds one LP with a diagonal block ``A_k * x_k <= b_k``, ``x_k >= 0`` per element, so independent elements are
+    loaded into (and solved by) a single solver.
+
+    Args:
+        objectives: The objective coefficients of each element.
+        A_list: The constraint matrices of each element (dense or sparse, of any shapes).
+        b_list: The constraint bounds of each element.
+        maximize: Whether the objective is maximized.
+        backend: The LP backend (see ``LinearModelBuilder.build``); "auto" is picked by the size of the whole model.
+
+    Returns:
+        A tuple containing:
+            - The solver.
+            - The list of the variable vectors of each element.
+            - The LP backend the model was built into.
+    """
+    builder = LinearModelBuilder(maximize)
+    columns = list()
+    for objective, A, b in zip(objectives, A_list, b_list):
+        columns.append(builder.add_variables(objective))
+        builder.add_constraints(A, upper_bounds=b, columns=columns[-1])
+
+    backend = resolve_backend(backend, builder.num_variables, builder.num_constraints, builder.num_nonzeros)
+    solver, x, _ = builder.build(backend)
+    return solver, [x[element.start:element.stop] for element in columns], backend
+
+
+def _solve(solver, description):
+    solver_status = solver.Solve()
+    if solver_status != pywraplp.Solver.OPTIMAL:
+        LOGGER.error(f"Unable to find the optimal solution for {description}. {solver_status=}")
+        raise SolverError(f"Unable to find the optimal solution for {description}. {solver_status=}")
+
+
+def _values(x_list):
+    """The solution values of each element."""
+    return [asarray([variable.solution_value() for variable in x], dtype=float64) for x in x_list]
+
+
+def solve_criterion_1(z_list, A_list, b_list, backend=None):
+    """
+    Solves the first criterion for many elements in one block-diagonal LP: maximizes every ``z_k^T * x_k``, then
+    minimizes the sum of all x with the additional rows ``z_k^T * x_k >= z_max_k`` (see ``lexicographic_solve``).
+
+    The blocks share no variables or rows, so the block optimum is the optimum of every element. If one element has
+    no optimal solution, neither has the block, and the elements have to be solved one by one to find it.
+
+    Args:
+        z_list: The objective of each element (``c``, or ``c + d`` for the second linear model).
+        A_list: The constraint matrices of each element.
+        b_list: The constraint bounds of each element.
+        backend: The LP backend name, "auto", or None for ``Vars.lp_backend``.
+
+    Returns:
+        The optimal solution vector x and the sum of x_i of each element.
+    """
+    LOGGER.debug(f"Solving the first criterion for {len(z_list)} elements as one block-diagonal model")
+    z_list = [asarray(z, dtype=float64) for z in z_list]
+    solver, x_list, backend = build_block_model(z_list, A_list, b_list, maximize=True, backend=backend)
+    _solve(solver, "the block model, first criterion")
+
+    for z, x, values in zip(z_list, x_list, _values(x_list)):
+        z_max = float(z @ values)
+        add_constraint(solver, x, z, lower_bound=z_max - backend.tolerance * max(abs(z_max), 1.))
+    set_objective(solver, [variable for x in x_list for variable in x], ones(sum(map(len, z_list))), maximize=False)
+    if backend.warm_start_parameters:
+        solver.SetSolverSpecificParametersAsString(backend.warm_start_parameters)
+    _solve(solver, "the block model, first criterion")
+
+    return [(values.tolist(), float(values.sum())) for values in _values(x_list)]
+
+
+def solve_criterion_2(z_list, A_list, b_list, z_min, alpha, backend=None):
+    """
+    Solves the second criterion for many elements in one block-diagonal LP: minimizes the sum of all x with the
+    expert rows ``z_k^T * x_k >= z_min * (1 - alpha)``.
+
+    Args:
+        z_list: The objective of each element (``c``, or ``c + d`` for the second linear model).
+        A_list: The constraint matrices of each element.
+        b_list: The constraint bounds of each element.
+        z_min: The minimum acceptable value for the objective function.
+        alpha: The expert-defined threshold.
+        backend: The LP backend name, "auto", or None for ``Vars.lp_backend``.
+
+    Returns:
+        The optimal solution vector x and the sum of x_i of each element.
+    """
+    LOGGER.debug(f"Solving the second criterion for {len(z_list)} elements as one block-diagonal model")
+    solver, x_list, _ = build_block_model([ones(len(z)) for z in z_list], A_list, b_list, maximize=False,
+                                          backend=backend)
+    for z, x in zip(z_list, x_list):
+        add_constraint(solver, x, z, lower_bound=z_min * (1 - alpha))
+    _solve(solver, "the block model, second criterion")
+
+    return [(values.tolist(), float(values.sum())) for values in _values(x_list)]
+
+
+def solve_criterion_3(z_list, A_list, b_list, weights, backend=None, tolerance: float = 1e-6,
+                      max_iterations: int = 100):
+    """
+    Solves the third criterion for many elements in one block-diagonal LP: maximizes every
+    ``(weights_k * z_k)^T * x_k`` and updates the weights of each element to its normalized ``weights_k * x_k`` until
+    its objective changes by less than the tolerance. An element keeps the solution of the round it converged in, and
+    the block is rebuilt of the remaining elements whenever at most half of its elements remain.
+
+    Args:
+        z_list: The objective of each element (``c``, or ``c + d`` for the second linear model).
+        A_list: The constraint matrices of each element.
+        b_list: The constraint bounds of each element.
+        weights: A scalar or a vector of weights, shared by the elements as the starting weights.
+        backend: The LP backend name, "auto", or None for ``Vars.lp_backend``.
+        tolerance: The convergence tolerance of the objective.
+        max_iterations: The maximal number of weight updates.
+
+    Returns:
+        The optimal solution vector x and the weighted objective value of each element.
+    """
+    LOGGER.debug(f"Solving the third criterion for {len(z_list)} elements as one block-diagonal model")
+    z_list = [asarray(z, dtype=float64) for z in z_list]
+    weights_list = [zeros(len(z)) + asarray(weights, dtype=float64) for z in z_list]
+
+    solutions, previous = [None] * len(z_list), zeros(len(z_list))
+    active, members = list(range(len(z_list))), list()
+    for iteration in range(max_iterations):
+        # The block shrinks to the elements that have not converged once they are at most half of it
+        if 2 * len(active) <= len(members) or not members:
+            members = list(active)
+            solver, x_list, backend = build_block_model([z_list[k] for k in members], [A_list[k] for k in members],
+                                                        [b_list[k] for k in members], maximize=True, backend=backend)
+            variables = [variable for x in x_list for variable in x]
+            warm = False
+        # A converged element of the block drops out of the objective, its solution is already recorded
+        set_objective(solver, variables, concatenate([weights_list[k] * z_list[k] if k in active else
+                                                      zeros(len(z_list[k])) for k in members]), maximize=True)
+        _solve(solver, f"the block model, third criterion, {iteration=}")
+        if not warm and backend.warm_start_parameters:
+            solver.SetSolverSpecificParametersAsString(backend.warm_start_parameters)
+        warm = True
+
+        for k, values in zip(members, _values(x_list)):
+            if k not in active:
+                continue
+            objective = float((weights_list[k] * z_list[k]) @ values)
+            solutions[k] = values.tolist(), objective
+            if abs(objective - previous[k]) < tolerance:
+                active.remove(k)
+                continue
+            previous[k] = objective
+            updated = weights_list[k] * values
+            if updated.sum() != 0:  # A zero total keeps the weights, so the next round converges
+                weights_list[k] = updated / updated.sum()
+        if not active:
+            break
+
+    return solutions
@@ -0,0 +1,277 @@
+from typing import NamedTuple
+
+from numpy import (asarray, stack, concatenate, zeros, ones, full, eye, arange, where, argmin, argmax, einsum, abs,
+                   isinf, inf, float64, int64, ndarray)
+from ortools.linear_solver import pywraplp
+
+from mmcp.core import SolverError
+from ..utils.logger_setup import LOGGER, summary
+
+OPTIMAL = pywraplp.Solver.OPTIMAL
+INFEASIBLE = pywraplp.Solver.INFEASIBLE
+UNBOUNDED = pywraplp.Solver.UNBOUNDED
+NOT_SOLVED = pywraplp.Solver.NOT_SOLVED
+
+PIVOT_TOLERANCE = 1e-9
+FEASIBILITY_TOLERANCE = 1e-7
+
+
+class BatchSolution(NamedTuple):
+    """The solutions of a batch of LPs, stacked along the first axis."""
+    LOGGER.debug(f"Initialized {__name__}")
+    status: ndarray
+    x: ndarray
+    objective: ndarray
+    iterations: int
+
+
+def _dense(A) -> ndarray:
+    """Stacks the constraint matrices of a batch into a dense ``(batch, m, n)`` array."""
+    if isinstance(A, (list, tuple)):
+        return stack([matrix.toarray() if hasattr(matrix, "toarray") else asarray(matrix, dtype=float64)
+                      for matrix in A]).astype(float64, copy=False)
+    return asarray(A, dtype=float64)
+
+
+def _pivot(T, basis, problems, rows, columns):
+    """Pivots the tableaus of the given problems on ``(rows, columns)`` in place."""
+    tableau = T[problems]
+    batch = arange(len(problems))
+    pivot_row = tableau[batch, rows] / tableau[batch, rows, columns][:, None]
+    tableau -= tableau[batch, :, columns][:, :, None] * pivot_row[:, None, :]
+    tableau[batch, rows] = pivot_row
+    T[problems] = tableau
+    basis[problems, rows] = columns
+
+
+def _simplex(T, basis, running, status, allowed, max_iterations):
+    """
+    Runs the primal simplex on every running problem until it is optimal or unbounded; problems that reach the
+    iteration limit keep running (and their ``NOT_SOLVED`` status).
+
+    The objective row is the last row of the tableau. The entering column has the most negative reduced cost
+    (Dantzig's rule), and after half of the iterations the lowest-index improving column (Bland's rule), so degenerate
+    problems cannot cycle. The leaving row has the smallest ratio, ties broken by the lowest basic variable.
+
+    Returns:
+        The number of iterations.
+    """
+    for iteration in range(max_iterations):
+        problems = running.nonzero()[0]
+        if not len(problems):
+            return iteration
+
+        reduced_costs = where(allowed, T[problems, -1, :-1], inf)
+        if iteration < max_iterations // 2:
+            columns = argmin(reduced_costs, axis=1)
+        else:
+            columns = argmax(reduced_costs < -PIVOT_TOLERANCE, axis=1)
+        improving = reduced_costs[arange(len(problems)), columns] < -PIVOT_TOLERANCE
+        status[problems[~improving]], running[problems[~improving]] = OPTIMAL, False
+        problems, columns = problems[improving], columns[improving]
+        if not len(problems):
+            return iteration
+
+        column = T[problems, :-1, columns]
+        ratios = where(column > PIVOT_TOLERANCE, T[problems, :-1, -1] / where(column > PIVOT_TOLERANCE, column, 1.),
+                       inf)
+        smallest = ratios.min(axis=1)
+        bounded = ~isinf(smallest)
+        status[problems[~bounded]], running[problems[~bounded]] = UNBOUNDED, False
+        ties = ratios <= smallest[:, None] + PIVOT_TOLERANCE
+        rows = argmin(where(ties, basis[problems], basis.shape[1] + T.shape[2]), axis=1)
+        _pivot(T, basis, problems[bounded], rows[bounded], columns[bounded])
+    return max_iterations
+
+
+def solve_batch(c, A, b, max_iterations: int = None) -> BatchSolution:
+    """
+    Solves a batch of same-shaped LPs ``max c^T * x`` subject to ``A * x <= b``, ``x >= 0`` with a dense tableau
+    simplex in NumPy, every pivot applied to all unsolved problems at once.
+
+    Problems whose origin is infeasible (some ``b < 0``) first solve the phase one problem of a single artificial
+    variable that is pivoted into the most violated row. Small dense problems are solved faster than an OR-Tools
+    model can be built, and hundreds of them share every NumPy operation.
+
+    Args:
+        c: The objective coefficients, ``(batch, n)``.
+        A: The constraint matrices, ``(batch, m, n)`` (or a list of dense or sparse matrices).
+        b: The constraint bounds, ``(batch, m)``.
+        max_iterations: The iteration limit of each phase (``50 * (m + n)`` by default); problems that reach it have
+            the ``NOT_SOLVED`` status.
+
+    Returns:
+        The statuses (``pywraplp.Solver`` codes), solutions and objective values.
+    """
+    A = _dense(A)
+    c, b = asarray(c, dtype=float64).reshape(len(A), -1), asarray(b, dtype=float64).reshape(len(A), -1)
+    batch, m, n = A.shape
+    max_iterations = 50 * (m + n) if max_iterations is None else max_iterations
+    LOGGER.debug(f"Solving a batch of {batch} LPs with {n} variables and {m} constraints")
+
+    # Columns: x, slacks, the artificial variable, the right-hand side; rows: constraints, objective
+    artificial = n + m
+    T = zeros((batch, m + 1, n + m + 2))
+    T[:, :m, :n] = A
+    T[:, :m, n:artificial] = eye(m)
+    T[:, :m, artificial] = -1.
+    T[:, :m, -1] = b
+    T[:, m, artificial] = 1.  # Phase one maximizes -x_a
+    basis = full((batch, m), n, dtype=int64) + arange(m)
+    status = full(batch, NOT_SOLVED, dtype=int64)
+    allowed = ones(n + m + 1, dtype=bool)
+
+    infeasible_origin = (b.min(axis=1, initial=0.) < 0).nonzero()[0]
+    if len(infeasible_origin):
+        _pivot(T, basis, infeasible_origin, argmin(b[infeasible_origin], axis=1),
+               full(len(infeasible_origin), artificial))
+    running = ones(batch, dtype=bool)
+    iterations = _simplex(T, basis, running, status, allowed, max_iterations)
+
+    scale = 1. + abs(b).max(axis=1, initial=0.)
+    status[(status == OPTIMAL) & (T[:, m, -1] < -FEASIBILITY_TOLERANCE * scale)] = INFEASIBLE
+    for problem, row in zip(*(basis == artificial).nonzero()):
+        # A degenerate artificial variable left in the basis is pivoted out on any non-zero entry of its row
+        column = argmax(abs(T[problem, row, :artificial]))
+        if status[problem] == OPTIMAL and abs(T[problem, row, column]) > PIVOT_TOLERANCE:
+            _pivot(T, basis, asarray([problem]), asarray([row]), asarray([column]))
+
+    # Phase two: price the objective out of the basis
+    feasible = status == OPTIMAL
+    status[feasible], running = NOT_SOLVED, feasible.copy()
+    costs = zeros((batch, n + m + 2))
+    costs[:, :n] = c
+    T[:, m] = -costs
+    T[:, m] += einsum("bi,bij->bj", costs[arange(batch)[:, None], basis], T[:, :m])
+    allowed[artificial] = False
+    iterations += _simplex(T, basis, running, status, allowed, max_iterations)
+
+    values = zeros((batch, n + m + 2))
+    values[arange(batch)[:, None], basis] = T[:, :m, -1]
+    x = where(feasible[:, None], values[:, :n], 0.)
+    return BatchSolution(status, x, einsum("bj,bj->b", c, x), iterations)
+
+
+def _with_bound_row(A, b, row, bound):
+    """Appends the row ``row^T * x <= bound`` to every problem of a batch."""
+    return concatenate((_dense(A), row[:, None, :]), axis=1), concatenate((asarray(b, dtype=float64), bound[:, None]),
+                                                                         axis=1)
+
+
+def solve_criterion_1(z, A, b) -> BatchSolution:
+    """
+    The first criterion of a batch: maximizes ``z^T * x``, then minimizes the sum of x_i with the additional
+    constraint ``z^T * x >= z_max`` (see ``lexicographic.lexicographic_solve``).
+
+    Args:
+        z: The element objectives, ``(batch, n)`` (``c``, or ``c + d`` for the second linear model).
+        A: The constraint matrices, ``(batch, m, n)``.
+        b: The constraint bounds, ``(batch, m)``.
+
+    Returns:
+        The solutions, with the sum of x_i as the objective value.
+    """
+    z = asarray(z, dtype=float64)
+    first = solve_batch(z, A, b)
+    second = solve_batch(-ones(z.shape), *_with_bound_row(A, b, -z, -first.objective))
+    status = where(first.status == OPTIMAL, second.status, first.status)
+    return BatchSolution(status, second.x, -second.objective, first.iterations + second.iterations)
+
+
+def solve_criterion_2(z, A, b, z_min, alpha) -> BatchSolution:
+    """
+    The second criterion of a batch: minimizes the sum of x_i with the expert constraint
+    ``z^T * x >= z_min * (1 - alpha)``.
+
+    Args:
+        z: The element objectives, ``(batch, n)``.
+        A: The constraint matrices, ``(batch, m, n)``.
+        b: The constraint bounds, ``(batch, m)``.
+        z_min: The minimum acceptable value for the objective function.
+        alpha: The expert-defined threshold.
+
+    Returns:
+        The solutions, with the sum of x_i as the objective value.
+    """
+    z = asarray(z, dtype=float64)
+    solution = solve_batch(-ones(z.shape), *_with_bound_row(A, b, -z, full(len(z), -z_min * (1 - alpha))))
+    return solution._replace(objective=-solution.objective)
+
+
+def solve_criterion_3(z, A, b, weights, tolerance: float = 1e-6, max_iterations: int = 100,
+                      trace: list = None) -> BatchSolution:
+    """
+    The third criterion of a batch: maximizes ``(weights * z)^T * x`` and updates the weights to the normalized
+    ``weights * x`` until the objective changes by less than the tolerance. Converged problems leave the batch.
+
+    Args:
+        z: The element objectives, ``(batch, n)``.
+        A: The constraint matrices, ``(batch, m, n)``.
+        b: The constraint bounds, ``(batch, m)``.
+        weights: A scalar, a vector or a ``(batch, n)`` array of weights.
+        tolerance: The convergence tolerance of the objective.
+        max_iterations: The maximal number of weight updates.
+        trace: A list per problem, which gets a tuple ``(iteration, weights, objective)`` for every round the problem
+            takes part in (see ``first.criterion_3.WeightingRound``), or None.
+
+    Returns:
+        The solutions of the last round.
+    """
+    z, A, b = asarray(z, dtype=float64), _dense(A), asarray(b, dtype=float64)
+    weights = zeros(z.shape) + asarray(weights, dtype=float64)
+    status = full(len(z), OPTIMAL, dtype=int64)
+    x, objective = zeros(z.shape), zeros(len(z))
+    previous = zeros(len(z))
+    active, iterations = arange(len(z)), 0
+
+    for iteration in range(max_iterations):
+        solution = solve_batch(weights[active] * z[active], A[active], b[active])
+        iterations += solution.iterations
+        status[active], x[active], objective[active] = solution.status, solution.x, solution.objective
+        if trace is not None:
+            for k in active.tolist():
+                trace[k].append((iteration, weights[k].copy(), float(objective[k])))
+
+        converged = (solution.status != OPTIMAL) | (abs(solution.objective - previous[active]) < tolerance)
+        previous[active] = solution.objective
+        active = active[~converged]
+        if not len(active):
+            break
+
+        updated = weights[active] * x[active]
+        total = updated.sum(axis=1)
+        nonzero = total != 0  # A zero total keeps the weights, so the next round converges
+        weights[active[nonzero]] = updated[nonzero] / total[nonzero, None]
+
+    return BatchSolution(status, x, objective, iterations)
+
+
+def solve_element(batch_solve, description: str, z, A, b, *args):
+    """
+    Solves a single element with a batch criterion (a batch of one).
+
+    Args:
+        batch_solve: ``solve_criterion_1``, ``solve_criterion_2`` or ``solve_criterion_3``.
+        description: The model and criterion, for the log and the errors.
+        z: The element objective.
+        A: The constraint matrix (dense or sparse).
+        b: The constraint bounds.
+        *args: The criterion parameters.
+
+    Returns:
+        A tuple containing:
+            - The optimal solution vector x.
+            - The optimal objective value.
+    """
+    A = A.toarray() if hasattr(A, "toarray") else asarray(A, dtype=float64)
+    solution = batch_solve(asarray(z, dtype=float64)[None], A[None], asarray(b, dtype=float64)[None], *args)
+
+    solver_status = int(solution.status[0])
+    if solver_status != OPTIMAL:
+        LOGGER.error(f"Unable to find the optimal solution for {description}. {solver_status=}")
+        raise SolverError(f"Unable to find the optimal solution for {description}. {solver_status=}")
+
+    optimal_x, optimal_objective = solution.x[0].tolist(), float(solution.objective[0])
+    LOGGER.info("Optimal solution found for %s: x=%s, objective=%s", description, summary(optimal_x),
+                optimal_objective)
+    return optimal_x, optimal_objective
@@ -1,10 +1,14 @@
 from ortools.linear_solver import pywraplp
 
 from mmcp.core import SolverError
-from ...utils.logger_setup import LOGGER
+from ..backends import is_native
+from ..dense_simplex import solve_element, solve_criterion_1
+from ..lexicographic import lexicographic_solve
+from ..model_builder import solution_values
+from ...utils.logger_setup import LOGGER, summary
 
 
-def solve(c, A, b, M):
+def solve(c, A, b, M, backend=None):
     """
     Solves the first criterion for the first linear model.
 
@@ -13,45 +17,22 @@ def solve(c, A, b, M):
         A: Matrix of constraint coefficients.
         b: Vector of constraint bounds.
         M: A large constant.
+        backend: The LP backend name, "auto", or None for ``Vars.lp_backend`` (see ``linear_models.backends``).
 
     Returns:
         A tuple containing:
             - The optimal solution vector x.
             - The optimal objective value.
     """
-    LOGGER.debug(f"Entering solve function in criterion_1.py (linear_models/first) with: "
-                 f"c={c}, A={A}, b={b}, M={M}")
+    LOGGER.debug("Entering solve function in criterion_1.py (linear_models/first) with: c=%s, A=%s, b=%s, M=%s",
+                 summary(c), summary(A), summary(b), M)
 
-    solver = pywraplp.Solver.CreateSolver("GLOP")
+    if is_native(backend):
+        return solve_element(solve_criterion_1, "the first linear model, first criterion", c, A, b)
 
-    num_vars = len(c)
-    x = [solver.NumVar(0, solver.infinity(), f"x_{i}") for i in range(num_vars)]
-
-    # Add constraints
-    for i in range(len(b)):
-        constraint = solver.Constraint(-solver.infinity(), b[i])
-        for j in range(num_vars):
-            constraint.SetCoefficient(x[j], A[i][j])
-
-    # Solve for z_max
-    objective_max = solver.Objective()
-    for i in range(num_vars):
-        objective_max.SetCoefficient(x[i], c[i])
-    objective_max.SetMaximization()
-    solver.Solve()
-    z_max = objective_max.Value()
-
-    # Solve with the additional constraint z >= z_max
+    # Solve for z_max, then minimize the sum of x_i with the additional constraint z >= z_max
+    solver_status, solver, x = lexicographic_solve(c, A, b, backend=backend)
     objective = solver.Objective()
-    for i in range(num_vars):
-        objective.SetCoefficient(x[i], 1)  # Minimize the sum of x_i
-    objective.SetMinimization()
-
-    z_constraint = solver.Constraint(z_max, solver.infinity())
-    for i in range(num_vars):
-        z_constraint.SetCoefficient(x[i], c[i])
-
-    solver_status = solver.Solve()
 
     if solver_status != pywraplp.Solver.OPTIMAL:
         LOGGER.error(f"Unable to find the optimal solution for the first linear model, first criterion. "
@@ -59,9 +40,9 @@ def solve(c, A, b, M):
         raise SolverError(f"Unable to find the optimal solution for the first linear model, first criterion. "
                           f"{solver_status=}")
 
-    optimal_x = [x[i].solution_value() for i in range(num_vars)]
+    optimal_x = solution_values(x)
     optimal_objective = objective.Value()
-    LOGGER.info(f"Optimal solution found for the first linear model, first criterion: "
-                f"x={optimal_x}, objective={optimal_objective}")
+    LOGGER.info("Optimal solution found for the first linear model, first criterion: x=%s, objective=%s",
+                summary(optimal_x), optimal_objective)
 
     return optimal_x, optimal_objective
@@ -1,10 +1,14 @@
+from numpy import ones
 from ortools.linear_solver import pywraplp
 
 from mmcp.core import SolverError
-from ...utils.logger_setup import LOGGER
+from ..backends import is_native
+from ..dense_simplex import solve_element, solve_criterion_2
+from ..model_builder import LinearModelBuilder, solution_values
+from ...utils.logger_setup import LOGGER, summary
 
 
-def solve(c, A, b, z_min, alpha):
+def solve(c, A, b, z_min, alpha, backend=None):
     """
     Solves the second criterion for the first linear model.
 
@@ -14,36 +18,31 @@ def solve(c, A, b, z_min, alpha):
         b: Vector of constraint bounds.
         z_min: The minimum acceptable value for the objective function.
         alpha: The expert-defined threshold.
+        backend: The LP backend name, "auto", or None for ``Vars.lp_backend`` (see ``linear_models.backends``).
 
     Returns:
         A tuple containing:
             - The optimal solution vector x.
             - The optimal objective value.
     """
-    LOGGER.debug(f"Entering solve function in criterion_2.py (linear_models/first) with: "
-                 f"c={c}, A={A}, b={b}, z_min={z_min}, alpha={alpha}")
+    LOGGER.debug("Entering solve function in criterion_2.py (linear_models/first) with: c=%s, A=%s, b=%s, z_min=%s, "
+                 "alpha=%s", summary(c), summary(A), summary(b), z_min, alpha)
 
-    solver = pywraplp.Solver.CreateSolver("GLOP")
+    if is_native(backend):
+        return solve_element(solve_criterion_2, "the first linear model, second criterion", c, A, b, z_min, alpha)
 
-    num_vars = len(c)
-    x = [solver.NumVar(0, solver.infinity(), f"x_{i}") for i in range(num_vars)]
+    # Minimize the sum of x_i
+    builder = LinearModelBuilder(maximize=False)
+    builder.add_variables(ones(len(c)))
 
     # Add constraints
-    for i in range(len(b)):
-        constraint = solver.Constraint(-solver.infinity(), b[i])
-        for j in range(num_vars):
-            constraint.SetCoefficient(x[j], A[i][j])
+    builder.add_constraints(A, upper_bounds=b)
 
     # Add the expert constraint
-    expert_constraint = solver.Constraint(z_min * (1 - alpha), solver.infinity())
-    for i in range(num_vars):
-        expert_constraint.SetCoefficient(x[i], c[i])
+    builder.add_constraints(c, lower_bounds=z_min * (1 - alpha))
 
-    # Minimize the sum of x_i
+    solver, x, _ = builder.build(backend)
     objective = solver.Objective()
-    for i in range(num_vars):
-        objective.SetCoefficient(x[i], 1)
-    objective.SetMinimization()
 
     solver_status = solver.Solve()
 
@@ -53,9 +52,9 @@ def solve(c, A, b, z_min, alpha):
         raise SolverError(f"Unable to find the optimal solution for the first linear model, second criterion. "
                           f"{solver_status=}")
 
-    optimal_x = [x[i].solution_value() for i in range(num_vars)]
+    optimal_x = solution_values(x)
     optimal_objective = objective.Value()
-    LOGGER.info(f"Optimal solution found for the first linear model, second criterion: "
-                f"x={optimal_x}, objective={optimal_objective}")
+    LOGGER.info("Optimal solution found for the first linear model, second criterion: x=%s, objective=%s",
+                summary(optimal_x), optimal_objective)
 
     return optimal_x, optimal_objective
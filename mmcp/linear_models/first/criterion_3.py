@@ -1,10 +1,26 @@
+from typing import NamedTuple
+
+from numpy import asarray, broadcast_to, zeros, ndarray, float64
 from ortools.linear_solver import pywraplp
 
 from mmcp.core import SolverError
-from ...utils.logger_setup import LOGGER
+from ..backends import is_native, resolve_backend, problem_size
+from ..dense_simplex import solve_element, solve_criterion_3
+from ..model_builder import build_model, set_objective, solution_values
+from ...utils.config import Vars
+from ...utils.logger_setup import LOGGER, summary
+
+
+class WeightingRound(NamedTuple):
+    """A round of the iterative procedure of the third criterion: the weights it used and its objective value."""
+    LOGGER.debug(f"Initialized {__name__}")
+    iteration: int
+    weights: ndarray
+    objective: float
 
 
-def solve(c, A, b, weights):
+def solve(c, A, b, weights, backend=None, tolerance: float = None, max_iterations: int = None,
+          return_trace: bool = False):
     """
     Solves the third criterion for the first linear model using an iterative procedure.
 
@@ -12,63 +28,104 @@ def solve(c, A, b, weights):
         c: Vector of coefficients for the objective function.
         A: Matrix of constraint coefficients.
         b: Vector of constraint bounds.
-        weights: Vector of weights representing the importance of each element.
+        weights: Vector of weights representing the importance of each element (a scalar weights every variable).
+        backend: The LP backend name, "auto", or None for ``Vars.lp_backend`` (see ``linear_models.backends``).
+        tolerance: The convergence tolerance of the objective (``Vars.weights_tolerance`` by default).
+        max_iterations: The maximal number of rounds (``Vars.weights_max_iterations`` by default).
+        return_trace: Whether the rounds are returned as well.
 
     Returns:
         A tuple containing:
             - The optimal solution vector x.
             - The optimal objective value.
+            - With ``return_trace``, the list of the rounds (``WeightingRound``).
     """
-    LOGGER.debug(f"Entering solve function in criterion_3.py (linear_models/first) with: "
-                 f"c={c}, A={A}, b={b}, weights={weights}")
+    LOGGER.debug("Entering solve function in criterion_3.py (linear_models/first) with: c=%s, A=%s, b=%s, weights=%s",
+                 summary(c), summary(A), summary(b), summary(weights))
 
-    solver = pywraplp.Solver.CreateSolver("GLOP")
+    tolerance = Vars.weights_tolerance if tolerance is None else tolerance
+    max_iterations = Vars.weights_max_iterations if max_iterations is None else max_iterations
+    if is_native(backend):
+        rounds = [list()] if return_trace else None
+        solution = solve_element(solve_criterion_3, "the first linear model, third criterion", c, A, b, weights,
+                                 tolerance, max_iterations, rounds)
+        return (*solution, [WeightingRound(*entry) for entry in rounds[0]]) if return_trace else solution
 
-    num_vars = len(c)
-    x = [solver.NumVar(0, solver.infinity(), f"x_{i}") for i in range(num_vars)]
+    backend = resolve_backend(backend, *problem_size(A, len(c)))
+    solver, x = build_model(c, A, b, backend=backend)
+    solve_round = round_solver(solver, x, backend, "the first linear model, third criterion")
+    optimal_x, optimal_objective, trace = iterate_weights(solve_round, c, weights, tolerance, max_iterations)
 
-    # Add constraints
-    for i in range(len(b)):
-        constraint = solver.Constraint(-solver.infinity(), b[i])
-        for j in range(num_vars):
-            constraint.SetCoefficient(x[j], A[i][j])
+    optimal_x = optimal_x.tolist()
+    LOGGER.info("Optimal solution found for the first linear model, third criterion: x=%s, objective=%s",
+                summary(optimal_x), optimal_objective)
 
-    # Iterative procedure
-    tolerance = 1e-6  # Define a tolerance for convergence
-    max_iterations = 100
+    return (optimal_x, optimal_objective, trace) if return_trace else (optimal_x, optimal_objective)
 
-    z_prev = 0
 
-    objective = solver.Objective()
-    for iteration in range(max_iterations):
-        objective = solver.Objective()
-        for i in range(num_vars):
-            objective.SetCoefficient(x[i], weights[i] * c[i])
-        objective.SetMaximization()
+def round_solver(solver, x, backend, description: str):
+    """
+    Returns the ``solve_round`` callable of ``iterate_weights`` for a built model: every round only replaces the
+    objective, and the rounds after the first start from the previous basis.
 
-        solver_status = solver.Solve()
+    Args:
+        solver: The solver holding the model.
+        x: The solver variables.
+        backend: The LP backend the model was built into.
+        description: The model and criterion, for the log and the errors.
+    """
 
+    def solve_round(coefficients, iteration):
+        set_objective(solver, x, coefficients, maximize=True)
+        solver_status = solver.Solve()
         if solver_status != pywraplp.Solver.OPTIMAL:
-            LOGGER.error(f"Unable to find the optimal solution for the first linear model, third criterion. "
-                         f"{solver_status=}, {iteration=}")
-            raise SolverError(f"Unable to find the optimal solution for the first linear model, third criterion. "
-                              f"{solver_status=}, {iteration=}")
+            LOGGER.error(f"Unable to find the optimal solution for {description}. {solver_status=}, {iteration=}")
+            raise SolverError(f"Unable to find the optimal solution for {description}. {solver_status=}, "
+                              f"{iteration=}")
+        if iteration == 0 and backend.warm_start_parameters:
+            solver.SetSolverSpecificParametersAsString(backend.warm_start_parameters)
+        return asarray(solution_values(x), dtype=float64), solver.Objective().Value()
+
+    return solve_round
 
-        z_current = objective.Value()
 
-        if abs(z_current - z_prev) < tolerance:
+def iterate_weights(solve_round, z, weights, tolerance: float = None, max_iterations: int = None):
+    """
+    The iterative procedure of the third criterion: maximizes ``(weights * z)^T * x`` and updates the weights to the
+    normalized ``weights * x`` until the objective changes by less than the tolerance.
+
+    Args:
+        solve_round: A callable ``solve_round(coefficients, iteration)`` that maximizes ``coefficients^T * x`` and
+            returns the optimal solution vector x (as an array) and the optimal objective value.
+        z: The element objective (``c``, or ``c + d`` for the second linear model).
+        weights: A scalar or a vector of weights.
+        tolerance: The convergence tolerance of the objective (``Vars.weights_tolerance`` by default).
+        max_iterations: The maximal number of rounds (``Vars.weights_max_iterations`` by default).
+
+    Returns:
+        A tuple containing:
+            - The optimal solution vector x of the last round.
+            - The optimal objective value of the last round.
+            - The list of the rounds (``WeightingRound``).
+    """
+    tolerance = Vars.weights_tolerance if tolerance is None else tolerance
+    max_iterations = Vars.weights_max_iterations if max_iterations is None else max_iterations
+    z = asarray(z, dtype=float64)
+    weights = broadcast_to(asarray(weights, dtype=float64), z.shape).copy()
+
+    x, objective, z_prev, trace = zeros(len(z)), 0., 0., list()
+    for iteration in range(max_iterations):
+        x, objective = solve_round(weights * z, iteration)
+        trace.append(WeightingRound(iteration, weights, objective))
+
+        if abs(objective - z_prev) < tolerance:
             break
 
-        z_prev = z_current
-        # Update weights based on the current solution (implementation depends on the specific update rule)
+        z_prev = objective
         weights = update_weights(weights, x)
 
-    optimal_x = [x[i].solution_value() for i in range(num_vars)]
-    optimal_objective = objective.Value()
-    LOGGER.info(f"Optimal solution found for the first linear model, third criterion: "
-                f"x={optimal_x}, objective={optimal_objective}")
-
-    return optimal_x, optimal_objective
+    LOGGER.debug(f"The iterative procedure took {len(trace)} rounds, objective={objective}")
+    return x, objective, trace
 
 
 def update_weights(weights, x):
@@ -77,19 +134,22 @@ def update_weights(weights, x):
 
     Args:
         weights: Vector of weights representing the importance of each element.
-        x: Vector of decision variables.
+        x: The solution vector.
 
     Returns:
-        Updated weights.
+        Updated weights; if ``weights * x`` sums to zero, the weights are kept, so the next round converges.
     """
-    LOGGER.debug(f"Updating weights in criterion_3.py (linear_models/first) with weights={weights}, x={x}")
+    LOGGER.debug("Updating weights in criterion_3.py (linear_models/first) with weights=%s, x=%s",
+                 summary(weights), summary(x))
 
     # Update weights based on the current solution
-    weights = [w * xi.solution_value() for w, xi in zip(weights, x)]
+    updated = asarray(weights, dtype=float64) * asarray(x, dtype=float64)
 
     # normalization to not blow up the weights
-    total = sum(weights)
-    weights = [w / total for w in weights if total != 0]
-    LOGGER.debug(f"Updated weights: {weights}")
+    total = updated.sum()
+    if total == 0:
+        return asarray(weights, dtype=float64)
+    weights = updated / total
+    LOGGER.debug("Updated weights: %s", summary(weights))
 
     return weights
@@ -0,0 +1,152 @@
+from numpy import array, ones, float64, inf
+from ortools.linear_solver import pywraplp
+
+from mmcp.core import SolverError
+from .backends import resolve_backend, problem_size
+from .first.criterion_3 import iterate_weights
+from .model_builder import LinearModelBuilder, set_objective, add_constraint, solution_values
+from ..utils.logger_setup import LOGGER
+
+
+class IncrementalLinearModel:
+    """
+    Keeps the model ``A * x <= b``, ``x >= 0`` of one element alive between solves.
+
+    Besides the rows of A, the model holds a single row ``z^T * x`` with ``z = c`` (or ``z = c + d`` for the second
+    linear model). Every criterion of the first and the second linear models only changes the objective and the bounds
+    of that row, so coefficients, bounds, criteria and model types are changed in place and every re-solve starts from
+    the basis of the previous one.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+
+    def __init__(self, c, A, b, d=None, backend=None):
+        LOGGER.debug(f"Building incremental model with {len(c)} variables and {len(b)} constraints")
+        self.c = array(c, dtype=float64)
+        self.d = None if d is None else array(d, dtype=float64)
+        self.use_private_resources = False
+        self.backend = resolve_backend(backend, *problem_size(A, len(self.c)))
+
+        builder = LinearModelBuilder(maximize=False)
+        builder.add_variables(ones(len(self.c)))
+        builder.add_constraints(A, upper_bounds=b)
+        self.solver, self.x, self.rows = builder.build(self.backend)
+        self.z_row = add_constraint(self.solver, self.x, self.c)  # Free rows are dropped when loading a model
+
+        if self.backend.warm_start_parameters:
+            # E.g. presolve would rebuild the problem and discard the basis of the previous solve
+            self.solver.SetSolverSpecificParametersAsString(self.backend.warm_start_parameters)
+
+    @property
+    def z_coefficients(self):
+        """The coefficients of the element objective ``z``."""
+        if self.use_private_resources and self.d is not None:
+            return self.c + self.d
+        return self.c
+
+    def _sync_z_coefficient(self, j):
+        self.z_row.SetCoefficient(self.x[j], float(self.z_coefficients[j]))
+
+    def _sync_z_row(self):
+        for variable, coefficient in zip(self.x, self.z_coefficients.tolist()):
+            self.z_row.SetCoefficient(variable, coefficient)
+
+    def set_private_resources(self, use_private_resources: bool):
+        """
+        Switches between the objectives of the first (``c``) and the second (``c + d``) linear model.
+
+        Args:
+            use_private_resources: Whether the private resources d are included in the objective.
+        """
+        if use_private_resources and self.d is None:
+            LOGGER.error("The private resources d are required for the second linear model.")
+            raise SolverError("The private resources d are required for the second linear model.")
+        if use_private_resources != self.use_private_resources:
+            self.use_private_resources = use_private_resources
+            self._sync_z_row()
+
+    def set_objective_coefficient(self, j, value):
+        """Sets ``c[j]``."""
+        self.c[j] = value
+        self._sync_z_coefficient(j)
+
+    def set_private_resource(self, j, value):
+        """Sets ``d[j]``."""
+        if self.d is None:
+            LOGGER.error("The element has no private resources d.")
+            raise SolverError("The element has no private resources d.")
+        self.d[j] = value
+        self._sync_z_coefficient(j)
+
+    def set_constraint_bound(self, i, value):
+        """Sets ``b[i]``."""
+        self.rows[i].SetUb(float(value))
+
+    def set_constraint_coefficient(self, i, j, value):
+        """Sets ``A[i][j]``."""
+        self.rows[i].SetCoefficient(self.x[j], float(value))
+
+    def _solve(self, description, **details):
+        solver_status = self.solver.Solve()
+        if solver_status != pywraplp.Solver.OPTIMAL:
+            details = "".join(f", {key}={value}" for key, value in details.items())
+            LOGGER.error(f"Unable to find the optimal solution for {description}. {solver_status=}{details}")
+            raise SolverError(f"Unable to find the optimal solution for {description}. {solver_status=}{details}")
+        return self.solver.Objective().Value()
+
+    def solve_criterion_1(self, description="the incremental model, first criterion"):
+        """
+        Maximizes z, then minimizes the sum of x_i with the additional constraint ``z >= z_max``.
+
+        Returns:
+            A tuple containing:
+                - The optimal solution vector x.
+                - The optimal objective value.
+        """
+        self.z_row.SetLb(-inf)
+        set_objective(self.solver, self.x, self.z_coefficients, maximize=True)
+        self.solver.Solve()
+        z_max = self.solver.Objective().Value()
+
+        self.z_row.SetLb(z_max - self.backend.tolerance * max(abs(z_max), 1.))
+        set_objective(self.solver, self.x, ones(len(self.x)), maximize=False)
+        optimal_objective = self._solve(description)
+        return solution_values(self.x), optimal_objective
+
+    def solve_criterion_2(self, z_min, alpha, description="the incremental model, second criterion"):
+        """
+        Minimizes the sum of x_i with the expert constraint ``z >= z_min * (1 - alpha)``.
+
+        Returns:
+            A tuple containing:
+                - The optimal solution vector x.
+                - The optimal objective value.
+        """
+        self.z_row.SetLb(z_min * (1 - alpha))
+        set_objective(self.solver, self.x, ones(len(self.x)), maximize=False)
+        optimal_objective = self._solve(description)
+        return solution_values(self.x), optimal_objective
+
+    def solve_criterion_3(self, weights, tolerance=None, max_iterations=None,
+                          description="the incremental model, third criterion", return_trace=False):
+        """
+        Maximizes the weighted objective ``weights * z`` iteratively, updating the weights after each round (see
+        ``first.criterion_3.iterate_weights``).
+
+        Returns:
+            A tuple containing:
+                - The optimal solution vector x.
+                - The optimal objective value.
+                - With ``return_trace``, the list of the rounds.
+        """
+        self.z_row.SetLb(-inf)
+
+        def solve_round(coefficients, iteration):
+            set_objective(self.solver, self.x, coefficients, maximize=True)
+            optimal_objective = self._solve(description, iteration=iteration)
+            return array(solution_values(self.x), dtype=float64), optimal_objective
+
+        optimal_x, optimal_objective, trace = iterate_weights(solve_round, self.z_coefficients, weights, tolerance,
+                                                              max_iterations)
+        if return_trace:
+            return optimal_x.tolist(), optimal_objective, trace
+        return optimal_x.tolist(), optimal_objective
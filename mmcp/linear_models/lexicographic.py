@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from threading import Lock
+
+from numpy import ones
+from ortools.linear_solver import pywraplp
+
+from .backends import resolve_backend, problem_size
+from .model_builder import build_model, set_objective, add_constraint
+from ..utils.hashing import content_hash
+from ..utils.logger_setup import LOGGER
+
+Z_MAX_CACHE_SIZE = 256
+
+_z_max_cache = OrderedDict()
+_z_max_cache_lock = Lock()
+
+
+def _cached_z_max(key):
+    with _z_max_cache_lock:
+        z_max = _z_max_cache.get(key)
+        if z_max is not None:
+            _z_max_cache.move_to_end(key)
+        return z_max
+
+
+def _store_z_max(key, z_max):
+    with _z_max_cache_lock:
+        _z_max_cache[key] = z_max
+        _z_max_cache.move_to_end(key)
+        while len(_z_max_cache) > Z_MAX_CACHE_SIZE:
+            _z_max_cache.popitem(last=False)
+
+
+def clear_cache():
+    """Clears the cache of the first phase optimal values."""
+    LOGGER.debug("Clearing the lexicographic z_max cache.")
+    with _z_max_cache_lock:
+        _z_max_cache.clear()
+
+
+def lexicographic_solve(c, A, b, secondary=None, use_cache: bool = True, backend=None):
+    """
+    Solves ``max c^T * x`` subject to ``A * x <= b``, ``x >= 0``, and then minimizes ``secondary^T * x`` over the
+    optimal face (with the additional constraint ``c^T * x >= z_max``).
+
+    The second phase re-solves the same solver instance (with the warm start parameters of the backend, e.g. presolve
+    disabled for GLOP), so it starts from the optimal basis of the first phase. The optimal value ``z_max`` of the
+    first phase is cached by the content of ``(c, A, b)`` and the backend, and a repeated call on unchanged data skips
+    the first phase completely.
+
+    Args:
+        c: Vector of coefficients of the primary objective.
+        A: Matrix of constraint coefficients (dense or sparse).
+        b: Vector of constraint bounds.
+        secondary: Vector of coefficients of the secondary objective (the sum of x_i if None).
+        use_cache: Whether the cache of the first phase optimal values is used.
+        backend: The LP backend name, "auto", an ``LPBackend``, or None for ``Vars.lp_backend``.
+
+    Returns:
+        A tuple containing:
+            - The solver status of the second phase.
+            - The solver.
+            - The list of the solver variables.
+    """
+    backend = resolve_backend(backend, *problem_size(A, len(c)))
+    LOGGER.debug(f"Entering lexicographic_solve with {use_cache=}, backend={backend}")
+
+    key = content_hash(backend.name, c, A, b) if use_cache else None
+    z_max = _cached_z_max(key) if use_cache else None
+    if secondary is None:
+        secondary = ones(len(c))
+
+    if z_max is None:
+        solver, x = build_model(c, A, b, maximize=True, backend=backend)
+        primary_status = solver.Solve()
+        z_max = solver.Objective().Value()
+        LOGGER.debug(f"First phase solved: {primary_status=}, {z_max=}")
+        if use_cache and primary_status == pywraplp.Solver.OPTIMAL:
+            _store_z_max(key, z_max)
+
+        set_objective(solver, x, secondary, maximize=False)
+    else:
+        LOGGER.debug(f"First phase skipped, cached {z_max=}")
+        solver, x = build_model(secondary, A, b, maximize=False, backend=backend)
+
+    # An approximate backend may end slightly below its own z_max, which must not cut off the optimal face
+    add_constraint(solver, x, c, lower_bound=z_max - backend.tolerance * max(abs(z_max), 1.))
+    if backend.warm_start_parameters:
+        # E.g. presolve would rebuild the problem and discard the basis of the first phase
+        solver.SetSolverSpecificParametersAsString(backend.warm_start_parameters)
+    return solver.Solve(), solver, x
@@ -0,0 +1,243 @@
+from numpy import asarray, nonzero, searchsorted, argsort, arange, full, float64, inf, ndim
+from ortools.linear_solver import pywraplp, linear_solver_pb2
+
+from mmcp.core import SolverError
+from .backends import resolve_backend
+from ..utils.logger_setup import LOGGER
+
+
+def sparse_triplets(A):
+    """
+    Returns the non-zero entries of a constraint matrix as row-sorted COO triplets.
+
+    Dense NumPy arrays (or nested lists) and sparse matrices exposing ``tocoo()`` are accepted. Exact zeros are
+    skipped, so they never reach the solver.
+
+    Args:
+        A: Matrix of constraint coefficients (dense or sparse).
+
+    Returns:
+        A tuple containing:
+            - The number of rows of A.
+            - The row indices of the non-zero entries.
+            - The column indices of the non-zero entries.
+            - The non-zero values.
+    """
+    if hasattr(A, "tocoo"):
+        coo = A.tocoo()
+        mask = coo.data != 0
+        rows, cols, values = coo.row[mask], coo.col[mask], asarray(coo.data[mask], dtype=float64)
+        order = argsort(rows, kind="stable")
+        return coo.shape[0], rows[order], cols[order], values[order]
+
+    A = asarray(A, dtype=float64)
+    if ndim(A) == 1:
+        A = A.reshape(1, -1)
+    rows, cols = nonzero(A)
+    return A.shape[0], rows, cols, A[rows, cols]
+
+
+class LinearModelBuilder:
+    """
+    Collects variables and constraints into an ``MPModelProto`` and loads the whole model into a solver at once.
+
+    Coefficients are copied from NumPy arrays in bulk instead of one ``SetCoefficient`` call per entry, which keeps the
+    model construction linear in the number of non-zeros with a small constant.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+
+    def __init__(self, maximize: bool = True):
+        self.proto = linear_solver_pb2.MPModelProto(maximize=maximize)
+        self.num_nonzeros = 0
+
+    @property
+    def num_variables(self) -> int:
+        return len(self.proto.variable)
+
+    @property
+    def num_constraints(self) -> int:
+        return len(self.proto.constraint)
+
+    def add_variables(self, objective, lower_bounds=0., upper_bounds=inf) -> range:
+        """
+        Adds one continuous variable per objective coefficient.
+
+        Args:
+            objective: Vector of objective coefficients of the new variables.
+            lower_bounds: Scalar or vector of lower bounds.
+            upper_bounds: Scalar or vector of upper bounds.
+
+        Returns:
+            The indices of the added variables.
+        """
+        objective = asarray(objective, dtype=float64).ravel()
+        num_vars = len(objective)
+        lower_bounds = full(num_vars, lower_bounds, dtype=float64).tolist()
+        upper_bounds = full(num_vars, upper_bounds, dtype=float64).tolist()
+
+        start = self.num_variables
+        for coefficient, lower_bound, upper_bound in zip(objective.tolist(), lower_bounds, upper_bounds):
+            self.proto.variable.add(lower_bound=lower_bound, upper_bound=upper_bound,
+                                    objective_coefficient=coefficient)
+        return range(start, start + num_vars)
+
+    def add_constraints(self, A, lower_bounds=-inf, upper_bounds=inf, columns=None) -> range:
+        """
+        Adds the rows ``lower_bounds <= A @ x[columns] <= upper_bounds``.
+
+        Args:
+            A: Matrix of constraint coefficients (dense or sparse), or a single row.
+            lower_bounds: Scalar or vector of row lower bounds.
+            upper_bounds: Scalar or vector of row upper bounds.
+            columns: Variable indices the columns of A refer to (defaults to the first variables of the model).
+
+        Returns:
+            The indices of the added constraints.
+        """
+        num_rows, rows, cols, values = sparse_triplets(A)
+        if columns is not None:
+            cols = asarray(columns)[cols]
+        return self.add_sparse_constraints(num_rows, searchsorted(rows, arange(num_rows + 1)), cols, values,
+                                           lower_bounds, upper_bounds)
+
+    def add_sparse_constraints(self, num_rows, indptr, indices, values, lower_bounds=-inf, upper_bounds=inf) -> range:
+        """
+        Adds rows given in compressed sparse row form.
+
+        Args:
+            num_rows: The number of rows to add.
+            indptr: Row pointers into ``indices`` and ``values`` (length ``num_rows + 1``).
+            indices: Variable indices of the non-zero entries.
+            values: The non-zero values.
+            lower_bounds: Scalar or vector of row lower bounds.
+            upper_bounds: Scalar or vector of row upper bounds.
+
+        Returns:
+            The indices of the added constraints.
+        """
+        indptr = asarray(indptr).tolist()
+        indices = asarray(indices).tolist()
+        values = asarray(values, dtype=float64).tolist()
+        lower_bounds = full(num_rows, lower_bounds, dtype=float64).tolist()
+        upper_bounds = full(num_rows, upper_bounds, dtype=float64).tolist()
+
+        start = self.num_constraints
+        for i in range(num_rows):
+            constraint = self.proto.constraint.add(lower_bound=lower_bounds[i], upper_bound=upper_bounds[i])
+            constraint.var_index.extend(indices[indptr[i]:indptr[i + 1]])
+            constraint.coefficient.extend(values[indptr[i]:indptr[i + 1]])
+        self.num_nonzeros += len(values)
+        return range(start, start + num_rows)
+
+    def build(self, backend=None):
+        """
+        Creates a solver and loads the collected model into it.
+
+        Args:
+            backend: The LP backend name, "auto" (picked by the size of the collected model), an ``LPBackend``, or
+                None for ``Vars.lp_backend`` (see ``mmcp.linear_models.backends``).
+
+        Returns:
+            A tuple containing:
+                - The solver.
+                - The list of the solver variables.
+                - The list of the solver constraints.
+        """
+        backend = resolve_backend(backend, self.num_variables, self.num_constraints, self.num_nonzeros)
+        if backend.solver_id is None:
+            LOGGER.error(f"The {backend} backend solves the first and the second linear models only.")
+            raise SolverError(f"The {backend} backend solves the first and the second linear models only.")
+        LOGGER.debug(f"Loading model with {self.num_variables} variables and {self.num_constraints} constraints "
+                     f"into {backend}")
+
+        solver = pywraplp.Solver.CreateSolver(backend.solver_id)
+        if solver is None:
+            LOGGER.error(f"Unable to create the {backend} solver.")
+            raise SolverError(f"Unable to create the {backend} solver.")
+
+        error = solver.LoadModelFromProto(self.proto)
+        if error:
+            LOGGER.error(f"Unable to load the model into the {backend} solver: {error}")
+            raise SolverError(f"Unable to load the model into the {backend} solver: {error}")
+        if backend.parameters:
+            solver.SetSolverSpecificParametersAsString(backend.parameters)
+
+        variables, constraints = solver.variables(), solver.constraints()
+        if len(constraints) < self.num_constraints:
+            # Free rows are dropped while loading a model; add them back so the indices stay aligned
+            loaded = iter(constraints)
+            constraints = [next(loaded) if row.lower_bound > -inf or row.upper_bound < inf
+                           else add_constraint(solver, [variables[j] for j in row.var_index], row.coefficient)
+                           for row in self.proto.constraint]
+        return solver, variables, constraints
+
+
+def build_model(c, A, b, maximize: bool = True, backend=None):
+    """
+    Builds the model ``max (or min) c^T * x`` subject to ``A * x <= b``, ``x >= 0``.
+
+    Args:
+        c: Vector of coefficients for the objective function.
+        A: Matrix of constraint coefficients (dense or sparse).
+        b: Vector of constraint bounds.
+        maximize: Whether the objective is maximized.
+        backend: The LP backend (see ``LinearModelBuilder.build``).
+
+    Returns:
+        A tuple containing:
+            - The solver.
+            - The list of the solver variables.
+    """
+    builder = LinearModelBuilder(maximize)
+    builder.add_variables(c)
+    builder.add_constraints(A, upper_bounds=b)
+    solver, x, _ = builder.build(backend)
+    return solver, x
+
+
+def set_objective(solver, x, coefficients, maximize: bool):
+    """
+    Replaces the objective of a built model.
+
+    Args:
+        solver: The solver holding the model.
+        x: The solver variables.
+        coefficients: Vector of the new objective coefficients.
+        maximize: Whether the objective is maximized.
+
+    Returns:
+        The solver objective.
+    """
+    objective = solver.Objective()
+    objective.Clear()
+    for variable, coefficient in zip(x, asarray(coefficients, dtype=float64).ravel().tolist()):
+        if coefficient != 0:
+            objective.SetCoefficient(variable, coefficient)
+    objective.SetOptimizationDirection(maximize)
+    return objective
+
+
+def add_constraint(solver, x, coefficients, lower_bound=-inf, upper_bound=inf):
+    """
+    Adds the row ``lower_bound <= coefficients^T * x <= upper_bound`` to a built model.
+
+    Args:
+        solver: The solver holding the model.
+        x: The solver variables.
+        coefficients: Vector of the row coefficients.
+        lower_bound: The row lower bound.
+        upper_bound: The row upper bound.
+
+    Returns:
+        The added constraint.
+    """
+    constraint = solver.Constraint(lower_bound, upper_bound)
+    for variable, coefficient in zip(x, asarray(coefficients, dtype=float64).ravel().tolist()):
+        if coefficient != 0:
+            constraint.SetCoefficient(variable, coefficient)
+    return constraint
+
+
+def solution_values(x) -> list[float]:
+    """Returns the solution values of the given variables."""
+    return [variable.solution_value() for variable in x]
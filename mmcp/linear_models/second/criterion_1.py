@@ -1,10 +1,15 @@
+from numpy import asarray
 from ortools.linear_solver import pywraplp
 
 from mmcp.core import SolverError
-from ...utils.logger_setup import LOGGER
+from ..backends import is_native
+from ..dense_simplex import solve_element, solve_criterion_1
+from ..lexicographic import lexicographic_solve
+from ..model_builder import solution_values
+from ...utils.logger_setup import LOGGER, summary
 
 
-def solve(c, A, b, d, M):
+def solve(c, A, b, d, M, backend=None):
     """
     Solves the first criterion for the second linear model.
 
@@ -14,45 +19,24 @@ def solve(c, A, b, d, M):
         b: Vector of constraint bounds.
         d: Vector of private resources for each element.
         M: A large constant.
+        backend: The LP backend name, "auto", or None for ``Vars.lp_backend`` (see ``linear_models.backends``).
 
     Returns:
         A tuple containing:
             - The optimal solution vector x.
             - The optimal objective value.
     """
-    LOGGER.debug(f"Entering solve function in criterion_1.py (linear_models/second) with: "
-                 f"c={c}, A={A}, b={b}, d={d}, M={M}")
+    LOGGER.debug("Entering solve function in criterion_1.py (linear_models/second) with: c=%s, A=%s, b=%s, d=%s, M=%s",
+                 summary(c), summary(A), summary(b), summary(d), M)
 
-    solver = pywraplp.Solver.CreateSolver("GLOP")
+    if is_native(backend):
+        return solve_element(solve_criterion_1, "the second linear model, first criterion",
+                             asarray(c) + asarray(d), A, b)
 
-    num_vars = len(c)
-    x = [solver.NumVar(0, solver.infinity(), f"x_{i}") for i in range(num_vars)]
-
-    # Add constraints
-    for i in range(len(b)):
-        constraint = solver.Constraint(-solver.infinity(), b[i])
-        for j in range(num_vars):
-            constraint.SetCoefficient(x[j], A[i][j])
-
-    # Solve for z_max
-    objective_max = solver.Objective()
-    for i in range(num_vars):
-        objective_max.SetCoefficient(x[i], c[i] + d[i])  # Include private resources in objective
-    objective_max.SetMaximization()
-    solver.Solve()
-    z_max = objective_max.Value()
-
-    # Solve with the additional constraint z >= z_max
+    # Solve for z_max, then minimize the sum of x_i with the additional constraint z >= z_max
+    # (including private resources in objective)
+    solver_status, solver, x = lexicographic_solve(asarray(c) + asarray(d), A, b, backend=backend)
     objective = solver.Objective()
-    for i in range(num_vars):
-        objective.SetCoefficient(x[i], 1)  # Minimize the sum of x_i
-    objective.SetMinimization()
-
-    z_constraint = solver.Constraint(z_max, solver.infinity())
-    for i in range(num_vars):
-        z_constraint.SetCoefficient(x[i], c[i] + d[i])
-
-    solver_status = solver.Solve()
 
     if solver_status != pywraplp.Solver.OPTIMAL:
         LOGGER.error(f"Unable to find the optimal solution for the second linear model, first criterion. "
@@ -60,9 +44,9 @@ def solve(c, A, b, d, M):
         raise SolverError(f"Unable to find the optimal solution for the second linear model, first criterion. "
                           f"{solver_status=}")
 
-    optimal_x = [x[i].solution_value() for i in range(num_vars)]
+    optimal_x = solution_values(x)
     optimal_objective = objective.Value()
-    LOGGER.info(f"Optimal solution found for the second linear model, first criterion: "
-                f"x={optimal_x}, objective={optimal_objective}")
+    LOGGER.info("Optimal solution found for the second linear model, first criterion: x=%s, objective=%s",
+                summary(optimal_x), optimal_objective)
 
     return optimal_x, optimal_objective
@@ -1,10 +1,15 @@
-from ortools.linear_solver import pywraplp
+from numpy import asarray
 
-from mmcp.core import SolverError
-from ...utils.logger_setup import LOGGER
+from ..backends import is_native, resolve_backend, problem_size
+from ..dense_simplex import solve_element, solve_criterion_3
+from ..first.criterion_3 import WeightingRound, round_solver, iterate_weights
+from ..model_builder import build_model
+from ...utils.config import Vars
+from ...utils.logger_setup import LOGGER, summary
 
 
-def solve(c, A, b, d, weights):
+def solve(c, A, b, d, weights, backend=None, tolerance: float = None, max_iterations: int = None,
+          return_trace: bool = False):
     """
     Solves the third criterion for the second linear model using an iterative procedure.
 
@@ -13,83 +18,37 @@ def solve(c, A, b, d, weights):
         A: Matrix of constraint coefficients.
         b: Vector of constraint bounds.
         d: Vector of private resources for each element.
-        weights: Vector of weights representing the importance of each element.
+        weights: Vector of weights representing the importance of each element (a scalar weights every variable).
+        backend: The LP backend name, "auto", or None for ``Vars.lp_backend`` (see ``linear_models.backends``).
+        tolerance: The convergence tolerance of the objective (``Vars.weights_tolerance`` by default).
+        max_iterations: The maximal number of rounds (``Vars.weights_max_iterations`` by default).
+        return_trace: Whether the rounds are returned as well.
 
     Returns:
         A tuple containing:
             - The optimal solution vector x.
             - The optimal objective value.
+            - With ``return_trace``, the list of the rounds (``WeightingRound``).
     """
-    LOGGER.debug(f"Entering solve function in criterion_3.py (linear_models/second) with: "
-                 f"c={c}, A={A}, b={b}, d={d}, weights={weights}")
-
-    solver = pywraplp.Solver.CreateSolver("GLOP")
-
-    num_vars = len(c)
-    x = [solver.NumVar(0, solver.infinity(), f"x_{i}") for i in range(num_vars)]
-
-    # Add constraints
-    for i in range(len(b)):
-        constraint = solver.Constraint(-solver.infinity(), b[i])
-        for j in range(num_vars):
-            constraint.SetCoefficient(x[j], A[i][j])
-
-    # Iterative procedure
-    tolerance = 1e-6
-    max_iterations = 100
-    z_prev = 0
-
-    objective = solver.Objective()
-    for iteration in range(max_iterations):
-        objective = solver.Objective()
-        for i in range(num_vars):
-            objective.SetCoefficient(x[i], weights[i] * (c[i] + d[i]))  # Include private resources
-        objective.SetMaximization()
-
-        solver_status = solver.Solve()
-
-        if solver_status != pywraplp.Solver.OPTIMAL:
-            LOGGER.error(f"Unable to find the optimal solution for the second linear model, third criterion. "
-                         f"{solver_status=}, {iteration=}")
-            raise SolverError(f"Unable to find the optimal solution for the second linear model, third criterion. "
-                              f"{solver_status=}, {iteration=}")
-
-        z_current = objective.Value()
-
-        if abs(z_current - z_prev) < tolerance:
-            break
-
-        z_prev = z_current
-        # Update weights (implementation depends on the specific update rule)
-        weights = update_weights(weights, x)
-
-    optimal_x = [x[i].solution_value() for i in range(num_vars)]
-    optimal_objective = objective.Value()
-    LOGGER.info(f"Optimal solution found for the second linear model, third criterion: "
-                f"x={optimal_x}, objective={optimal_objective}")
-
-    return optimal_x, optimal_objective
-
-
-def update_weights(weights, x):
-    """
-    Update the weights based on the current solution.
-
-    Args:
-        weights: Vector of weights representing the importance of each element.
-        x: Vector of decision variables.
-
-    Returns:
-        Updated weights.
-    """
-    LOGGER.debug(f"Updating weights in criterion_3.py (linear_models/second) with weights={weights}, x={x}")
-
-    # Update weights based on the current solution
-    weights = [w * xi.solution_value() for w, xi in zip(weights, x)]
-
-    # normalization to not blow up the weights
-    total = sum(weights)
-    weights = [w / total for w in weights if total != 0]
-    LOGGER.debug(f"Updated weights: {weights}")
-
-    return weights
+    LOGGER.debug("Entering solve function in criterion_3.py (linear_models/second) with: c=%s, A=%s, b=%s, d=%s, "
+                 "weights=%s", summary(c), summary(A), summary(b), summary(d), summary(weights))
+
+    tolerance = Vars.weights_tolerance if tolerance is None else tolerance
+    max_iterations = Vars.weights_max_iterations if max_iterations is None else max_iterations
+    z = asarray(c) + asarray(d)  # Include private resources
+    if is_native(backend):
+        rounds = [list()] if return_trace else None
+        solution = solve_element(solve_criterion_3, "the second linear model, third criterion", z, A, b, weights,
+                                 tolerance, max_iterations, rounds)
+        return (*solution, [WeightingRound(*entry) for entry in rounds[0]]) if return_trace else solution
+
+    backend = resolve_backend(backend, *problem_size(A, len(c)))
+    solver, x = build_model(z, A, b, backend=backend)
+    solve_round = round_solver(solver, x, backend, "the second linear model, third criterion")
+    optimal_x, optimal_objective, trace = iterate_weights(solve_round, z, weights, tolerance, max_iterations)
+
+    optimal_x = optimal_x.tolist()
+    LOGGER.info("Optimal solution found for the second linear model, third criterion: x=%s, objective=%s",
+                summary(optimal_x), optimal_objective)
+
+    return (optimal_x, optimal_objective, trace) if return_trace else (optimal_x, optimal_objective)
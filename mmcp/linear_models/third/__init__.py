@@ -1,8 +1,9 @@
-from . import connected_model
+from . import connected_model, decomposition
 from ...utils.logger_setup import LOGGER
 
 LOGGER.debug(f"Initialized {__name__}")
 
 __all__ = [
     "connected_model",
+    "decomposition",
 ]
@@ -1,12 +1,41 @@
+from typing import NamedTuple
+
+from numpy import asarray, zeros, ones, arange, array, concatenate, inf, float64
 from ortools.linear_solver import pywraplp
 
 from mmcp.core import SolverError, ConfigurationError
-from ...utils.logger_setup import LOGGER
+from ..backends import resolve_backend
+from ..model_builder import LinearModelBuilder, set_objective, solution_values
+from ...utils.logger_setup import LOGGER, summary
+
+# The bounds of the connecting constraints: the sum of every variable across the elements
+LINK_LOWER_BOUND = 0.
+LINK_UPPER_BOUND = inf
 
 
-def solve(c_list, A_list, b_list, d_list, model_types, beta):
+def element_objective(c, d, model_type: int, beta):
     """
-    Solves the connected model for the third linear model.
+    The objective of an element in the connected model (the compromise between the center and the element).
+
+    Args:
+        c: Vector of coefficients for the objective function of the element.
+        d: Vector of private resources of the element (None if it uses the first linear model).
+        model_type: The type of model of the element (1 for the first linear model, 2 for the second).
+        beta: The parameter controlling the compromise between the center and the elements.
+
+    Returns:
+        The objective coefficients of the element.
+    """
+    if model_type == 1:
+        return beta * asarray(c)
+    elif model_type == 2:
+        return beta * asarray(c) + (1 - beta) * asarray(d)
+    return zeros(len(c))
+
+
+def build_model(c_list, A_list, b_list, d_list, model_types, beta, backend=None):
+    """
+    Builds the connected model for the third linear model without solving it.
 
     Args:
         c_list: List of coefficient vectors for the objective functions of each element.
@@ -15,44 +44,61 @@ def solve(c_list, A_list, b_list, d_list, model_types, beta):
         d_list: List of private resource vectors for each element (None if an element uses the first linear model).
         model_types: List indicating the type of model for each element (1 for the first linear model, 2 for the second).
         beta: The parameter controlling the compromise between the center and the elements.
+        backend: The LP backend name, "auto" (picked by the size of the whole connected model), or None for
+            ``Vars.lp_backend`` (see ``linear_models.backends``).
 
     Returns:
-        A list of optimal solution vectors for each element.
+        A tuple containing:
+            - The solver.
+            - The list of the variable vectors of each element.
+            - The LP backend the model was built into.
     """
-    LOGGER.debug(f"Entering solve function in connected_model.py with: "
-                 f"c_list={c_list}, A_list={A_list}, b_list={b_list}, "
-                 f"d_list={d_list}, model_types={model_types}, beta={beta}")
-
-    solver = pywraplp.Solver.CreateSolver("GLOP")
+    builder = LinearModelBuilder(maximize=True)  # or maximize=False depending on the problem
 
     num_elements = len(c_list)
-    x_list = list()
+    columns = list()
     for i in range(num_elements):
-        num_vars = len(c_list[i])
-        x_list.append([solver.NumVar(0, solver.infinity(), f"x_{i}_{j}") for j in range(num_vars)])
+        # Define the objective function (compromise between center and elements)
+        columns.append(builder.add_variables(element_objective(c_list[i], d_list[i] if model_types[i] == 2 else None,
+                                                               model_types[i], beta)))
 
-    # Add constraints for each element
-    for i in range(num_elements):
-        for j in range(len(b_list[i])):
-            constraint = solver.Constraint(-solver.infinity(), b_list[i][j])
-            for k in range(len(x_list[i])):
-                constraint.SetCoefficient(x_list[i][k], A_list[i][j][k])
+        # Add constraints for each element
+        builder.add_constraints(A_list[i], upper_bounds=b_list[i], columns=columns[i])
 
     # Add connecting constraints (a sum of corresponding variables across elements is bounded)
-    for j in range(len(c_list[0])):  # Assuming all elements have the same number of variables
-        connecting_constraint = solver.Constraint(0, solver.infinity())  # Adjust bounds as needed
-        for i in range(num_elements):
-            connecting_constraint.SetCoefficient(x_list[i][j], 1)
+    num_vars = len(c_list[0])  # Assuming all elements have the same number of variables
+    connecting_indices = (arange(num_vars)[:, None] + array([element.start for element in columns])[None, :]).ravel()
+    builder.add_sparse_constraints(num_vars, arange(0, num_vars * num_elements + 1, num_elements),
+                                   connecting_indices, ones(num_vars * num_elements),
+                                   lower_bounds=LINK_LOWER_BOUND, upper_bounds=LINK_UPPER_BOUND)
 
-            # Define the objective function (compromise between center and elements)
-    objective = solver.Objective()
-    for i in range(num_elements):
-        for j in range(len(x_list[i])):
-            if model_types[i] == 1:
-                objective.SetCoefficient(x_list[i][j], beta * c_list[i][j])
-            elif model_types[i] == 2:
-                objective.SetCoefficient(x_list[i][j], beta * c_list[i][j] + (1 - beta) * d_list[i][j])
-    objective.SetMaximization()  # or SetMinimization() depending on the problem
+    backend = resolve_backend(backend, builder.num_variables, builder.num_constraints, builder.num_nonzeros)
+    solver, x, _ = builder.build(backend)
+    return solver, [x[element.start:element.stop] for element in columns], backend
+
+
+def solve(c_list, A_list, b_list, d_list, model_types, beta, backend=None):
+    """
+    Solves the connected model for the third linear model.
+
+    Args:
+        c_list: List of coefficient vectors for the objective functions of each element.
+        A_list: List of constraint matrices for each element.
+        b_list: List of constraint bound vectors for each element.
+        d_list: List of private resource vectors for each element (None if an element uses the first linear model).
+        model_types: List indicating the type of model for each element (1 for the first linear model, 2 for the second).
+        beta: The parameter controlling the compromise between the center and the elements.
+        backend: The LP backend name, "auto" (picked by the size of the whole connected model), or None for
+            ``Vars.lp_backend`` (see ``linear_models.backends``).
+
+    Returns:
+        A list of optimal solution vectors for each element.
+    """
+    LOGGER.debug("Entering solve function in connected_model.py with: c_list=%s, A_list=%s, b_list=%s, d_list=%s, "
+                 "model_types=%s, beta=%s",
+                 summary(c_list), summary(A_list), summary(b_list), summary(d_list), summary(model_types), beta)
+
+    solver, x_list, _ = build_model(c_list, A_list, b_list, d_list, model_types, beta, backend)
 
     solver_status = solver.Solve()
     if solver_status != pywraplp.Solver.OPTIMAL:
@@ -62,10 +108,115 @@ def solve(c_list, A_list, b_list, d_list, model_types, beta):
                           f"{solver_status=}")
 
     try:
-        optimal_solutions = [[x.solution_value() for x in element_x] for element_x in x_list]
-        LOGGER.info(f"Optimal solutions found for the connected model: {optimal_solutions}")
+        optimal_solutions = [solution_values(element_x) for element_x in x_list]
+        LOGGER.info("Optimal solutions found for the connected model: %s", summary(optimal_solutions))
     except Exception as e:
         LOGGER.exception(f"Error extracting solution from solver (connected model): {e}")
         raise ConfigurationError(f"Error extracting solution from solver (connected model): {e}") from e
 
     return optimal_solutions
+
+
+class BetaPathPoint(NamedTuple):
+    """The solution of the connected model for one beta of a path (see ``solve_beta_path``)."""
+    LOGGER.debug(f"Initialized {__name__}")
+    beta: float
+    solutions: list
+    objective: float
+    basis_changed: bool
+    solved: bool
+
+
+def _basis(solver):
+    """The basis statuses of the variables and the constraints, or None if the backend reports no basis."""
+    statuses = tuple(variable.basis_status() for variable in solver.variables())
+    statuses += tuple(constraint.basis_status() for constraint in solver.constraints())
+    return statuses if statuses.count(pywraplp.Solver.BASIC) == solver.NumConstraints() else None
+
+
+def solve_beta_path(c_list, A_list, b_list, d_list, model_types, betas, backend=None) -> list[BetaPathPoint]:
+    """
+    Solves the connected model for many values of beta with a single model.
+
+    Beta only enters the objective, so the model is built once and only its objective coefficients change between
+    the steps, and every re-solve starts from the basis of the previous one. The reduced costs of a basis are linear
+    in beta, so a basis that is optimal for two betas is optimal for every beta between them: the betas are bisected
+    from the ends of the path, and the solution of an interval whose ends share the optimal basis is taken for all of
+    its betas without solving. Only the betas around the points where the optimal basis changes are solved. Backends
+    that report no basis (HiGHS, PDLP) solve every beta, still warm-started.
+
+    Args:
+        c_list: List of coefficient vectors for the objective functions of each element.
+        A_list: List of constraint matrices for each element.
+        b_list: List of constraint bound vectors for each element.
+        d_list: List of private resource vectors for each element (None if an element uses the first linear model).
+        model_types: List indicating the type of model for each element (1 for the first linear model, 2 for the
+            second).
+        betas: The values of beta.
+        backend: The LP backend name, "auto" (picked by the size of the whole connected model), or None for
+            ``Vars.lp_backend`` (see ``linear_models.backends``).
+
+    Returns:
+        A point per beta, in the order of ``betas``: the beta, the optimal solution vectors of each element, the
+        optimal objective value, whether the optimal basis differs from the one of the next smaller beta (always
+        True for the smallest beta, and for every solved beta if the backend reports no basis) and whether the model
+        was solved for this beta.
+    """
+    LOGGER.debug("Entering solve_beta_path function in connected_model.py with: c_list=%s, A_list=%s, b_list=%s, "
+                 "d_list=%s, model_types=%s, betas=%s",
+                 summary(c_list), summary(A_list), summary(b_list), summary(d_list), summary(model_types),
+                 summary(betas))
+    path = sorted(set(float(beta) for beta in betas))
+    if not path:
+        return list()
+
+    def objective_coefficients(beta):
+        return concatenate([asarray(element_objective(c_list[i], d_list[i] if model_types[i] == 2 else None,
+                                                      model_types[i], beta), dtype=float64)
+                            for i in range(len(c_list))])
+
+    solver, x_list, backend = build_model(c_list, A_list, b_list, d_list, model_types, path[0], backend)
+    x = [variable for element_x in x_list for variable in element_x]
+    points = dict()
+
+    def solve_at(i):
+        if points:  # The first solve keeps the presolve, the others start from the previous basis
+            set_objective(solver, x, objective_coefficients(path[i]), maximize=True)
+        elif backend.warm_start_parameters:
+            solver.SetSolverSpecificParametersAsString(backend.warm_start_parameters)
+        solver_status = solver.Solve()
+        if solver_status != pywraplp.Solver.OPTIMAL:
+            LOGGER.error(f"Unable to find the optimal solution for the third linear model, connected model. "
+                         f"{solver_status=}, beta={path[i]}")
+            raise SolverError(f"Unable to find the optimal solution for the third linear model, connected model. "
+                              f"{solver_status=}, beta={path[i]}")
+        solutions = [solution_values(element_x) for element_x in x_list]
+        points[i] = solutions, solver.Objective().Value(), _basis(solver), True
+
+    solve_at(0)
+    if len(path) > 1:
+        solve_at(len(path) - 1)
+    intervals = [(0, len(path) - 1)]
+    while intervals:
+        low, high = intervals.pop()
+        if high - low < 2:
+            continue
+        if points[low][2] is not None and points[low][2] == points[high][2]:
+            solutions, basis = points[low][0], points[low][2]
+            flat = concatenate([asarray(solution, dtype=float64) for solution in solutions])
+            for i in range(low + 1, high):
+                points[i] = solutions, float(objective_coefficients(path[i]) @ flat), basis, False
+            continue
+        middle = (low + high) // 2
+        solve_at(middle)
+        intervals += [(low, middle), (middle, high)]
+
+    by_beta = dict()
+    for i, beta in enumerate(path):
+        solutions, objective, basis, solved = points[i]
+        basis_changed = i == 0 or basis is None and solved or basis != points[i - 1][2]
+        by_beta[beta] = BetaPathPoint(beta, solutions, objective, basis_changed, solved)
+    LOGGER.info(f"Solved the connected model for {len(path)} betas with "
+                f"{sum(point.solved for point in by_beta.values())} solves and "
+                f"{sum(point.basis_changed for point in by_beta.values())} optimal bases")
+    return [by_beta[float(beta)] for beta in betas]
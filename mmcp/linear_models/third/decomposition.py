@@ -0,0 +1,226 @@
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+
+from numpy import asarray, array_equal, array_split, arange, zeros, float64
+from ortools.linear_solver import pywraplp
+
+from mmcp.core import SolverError, ConfigurationError
+from .connected_model import LINK_LOWER_BOUND, LINK_UPPER_BOUND, element_objective
+from ..backends import resolve_backend, problem_size
+from ..model_builder import build_model, set_objective, solution_values
+from ...utils.config import Vars
+from ...utils.logger_setup import LOGGER, summary
+
+# The restricted master problem is small and needs exact dual values, which GLOP provides
+MASTER_BACKEND = "GLOP"
+# The objective penalty of the artificial variables that keep the restricted master problem feasible
+ARTIFICIAL_PENALTY = 1e6
+
+# The subproblems of the elements assigned to a worker process, see _init_worker
+_worker_subproblems = None
+
+
+class Subproblems:
+    """
+    The pricing subproblems ``max (f_k - prices)^T * x_k`` subject to ``A_k * x_k <= b_k``, ``x_k >= 0`` of a set of
+    elements. Every model is built once and only its objective changes between the rounds, so a re-solve starts from
+    the basis of the previous one.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+
+    def __init__(self, elements, backend=None):
+        self.models = dict()
+        for k, objective, A, b in elements:
+            element_backend = resolve_backend(backend, *problem_size(A, len(objective)))
+            solver, x = build_model(objective, A, b, maximize=True, backend=element_backend)
+            if element_backend.warm_start_parameters:
+                solver.SetSolverSpecificParametersAsString(element_backend.warm_start_parameters)
+            self.models[k] = asarray(objective, dtype=float64), solver, x
+
+    def solve(self, prices) -> list:
+        """
+        Solves the subproblems for the prices of the connecting constraints.
+
+        Returns:
+            The element index and the optimal solution vector of every element.
+        """
+        solutions = list()
+        for k, (objective, solver, x) in self.models.items():
+            set_objective(solver, x, objective - prices, maximize=True)
+            solver_status = solver.Solve()
+            if solver_status != pywraplp.Solver.OPTIMAL:
+                LOGGER.error(f"Unable to find the optimal solution for the subproblem of Element {k + 1}. "
+                             f"{solver_status=}")
+                raise SolverError(f"Unable to find the optimal solution for the subproblem of Element {k + 1}. "
+                                  f"{solver_status=}")
+            solutions.append((k, solution_values(x)))
+        return solutions
+
+
+def _init_worker(elements, backend):
+    """Builds the subproblems of the elements assigned to a worker process."""
+    global _worker_subproblems
+    _worker_subproblems = Subproblems(elements, backend)
+
+
+def _solve_worker(prices):
+    """Solves the subproblems of a worker process for the prices of the connecting constraints."""
+    return _worker_subproblems.solve(prices)
+
+
+class _RestrictedMaster:
+    """
+    The restricted master problem of the Dantzig-Wolfe decomposition: chooses a convex combination of the proposed
+    solutions (columns) of every element that maximizes the total objective subject to the connecting constraints.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+
+    def __init__(self, num_vars: int, num_elements: int):
+        self.num_vars = num_vars
+        self.solver = pywraplp.Solver.CreateSolver(resolve_backend(MASTER_BACKEND).solver_id)
+        self.links = [self.solver.Constraint(LINK_LOWER_BOUND, LINK_UPPER_BOUND) for _ in range(num_vars)]
+        self.convexity = [self.solver.Constraint(1., 1.) for _ in range(num_elements)]
+        self.objective = self.solver.Objective()
+        self.objective.SetMaximization()
+        self.columns = [list() for _ in range(num_elements)]
+        self.artificials = list()
+
+    def add_artificials(self, totals):
+        """
+        Adds penalized artificial variables to the connecting constraints that the sums ``totals`` of the first
+        columns violate, so the master is feasible before the columns can satisfy them. The other constraints get
+        none, since the first columns already satisfy them (and a degenerate artificial would distort the prices).
+        """
+        for j in ((totals < LINK_LOWER_BOUND) | (totals > LINK_UPPER_BOUND)).nonzero()[0].tolist():
+            artificial = self.solver.NumVar(0., self.solver.infinity(), "")
+            self.links[j].SetCoefficient(artificial, 1. if totals[j] < LINK_LOWER_BOUND else -1.)
+            self.objective.SetCoefficient(artificial, -ARTIFICIAL_PENALTY)
+            self.artificials.append(artificial)
+
+    def add_column(self, k: int, values, value: float):
+        """Adds the solution ``values`` of element k with the objective value ``value`` as a column."""
+        weight = self.solver.NumVar(0., self.solver.infinity(), "")
+        for j in values.nonzero()[0].tolist():
+            self.links[j].SetCoefficient(weight, float(values[j]))
+        self.convexity[k].SetCoefficient(weight, 1.)
+        self.objective.SetCoefficient(weight, value)
+        self.columns[k].append((weight, values))
+
+    def solve(self, iteration: int):
+        solver_status = self.solver.Solve()
+        if solver_status != pywraplp.Solver.OPTIMAL:
+            LOGGER.error(f"Unable to find the optimal solution for the master problem of the connected model. "
+                         f"{solver_status=}, {iteration=}")
+            raise SolverError(f"Unable to find the optimal solution for the master problem of the connected model. "
+                              f"{solver_status=}, {iteration=}")
+        prices = asarray([link.dual_value() for link in self.links], dtype=float64)
+        return self.objective.Value(), prices, [row.dual_value() for row in self.convexity]
+
+    def is_feasible(self, tolerance: float) -> bool:
+        """Whether the artificial variables are zero, i.e. the columns satisfy the connecting constraints."""
+        return all(artificial.solution_value() <= tolerance for artificial in self.artificials)
+
+    def solutions(self) -> list:
+        """The solution vector of every element: the convex combination of its columns."""
+        return [sum((weight.solution_value() * values for weight, values in columns), zeros(self.num_vars))
+                for columns in self.columns]
+
+
+def solve(c_list, A_list, b_list, d_list, model_types, beta, backend=None, workers: int = None,
+          tolerance: float = None, max_iterations: int = None):
+    """
+    Solves the connected model for the third linear model by Dantzig-Wolfe decomposition (column generation).
+
+    The elements are only coupled by the connecting constraints, so every element is solved on its own as a pricing
+    subproblem, with the prices (dual values) of the connecting constraints subtracted from its objective. The
+    restricted master problem combines the proposed solutions of each element and updates the prices, until no
+    subproblem improves the master by more than the tolerance (the gap to the Lagrangian upper bound). The subproblems
+    are split among worker processes, which keep their models alive between the rounds, so memory and time grow
+    linearly with the number of elements. The elements have to be bounded (``A_k * x_k <= b_k``, ``x_k >= 0``).
+
+    Args:
+        c_list: List of coefficient vectors for the objective functions of each element.
+        A_list: List of constraint matrices for each element.
+        b_list: List of constraint bound vectors for each element.
+        d_list: List of private resource vectors for each element (None if an element uses the first linear model).
+        model_types: List indicating the type of model for each element (1 for the first linear model, 2 for the
+            second).
+        beta: The parameter controlling the compromise between the center and the elements.
+        backend: The LP backend of the subproblems, "auto" (picked by the size of each element), or None for
+            ``Vars.lp_backend`` (see ``linear_models.backends``).
+        workers: The number of worker processes (``Vars.decomposition_workers``, or the number of CPUs, by default);
+            1 solves the subproblems in the calling process.
+        tolerance: The relative optimality tolerance (``Vars.decomposition_tolerance`` by default).
+        max_iterations: The maximal number of rounds (``Vars.decomposition_max_iterations`` by default); the best
+            solution found so far is returned if it is reached.
+
+    Returns:
+        A list of optimal solution vectors for each element.
+    """
+    LOGGER.debug("Entering solve function in decomposition.py with: c_list=%s, A_list=%s, b_list=%s, d_list=%s, "
+                 "model_types=%s, beta=%s",
+                 summary(c_list), summary(A_list), summary(b_list), summary(d_list), summary(model_types), beta)
+
+    tolerance = Vars.decomposition_tolerance if tolerance is None else tolerance
+    max_iterations = Vars.decomposition_max_iterations if max_iterations is None else max_iterations
+    workers = Vars.decomposition_workers if workers is None else workers
+    num_elements, num_vars = len(c_list), len(c_list[0])
+    workers = min(workers or cpu_count() or 1, num_elements)
+    if workers < 1 or max_iterations < 1:
+        LOGGER.error(f"Invalid decomposition settings: {workers=}, {max_iterations=}")
+        raise ConfigurationError(f"Invalid decomposition settings: {workers=}, {max_iterations=}")
+    backend = Vars.lp_backend if backend is None else str(backend)  # Worker processes may not share Vars
+
+    objectives = [asarray(element_objective(c_list[k], d_list[k] if model_types[k] == 2 else None, model_types[k],
+                                            beta), dtype=float64) for k in range(num_elements)]
+    chunks = [[(k, objectives[k], A_list[k], b_list[k]) for k in chunk.tolist()]
+              for chunk in array_split(arange(num_elements), workers)]
+
+    master = _RestrictedMaster(num_vars, num_elements)
+    # One single-process pool per chunk, so the models of a chunk stay in the same worker process
+    pools = [ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(chunk, backend))
+             for chunk in chunks] if workers > 1 else list()
+    try:
+        subproblems = None if pools else Subproblems(chunks[0], backend)
+        prices, convexity_prices, previous_prices = zeros(num_vars), zeros(num_elements), None
+        master_objective, solutions = 0., list()
+        for iteration in range(max_iterations):
+            if not array_equal(prices, previous_prices):  # The same prices propose the same solutions again
+                if pools:
+                    futures = [pool.submit(_solve_worker, prices) for pool in pools]
+                    solutions = [solution for future in futures for solution in future.result()]
+                else:
+                    solutions = subproblems.solve(prices)
+                previous_prices = prices
+
+            proposals = list()
+            for k, values in solutions:
+                values = asarray(values, dtype=float64)
+                value = float(objectives[k] @ values)
+                proposals.append((k, values, value, value - float(prices @ values) - convexity_prices[k]))
+
+            # The sum of the reduced costs is the gap between the master and the Lagrangian upper bound
+            gap = sum(max(float(reduced_cost), 0.) for *_, reduced_cost in proposals)
+            if iteration > 0 and gap <= tolerance * max(abs(master_objective), 1.):
+                LOGGER.debug(f"Column generation converged after {iteration} rounds: {master_objective=}, {gap=}")
+                break
+            for k, values, value, reduced_cost in proposals:
+                if iteration == 0 or reduced_cost > tolerance * max(abs(value), 1.):
+                    master.add_column(k, values, value)
+            if iteration == 0:
+                master.add_artificials(sum(values for _, values, *_ in proposals))
+            master_objective, prices, convexity_prices = master.solve(iteration)
+            LOGGER.debug(f"Column generation round {iteration}: {master_objective=}, {gap=}")
+        else:
+            LOGGER.warning(f"Column generation did not converge in {max_iterations} rounds: {master_objective=}")
+    finally:
+        for pool in pools:
+            pool.shutdown(cancel_futures=True)
+
+    if not master.is_feasible(tolerance):
+        LOGGER.error("The connecting constraints of the connected model cannot be satisfied.")
+        raise SolverError("The connecting constraints of the connected model cannot be satisfied.")
+
+    optimal_solutions = [solution.tolist() for solution in master.solutions()]
+    LOGGER.info("Optimal solutions found for the connected model by decomposition: %s", summary(optimal_solutions))
+    return optimal_solutions
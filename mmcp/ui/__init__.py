@@ -1,9 +1,14 @@
-from .CustomTabBar import CustomTabBar
-from .element_configuration_window import ElementConfigurationWindow
-from .load_data_tab import LoadDataTab
-from .solution_display_tab import SolutionDisplayTab
-from .visualization_tab import VisualizationTab
-from ..utils import LOGGER
+from ..utils.lazy import lazy_exports
+from ..utils.logger_setup import LOGGER
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".CustomTabBar": ("CustomTabBar",),
+    ".element_configuration_window": ("ElementConfigurationWindow",),
+    ".load_data_tab": ("LoadDataTab",),
+    ".solution_display_tab": ("SolutionDisplayTab",),
+    ".solve_worker": ("SolveWorker",),
+    ".visualization_tab": ("VisualizationTab",),
+})
 
 LOGGER.debug(f"Initialized {__name__}")
 
@@ -11,6 +16,7 @@
     "ElementConfigurationWindow",
     "LoadDataTab",
     "SolutionDisplayTab",
+    "SolveWorker",
     "VisualizationTab",
     "CustomTabBar",
 ]
@@ -1,5 +1,6 @@
+from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QLineEdit, QDialogButtonBox, QHBoxLayout, QComboBox,
-                             QRadioButton)
+                             QRadioButton, QPushButton, QMessageBox)
 
 from mmcp.core import ConfigurationError
 from mmcp.data import ModelData
@@ -8,6 +9,7 @@
 
 class ElementConfigurationWindow(QDialog):
     LOGGER.debug(f"Initialized {__name__}")
+    value_changed = pyqtSignal(int, str, tuple, float)
 
     def __init__(self, master_data: ModelData, element_data, element_idx):
         """
@@ -20,6 +22,10 @@ def __init__(self, master_data: ModelData, element_data, element_idx):
         self.master_data = master_data
         self.criterion_combo = None
         self.model_radio_buttons = list()
+        self.data_edits = dict()
+        self.edit_key_combo = None
+        self.edit_index_line = None
+        self.edit_value_line = None
         self.setWindowTitle(f"Element {element_idx + 1} Configuration")
         self.element_data = element_data
         self.element_idx = element_idx
@@ -99,6 +105,24 @@ def init_ui(self):
             edit.setReadOnly(True)
             layout.addWidget(label)
             layout.addWidget(edit)
+            self.data_edits[key] = edit
+
+        # What-if edit of a single entry
+        edit_layout = QHBoxLayout()
+        edit_layout.addWidget(QLabel("Edit:", self))
+        self.edit_key_combo = QComboBox(self)
+        self.edit_key_combo.addItems([key for key in ("c", "b", "A", "d") if self.element_data.get(key) is not None])
+        edit_layout.addWidget(self.edit_key_combo)
+        self.edit_index_line = QLineEdit(self)
+        self.edit_index_line.setPlaceholderText("Index (i or i, j)")
+        edit_layout.addWidget(self.edit_index_line)
+        self.edit_value_line = QLineEdit(self)
+        self.edit_value_line.setPlaceholderText("Value")
+        edit_layout.addWidget(self.edit_value_line)
+        apply_button = QPushButton("Apply", self)
+        apply_button.clicked.connect(self.apply_value)  # type: ignore
+        edit_layout.addWidget(apply_button)
+        layout.addLayout(edit_layout)
 
         # Buttons
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
@@ -149,3 +173,20 @@ def set_criterion(self, criterion: int):
         except AssertionError as e:
             LOGGER.exception(f"Error setting criterion ({criterion}): {e}")
             raise ConfigurationError(f"Error setting criterion ({criterion}): {e}") from e
+
+    def apply_value(self):
+        """
+        Parses the what-if edit and emits the value_changed signal for it.
+        """
+        key = self.edit_key_combo.currentText()
+        try:
+            index = tuple(int(part) for part in self.edit_index_line.text().split(","))
+            value = float(self.edit_value_line.text())
+        except ValueError as e:
+            LOGGER.warning(f"Invalid edit of \"{key}\" for element {self.element_idx + 1}: {e}")
+            QMessageBox.warning(self, "Warning", f"Invalid index or value: {e}")
+            return
+
+        LOGGER.debug(f"Applying {key}{list(index)} = {value} for element {self.element_idx + 1}")
+        self.value_changed.emit(self.element_idx, key, index, value)  # type: ignore
+        self.data_edits[key].setText(str(self.element_data[key]))
@@ -3,7 +3,7 @@
 from PyQt5.QtCore import pyqtSignal, Qt
 from PyQt5.QtWidgets import QWidget, QLabel, QPushButton, QFileDialog, QMessageBox, QApplication, QVBoxLayout
 
-from mmcp.data import parse_data_json_file, ModelData
+from mmcp.data import parse_data_file, ModelData
 from mmcp.utils import LOGGER
 
 
@@ -43,7 +43,7 @@ def init_ui(self):
 
         layout = QVBoxLayout(self)
 
-        label = QLabel("Load .json file:", self)
+        label = QLabel("Load data file:", self)
         label.setAlignment(Qt.AlignCenter)
         font = label.font()
         font.setPointSize(32)
@@ -57,18 +57,20 @@ def init_ui(self):
 
     def browse_file(self):
         """
-        Opens a file dialog to browse for a .json file.
+        Opens a file dialog to browse for a .json file or a binary data container (an .npz archive, or the
+        manifest.json of a directory).
         Emits the data_loaded signal if the file is successfully loaded.
         """
         LOGGER.debug("Browse button clicked in LoadDataTab.")
 
         options = QFileDialog.Options()
-        json_filter = "JSON Files (*.json);;All Files (*)"
-        filename, _ = QFileDialog.getOpenFileName(self, "Load .json File", "", json_filter, options=options)
+        json_filter = "JSON Files (*.json);;Binary Data (*.npz *.zip manifest.json);;All Files (*)"
+        filename, _ = QFileDialog.getOpenFileName(self, "Load Data File", "", json_filter, options=options)
         if filename:
             LOGGER.debug(f"Selected file: {filename}")
             try:
-                data = parse_data_json_file(filename)
+                # Binary arrays are memory-mapped copy-on-write, so what-if edits never touch the file
+                data = parse_data_file(filename, mmap_mode="c")
                 if data:
                     LOGGER.info(f"Data loaded successfully from: {filename}")
                     self.data_loaded.emit(data)  # type: ignore
@@ -1,7 +1,10 @@
+from bisect import bisect
+from os.path import splitext
+
 from PyQt5.QtWidgets import QWidget, QTextEdit, QPushButton, QFileDialog, QMessageBox, QVBoxLayout, QHBoxLayout, QLabel
 
 from mmcp.core import FileSavingError
-from mmcp.data import generate_data_json_file, SolutionData
+from mmcp.data import generate_data_file, SolutionData
 from mmcp.utils import LOGGER
 
 
@@ -14,6 +17,7 @@ def __init__(self):
 
         self.text_edit = None
         self.solution = None
+        self.element_indices = list()
         self.solution_time_label = None
         self.filename = "solution.json"
 
@@ -61,7 +65,7 @@ def init_ui(self):
         copy_button.clicked.connect(self.copy_to_clipboard)  # type: ignore
         button_layout.addWidget(copy_button)
 
-        save_button = QPushButton("Save to .json file", self)
+        save_button = QPushButton("Save to file", self)
         save_button.clicked.connect(self.save_to_file)  # type: ignore
         button_layout.addWidget(save_button)
 
@@ -82,6 +86,36 @@ def display_solution(self, solution_data: SolutionData, solution_time: float):
                                     else "No optimal solution found.\nPlease check your input data.")
         self.solution_time_label.setText(f"Solution found in {solution_time:.6f} seconds...")
 
+    def start_solution(self):
+        """
+        Clears the displayed solution before the solutions of the elements arrive one by one.
+        """
+        LOGGER.debug("Starting a new solution in SolutionDisplayTab.")
+
+        self.solution = SolutionData(names=list(), values=list())
+        self.element_indices = list()
+        self.text_edit.setPlainText("Solving...")
+        self.solution_time_label.setText("")
+
+    def add_solution(self, element_idx: int, solution, solution_time: float):
+        """
+        Adds the solution of a single element to the displayed solution, keeping the element order.
+
+        Args:
+            element_idx: The index of the solved element.
+            solution: The solution of the element.
+            solution_time: The time since the solve was started (in seconds).
+        """
+        LOGGER.debug(f"Adding solution of element {element_idx + 1} to SolutionDisplayTab.")
+
+        position = bisect(self.element_indices, element_idx)
+        self.element_indices.insert(position, element_idx)
+        self.solution.names.insert(position, f"Element №{element_idx + 1}")
+        self.solution.values.insert(position, solution)
+        self.text_edit.setPlainText(str(self.solution))
+        self.solution_time_label.setText(f"{len(self.solution.values)} solutions found in {solution_time:.6f} "
+                                         f"seconds...")
+
     def copy_to_clipboard(self):
         """
         Copies the content of the QTextEdit to the clipboard.
@@ -108,17 +142,22 @@ def set_filename(self, filename: str, extension: str = ".json"):
 
     def save_to_file(self):
         """
-        Saves the content of the QTextEdit to a .json file.
+        Saves the solution data to a .json file or a binary .npz archive.
         """
         LOGGER.debug("Saving solution to file.")
 
         options = QFileDialog.Options()
-        save_filter = "JSON Files (*.json)"
-        filename, _ = QFileDialog.getSaveFileName(self, "Save Solution", self.filename, save_filter, options=options)
+        save_filter = "JSON Files (*.json);;NumPy Archives (*.npz)"
+        filename, selected_filter = QFileDialog.getSaveFileName(self, "Save Solution", self.filename, save_filter,
+                                                                options=options)
         if filename:
+            if selected_filter.startswith("NumPy") and not filename.lower().endswith(".npz"):
+                filename += ".npz"
+            elif selected_filter.startswith("JSON") and not splitext(filename)[1]:
+                filename += ".json"
             LOGGER.debug(f"Saving solution to: {filename}")
             try:
-                generate_data_json_file(filename, data=self.solution)
+                generate_data_file(filename, data=self.solution)
                 LOGGER.info(f"Solution saved to: {filename}")
             except FileSavingError as e:
                 LOGGER.exception(f"Failed to save file: {e}")
@@ -0,0 +1,66 @@
+from time import perf_counter
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from mmcp.core import iter_solve
+from mmcp.utils import LOGGER
+
+
+class SolveWorker(QThread):
+    """
+    Solves elements in the background and reports every element as soon as it is solved.
+
+    Cancelling stops the elements that are still queued; the elements being solved at that moment are finished and
+    reported. ``elapsed`` is the wall time of the whole solve, measured in the worker thread.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+
+    element_solved = pyqtSignal(int, object)
+    element_failed = pyqtSignal(int, object)
+    progress = pyqtSignal(int, int)
+    failed = pyqtSignal(object)
+
+    def __init__(self, data, workers, backend, elements, model_types, criteria, sessions=None, parent=None,
+                 combine=False):
+        LOGGER.debug(f"Initializing SolveWorker with {workers} {backend} workers for {len(elements)} elements.")
+        super().__init__(parent)
+        self.data = data
+        self.workers = workers
+        self.backend = backend
+        self.elements = list(elements)
+        self.model_types = model_types
+        self.criteria = criteria
+        self.sessions = sessions
+        self.combine = combine
+        self.cancelled = False
+        self.elapsed = None
+
+    def cancel(self):
+        """Stops the solve after the elements that are currently being solved."""
+        LOGGER.debug("Cancelling solve.")
+        self.cancelled = True
+
+    def run(self):
+        done = 0
+        self.elapsed = None
+        self.progress.emit(done, len(self.elements))  # type: ignore
+        start = perf_counter()
+        try:
+            solutions = iter_solve(self.data, self.workers, self.backend, self.elements, self.model_types,
+                                   self.criteria, self.sessions, combine=self.combine)
+            for element_idx, solution, error in solutions:
+                done += 1
+                if error is not None:
+                    self.element_failed.emit(element_idx, error)  # type: ignore
+                else:
+                    self.element_solved.emit(element_idx, solution)  # type: ignore
+                self.progress.emit(done, len(self.elements))  # type: ignore
+                if self.cancelled:
+                    LOGGER.info(f"Solve cancelled after {done} of {len(self.elements)} elements.")
+                    solutions.close()
+                    break
+        except Exception as e:
+            LOGGER.exception(f"Failed to solve. Error: {e}")
+            self.failed.emit(e)  # type: ignore
+        finally:
+            self.elapsed = perf_counter() - start
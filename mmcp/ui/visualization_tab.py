@@ -1,15 +1,13 @@
-from collections import OrderedDict
-from concurrent.futures import ThreadPoolExecutor
-from time import time
+from time import perf_counter
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (QWidget, QLabel, QTreeWidget, QTreeWidgetItem, QPushButton, QDialog, QMenu, QMessageBox,
-                             QCheckBox, QVBoxLayout, QScrollArea, QGridLayout, QHBoxLayout, QComboBox)
+                             QCheckBox, QVBoxLayout, QScrollArea, QGridLayout, QHBoxLayout, QComboBox, QProgressBar)
 
-from mmcp.core import Solver, ConfigurationError, ModelTypeError, CriterionError
-from mmcp.data import ModelData, SolutionData
-from mmcp.ui import ElementConfigurationWindow
-from mmcp.utils import ModelType, Criterion, ith_data, LOGGER
+from mmcp.core import SolverSession, ConfigurationError, ModelTypeError, CriterionError
+from mmcp.data import ModelData, ELEMENT_FIELDS, tensor_shape
+from mmcp.ui import ElementConfigurationWindow, SolveWorker
+from mmcp.utils import ModelType, Criterion, LOGGER, summary
 
 
 class VisualizationTab(QWidget):
@@ -23,6 +21,13 @@ def __init__(self, tab_widget, solution_display_tab):
         self.tree_widget = None
         self.checkbox_layout = None
         self.threads_combo = None
+        self.backend_combo = None
+        self.combine_checkbox = None
+        self.solve_button = None
+        self.cancel_button = None
+        self.progress_bar = None
+        self.worker = None
+        self.start_time = None
         LOGGER.debug("Initializing VisualizationTab.")
 
         super().__init__()
@@ -33,6 +38,7 @@ def __init__(self, tab_widget, solution_display_tab):
         self.data = ModelData()
         self.elements_checkboxes = list()
         self.config_windows = dict()
+        self.sessions = dict()
 
         self.init_ui()
 
@@ -81,6 +87,14 @@ def init_ui(self):
         solve_button.setCursor(Qt.PointingHandCursor)
         solve_button.clicked.connect(self.solve)  # type: ignore
 
+        cancel_button = QPushButton("Cancel", self)
+        cancel_button.setCursor(Qt.PointingHandCursor)
+        cancel_button.setEnabled(False)
+        cancel_button.clicked.connect(self.cancel_solve)  # type: ignore
+
+        progress_bar = QProgressBar(self)
+        progress_bar.setValue(0)
+
         self.tree_widget = QTreeWidget(self)
         self.tree_widget.setHeaderLabels(["Elements"])
         self.tree_widget.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -101,22 +115,35 @@ def init_ui(self):
         top_right_layout = QVBoxLayout()
         top_right_layout.addWidget(dmc_label)
         top_right_layout.addWidget(solve_button)
+        top_right_layout.addWidget(cancel_button)
+        top_right_layout.addWidget(progress_bar)
         dmc_label.setStyleSheet("padding-bottom: 50px;")
         main_layout.addLayout(top_right_layout, 0, 1)
 
-        # --- Threads Selection ---
+        # --- Workers Selection ---
         threads_layout = QHBoxLayout()
-        threads_label = QLabel("Threads:", self)
+        threads_label = QLabel("Workers:", self)
         threads_layout.addWidget(threads_label)
         self.threads_combo = QComboBox(self)
-        self.threads_combo.addItems(["1", "2", "4", "8", "16", "32"])  # Add thread options
-        self.threads_combo.setCurrentIndex(0)  # Default to 1 thread
+        self.threads_combo.addItems(["1", "2", "4", "8", "16", "32"])  # Add worker options
+        self.threads_combo.setCurrentIndex(0)  # Default to 1 worker
         threads_layout.addWidget(self.threads_combo)
+        self.backend_combo = QComboBox(self)
+        # Processes bypass the GIL; the edited elements are solved through their sessions on both backends
+        self.backend_combo.addItems(["process", "thread"])
+        threads_layout.addWidget(self.backend_combo)
+        self.combine_checkbox = QCheckBox("Combine", self)
+        self.combine_checkbox.setToolTip("Solve the checked elements of the first and the second linear models "
+                                         "with the same criterion as one block-diagonal LP.")
+        threads_layout.addWidget(self.combine_checkbox)
         main_layout.addLayout(threads_layout, 0, 1)
 
         # --- Bottom Row (Elements List) - Span 2 columns ---
         main_layout.addWidget(self.tree_widget, 1, 0, 1, 2)
 
+        self.solve_button = solve_button
+        self.cancel_button = cancel_button
+        self.progress_bar = progress_bar
         self.checkbox_layout = checkbox_layout
         self.master_checkbox = self._create_master_checkbox()
 
@@ -152,62 +179,109 @@ def populate_tree(self):
                 configure_button.clicked.connect(lambda _, idx=i: self.open_configuration_window(idx))  # type: ignore
                 self.tree_widget.setItemWidget(element_item, 1, configure_button)
 
-    # noinspection PyProtectedMember
     def _add_element_data_to_tree(self, element_item, element_idx):
         """Adds element data to the tree widget item."""
         LOGGER.debug(f"Adding data for element {element_idx + 1} to tree widget.")
-        for k, v in self.data._asdict().items():
-            if len(v) > element_idx:
-                QTreeWidgetItem(element_item, [f"{k}: {str(ModelType(v[element_idx]))
-                if k == "model_types" else list(v)[element_idx]}"])
+        element = self.data.element(element_idx)
+        for k in ELEMENT_FIELDS:
+            v = getattr(element, k)
+            if v is not None:
+                QTreeWidgetItem(element_item, [f"{k}: {str(ModelType(v)) if k == "model_types" else v}"])
 
     def solve(self):
         """
-        Solves the optimization problem using the selected number of threads and maintains element order.
+        Starts solving the checked elements in the background with the selected number of workers. The solutions are
+        shown in element order as they arrive.
         """
         LOGGER.debug("Solve button clicked.")
-        solutions = SolutionData(names=list(), values=list())
-
-        num_threads = int(self.threads_combo.currentText())  # Get selected thread count
-        LOGGER.debug(f"Using {num_threads} threads for solving.")
-
-        start_time = time()
-        with ThreadPoolExecutor(max_workers=num_threads) as pool:
-            futures = OrderedDict()
-            for i, checkbox in enumerate(self.elements_checkboxes):
-                if not checkbox.isChecked():
-                    continue
-                LOGGER.debug(f"Submitting solve task for element {i + 1} to thread pool.")
-                futures[i] = pool.submit(self._solve_for_element, i)
-
-            for element_idx, future in futures.items():
-                try:
-                    solution = future.result()
-                    if solution:
-                        LOGGER.info(f"Solution found for element {element_idx + 1}: {solution}")
-                        solutions.names.append(f"Element №{element_idx + 1}")
-                        solutions.values.append(solution)
-                    else:
-                        LOGGER.warning(f"No solution found for Element {element_idx + 1}.")
-                        QMessageBox.warning(self, "Warning", f"No solution found for Element {element_idx + 1}.")
-                except (ConfigurationError, ModelTypeError, CriterionError) as e:
-                    LOGGER.exception(f"Failed to solve for Element {element_idx + 1}. Error: {e}")
-                    QMessageBox.critical(self, "Error", f"Failed to solve for Element {element_idx + 1}. Error: {e}")
-                except Exception as e:
-                    LOGGER.exception(f"An unexpected error occurred: {e}")
-                    QMessageBox.critical(self, "Error", f"An unexpected error occurred: {e}")
-        end_time = time()
-        LOGGER.debug(f"Displaying solutions in SolutionDisplayTab. Time taken: {end_time - start_time:.4f} seconds.")
-        self.solution_display_tab.display_solution(solutions, end_time - start_time)
+        if self.worker is not None and self.worker.isRunning():
+            LOGGER.warning("A solve is already running.")
+            return
+
+        num_workers = int(self.threads_combo.currentText())  # Get selected worker count
+        backend = self.backend_combo.currentText()
+        combine = self.combine_checkbox.isChecked()
+        LOGGER.debug(f"Using {num_workers} {backend} workers for solving, {combine=}.")
+
+        elements = [i for i, checkbox in enumerate(self.elements_checkboxes) if checkbox.isChecked()]
+        self.worker = SolveWorker(self.data, num_workers, backend, elements,
+                                  {i: self.selected_model_type(i) for i in elements},
+                                  {i: self.selected_criterion(i) for i in elements}, self.sessions, self, combine)
+        self.worker.element_solved.connect(self._on_element_solved)  # type: ignore
+        self.worker.element_failed.connect(self._on_element_failed)  # type: ignore
+        self.worker.progress.connect(self._on_progress)  # type: ignore
+        self.worker.failed.connect(self._on_solve_failed)  # type: ignore
+        self.worker.finished.connect(self._on_solve_finished)  # type: ignore
+
+        self.solve_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.solution_display_tab.start_solution()
         self.tab_widget.setCurrentIndex(2)  # Switch to Solution Display tab
+        self.start_time = perf_counter()
+        self.worker.start()
+
+    def cancel_solve(self):
+        """Cancels the running solve; the elements still in the queue are not solved."""
+        LOGGER.debug("Cancel button clicked.")
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_button.setEnabled(False)
+
+    def _on_element_solved(self, element_idx, solution):
+        elapsed = perf_counter() - self.start_time  # Before logging, so the time does not include it
+        if solution:
+            LOGGER.info("Solution found for element %s: %s", element_idx + 1, summary(solution))
+            self.solution_display_tab.add_solution(element_idx, solution, elapsed)
+        else:
+            LOGGER.warning(f"No solution found for Element {element_idx + 1}.")
+            QMessageBox.warning(self, "Warning", f"No solution found for Element {element_idx + 1}.")
 
-    def _solve_for_element(self, element_idx):
-        """Solves the optimization problem for a single element."""
-        LOGGER.debug(f"Solving for element {element_idx + 1} with model type: "
-                     f"{self.selected_model_type(element_idx)} and criterion: {self.selected_criterion(element_idx)}")
-        return Solver(ith_data(self.data, element_idx),
-                      self.selected_model_type(element_idx),
-                      self.selected_criterion(element_idx)).solve()
+    def _on_element_failed(self, element_idx, error):
+        LOGGER.error(f"Failed to solve for Element {element_idx + 1}. Error: {error}")
+        if isinstance(error, (ConfigurationError, ModelTypeError, CriterionError)):
+            QMessageBox.critical(self, "Error", f"Failed to solve for Element {element_idx + 1}. Error: {error}")
+        else:
+            QMessageBox.critical(self, "Error", f"An unexpected error occurred: {error}")
+
+    def _on_progress(self, done, total):
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
+
+    def _on_solve_failed(self, error):
+        QMessageBox.critical(self, "Error", f"Failed to solve. Error: {error}")
+
+    def _on_solve_finished(self):
+        elapsed = self.worker.elapsed if self.worker.elapsed is not None else perf_counter() - self.start_time
+        LOGGER.debug(f"Displaying solutions in SolutionDisplayTab. Time taken: {elapsed:.4f} seconds.")
+        self.solution_display_tab.display_solution(self.solution_display_tab.solution, elapsed)
+        self.solve_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
+    def _session(self, element_idx):
+        """Returns the solver session of the element, keeping its model alive between solves."""
+        session = self.sessions.get(element_idx)
+        if session is None:
+            session = SolverSession(self.data.element(element_idx),
+                                    self.selected_model_type(element_idx),
+                                    self.selected_criterion(element_idx))
+            self.sessions[element_idx] = session
+        else:
+            session.set_model_type(self.selected_model_type(element_idx))
+            session.set_criterion(self.selected_criterion(element_idx))
+        return session
+
+    def update_element_value(self, element_idx, key, index, value):
+        """
+        Applies a what-if edit of a single entry of the element data to its solver session.
+        """
+        LOGGER.debug(f"Updating {key}{list(index)} of element {element_idx + 1} to {value}.")
+        try:
+            self._session(element_idx).update(key, index, value)
+        except ConfigurationError as e:
+            LOGGER.exception(f"Failed to update Element {element_idx + 1}. Error: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to update Element {element_idx + 1}. Error: {e}")
+            return
+        self._update_tree_item(element_idx)
 
     def selected_model_type(self, element_idx):
         """
@@ -240,9 +314,10 @@ def set_data(self, data):
         """
         Sets the data for visualization.
         """
-        LOGGER.debug(f"Setting data in VisualizationTab: {data}")
+        LOGGER.debug("Setting data in VisualizationTab: %s", summary(data))
         self.data = data
-        self.solution_display_tab.set_filename(f"sol_{"x".join(map(str, self.data.A.shape))}")
+        self.sessions.clear()
+        self.solution_display_tab.set_filename(f"sol_{"x".join(map(str, tensor_shape(self.data.A)))}")
         self.populate_tree()
 
     def show_context_menu(self, pos):
@@ -279,10 +354,11 @@ def open_configuration_window(self, element_idx, model_type: ModelType = None):
         Opens the configuration window for the specified element.
         """
         LOGGER.debug(f"Opening configuration window for element {element_idx + 1}.")
-        element_data = {k: list(v)[element_idx] for k, v in self.data._asdict().items() if len(v) > element_idx}
+        element_data = {k: v for k, v in self.data.element(element_idx)._asdict().items() if v is not None}
 
         if element_idx not in self.config_windows:
             self.config_windows[element_idx] = ElementConfigurationWindow(self.data, element_data, element_idx)
+            self.config_windows[element_idx].value_changed.connect(self.update_element_value)  # type: ignore
 
         config_window = self.config_windows.get(element_idx)
 
@@ -1,8 +1,15 @@
 from .config import Vars, Criterion, ModelType
-from .functions import ith_data, measure_execution_time, is_valid_combination
-from .logger_setup import LOGGER
+from .hashing import content_hash
+from .timing import TimingStats, measure, timing_stats
+from .lazy import lazy_exports
+from .logger_setup import LOGGER, summary, set_log_level
 from .outs import with_precision, message
 
+# The functions import the solver, which is only imported on first access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".functions": ("ith_data", "measure_execution_time", "is_valid_combination"),
+})
+
 LOGGER.debug(f"Initialized {__name__}")
 
 __all__ = [
@@ -14,5 +21,11 @@
     "ith_data",
     "measure_execution_time",
     "is_valid_combination",
+    "content_hash",
+    "TimingStats",
+    "measure",
+    "timing_stats",
     "LOGGER",
+    "summary",
+    "set_log_level",
 ]
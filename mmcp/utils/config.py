@@ -15,6 +15,18 @@ class Vars:
     target_difference = .8
     dW = .05
     tolerance = .001
+    scheduling_method = "auto"
+    exact_max_jobs = 20
+    exact_time_limit = 10.
+    lp_backend = "auto"
+    weights_tolerance = 1e-6
+    weights_max_iterations = 100
+    connected_method = "monolithic"
+    decomposition_tolerance = 1e-6
+    decomposition_max_iterations = 100
+    decomposition_workers = None
+    solution_cache_size = 1024
+    solution_cache_dir = None
 
 
 class Criterion(Enum):
@@ -1,18 +1,15 @@
-from time import time
-from typing import List, NamedTuple
-
-from numpy import nan
+from typing import NamedTuple
 
 from .config import ModelType, Criterion
 from .logger_setup import LOGGER
+from .timing import TimingStats, measure
 from ..core.exception import SolverError
 from ..core.solver import Solver
-from ..data import ModelData
+from ..data import element_view
 
 LOGGER.debug(f"Initialized {__name__}")
 
 
-# noinspection PyProtectedMember
 def ith_data(data: NamedTuple, element_idx: int):
     """
     Get the data for the given element index.
@@ -22,40 +19,36 @@ def ith_data(data: NamedTuple, element_idx: int):
         data: The NamedTuple containing the data.
 
     Returns:
-        The data for the element.
+        The cached, zero-copy view of the element (see ``mmcp.data.element_view``).
     """
     LOGGER.debug(f"Retrieving data for element {element_idx + 1}.")
 
-    return ModelData(**{k: list(v)[element_idx] for k, v in data._asdict().items() if len(v) > element_idx})
+    return element_view(data, element_idx)
 
 
-def measure_execution_time(solver: Solver, warmup: int = 10, iterations: int = 10) -> List[float]:
-    """Measures the execution time of the solver.
+def measure_execution_time(solver: Solver, warmup: int = 10, iterations: int = 10,
+                           trace_memory: bool = False) -> TimingStats:
+    """Measures the execution time of the solver (see ``mmcp.utils.timing.measure``), always without the solution
+    cache, so every call solves the model.
 
     Args:
         solver: The Solver instance.
         warmup: Number of warmup iterations.
         iterations: Number of measurement iterations.
+        trace_memory: Whether the peak memory of a solve is measured.
 
     Returns:
-        A list of execution times in seconds. NaN is appended for SolverErrors.
+        The timing statistics; ``times`` has the execution times in seconds, with NaN for SolverErrors.
     """
     LOGGER.debug(f"Measuring execution time for {solver}, {warmup} warmup iterations, {iterations} iterations.")
-    print(f"Measuring execution time for {solver}, {warmup} warmup iterations, {iterations} iterations.")
 
-    times = list()
-    for _ in range(warmup + iterations):
-        try:
-            start_time = time()
-            solver.solve()
-            end_time = time()
-            times.append(end_time - start_time)
-            LOGGER.debug(f"Execution time: {times[-1]:,.6f}")
-            print(f"Execution time: {times[-1]:,.6f}")
-        except SolverError as e:
-            LOGGER.error(f"Solver error: {e}")
-            times.append(nan)
-    return times[warmup:]
+    if solver.use_cache:  # The cache would answer every call after the first one
+        solver = Solver(solver.data, solver.model_type, solver.criterion_type, solver.lp_backend, use_cache=False)
+    stats = measure(solver.solve, iterations, warmup, trace_memory, errors=(SolverError,))
+    if stats.failures:
+        LOGGER.error(f"Solver error in {stats.failures} of {iterations} iterations: {stats.error}")
+    LOGGER.info(f"Execution time of {solver}: {stats}")
+    return stats
 
 
 def is_valid_combination(model_type: ModelType, criterion: Criterion) -> bool:
@@ -0,0 +1,51 @@
+from hashlib import blake2b
+
+from numpy import ascontiguousarray, ndarray, generic
+
+from .logger_setup import LOGGER
+
+LOGGER.debug(f"Initialized {__name__}")
+
+
+def _update(digest, value):
+    """Feeds a single value into the digest, tagging it with its type and shape."""
+    if value is None:
+        digest.update(b"N")
+    elif isinstance(value, (ndarray, generic)):
+        value = ascontiguousarray(value)
+        digest.update(f"a{value.dtype.str}{value.shape}".encode())
+        digest.update(value.data)
+    elif hasattr(value, "tocoo"):
+        coo = value.tocoo()
+        digest.update(f"s{coo.shape}".encode())
+        for part in (coo.row, coo.col, coo.data):
+            _update(digest, part)
+    elif isinstance(value, dict):
+        digest.update(f"d{len(value)}".encode())
+        for key in sorted(value, key=str):
+            _update(digest, str(key))
+            _update(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"l{len(value)}".encode())
+        for item in value:
+            _update(digest, item)
+    else:
+        digest.update(f"v{type(value).__name__}:{value!r}".encode())
+
+
+def content_hash(*values) -> str:
+    """
+    Computes a fast content hash of NumPy arrays, sparse matrices, containers, and scalars.
+
+    Two calls return the same hash only if the values have the same types, shapes, dtypes and contents.
+
+    Args:
+        values: The values to hash.
+
+    Returns:
+        The hexadecimal digest.
+    """
+    digest = blake2b(digest_size=16)
+    for value in values:
+        _update(digest, value)
+    return digest.hexdigest()
@@ -0,0 +1,36 @@
+from importlib import import_module
+from sys import modules
+
+
+def lazy_exports(package: str, exports: dict, submodules: dict = None):
+    """
+    Returns the module ``__getattr__`` and ``__dir__`` (PEP 562) of a package whose names are imported on first access,
+    so importing the package (or one of its submodules) does not import every other submodule and its dependencies.
+
+    Usage: ``__getattr__, __dir__ = lazy_exports(__name__, {".solver": ("Solver",)}, {"lm": ".linear_models"})``.
+
+    Args:
+        package: The name of the package (``__name__``).
+        exports: The names exported by each module, by the module name relative to the package.
+        submodules: The submodules exported under a name, by that name.
+
+    Returns:
+        The ``__getattr__`` and ``__dir__`` functions of the package.
+    """
+    sources = {name: (module, name) for module, names in exports.items() for name in names}
+    sources.update({name: (module, None) for name, module in (submodules or dict()).items()})
+
+    def __getattr__(name: str):
+        if name not in sources:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_name, attribute = sources[name]
+        module = import_module(module_name, package)
+        value = module if attribute is None else getattr(module, attribute)
+        # Replaces the submodule the import may have set under the same name, and skips __getattr__ from now on
+        setattr(modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted({*vars(modules[package]), *sources})
+
+    return __getattr__, __dir__
@@ -1,6 +1,15 @@
-from logging import basicConfig, getLogger, DEBUG
-from os import makedirs
+from atexit import register
+from logging import basicConfig, getLogger, getLevelName, FileHandler, Formatter
+from logging.handlers import QueueHandler, QueueListener
+from os import makedirs, environ, register_at_fork
 from pathlib import Path
+from queue import SimpleQueue, Empty
+from threading import Lock
+
+LOG_LEVEL_ENV = "MMCP_LOG_LEVEL"
+DEFAULT_LOG_LEVEL = "INFO"
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+SUMMARY_MAX_ITEMS = 10
 
 
 def find_project_root(current_path: Path, root_identifier=".git"):
@@ -10,16 +19,128 @@ def find_project_root(current_path: Path, root_identifier=".git"):
     return current_path
 
 
+def log_level(level=None) -> int:
+    """
+    Resolves a log level given by name ("DEBUG", "info", ...) or number; the ``MMCP_LOG_LEVEL`` environment variable
+    (or INFO) is used if it is not given.
+    """
+    level = environ.get(LOG_LEVEL_ENV, DEFAULT_LOG_LEVEL) if level is None else level
+    if isinstance(level, str):
+        level = int(level) if level.strip().isdigit() else getLevelName(level.strip().upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown log level: \"{level}\".")
+    return level
+
+
+class _Summary:
+    """Formats a value for the log only when the record is formatted (see ``summary``)."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return _summarize(self.value)
+
+    __repr__ = __str__
+
+
+def summary(value) -> _Summary:
+    """
+    Wraps a value for a lazily formatted log record: arrays, sparse matrices and containers are shown by their type and
+    shape (small ones by their values), never by their full contents, and only if the record is emitted.
+
+    Usage: ``LOGGER.debug("A=%s", summary(A))``.
+    """
+    return _Summary(value)
+
+
+def _summarize(value) -> str:
+    if hasattr(value, "tocoo") and hasattr(value, "nnz"):
+        return f"{type(value).__name__}(shape={value.shape}, nnz={value.nnz})"
+    if hasattr(value, "shape") and hasattr(value, "dtype"):
+        if value.size <= SUMMARY_MAX_ITEMS:
+            return repr(value.tolist())
+        return f"{type(value).__name__}(shape={value.shape}, dtype={value.dtype})"
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return f"{type(value).__name__}({", ".join(f"{k}={_summarize(v)}" for k, v in zip(value._fields, value))})"
+    if isinstance(value, (list, tuple, dict, set)):
+        if len(value) <= SUMMARY_MAX_ITEMS and not isinstance(value, dict):
+            return f"[{", ".join(_summarize(item) for item in value)}]"
+        return f"{type(value).__name__}(len={len(value)})"
+    return repr(value)
+
+
 PROJECT_ROOT = find_project_root(Path(__file__))
 LOGS_DIR = PROJECT_ROOT / "logs"
 
-makedirs(LOGS_DIR, exist_ok=True)
+# Records are formatted and written by a listener thread, so logging never waits for the disk
+_file_handler = FileHandler(LOGS_DIR / "mmcp.log", encoding="utf-8", delay=True)
+_file_handler.setFormatter(Formatter(LOG_FORMAT))
+_queue = SimpleQueue()
+_listener = None
+_listener_lock = Lock()
+
+
+def _start_listener():
+    """Creates the logs directory and starts the listener, once the first record is emitted."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            makedirs(LOGS_DIR, exist_ok=True)
+            _listener = QueueListener(_queue, _file_handler, respect_handler_level=True)
+            _listener.start()
+            register(_listener.stop)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """A queue handler that starts the listener on its first record, so importing creates no directory or thread."""
+
+    def emit(self, record):
+        if _listener is None:
+            _start_listener()
+        super().emit(record)
+
+
+_queue_handler = _DeferredQueueHandler(_queue)
+_queue_handler.setFormatter(Formatter("%(message)s"))  # The file handler adds the time and the level
+basicConfig(handlers=[_queue_handler], level=log_level())
+
+
+def _restart_listener():
+    """Starts a listener in a forked process, whose copy of the parent listener thread does not run."""
+    global _listener, _listener_lock
+    _listener_lock = Lock()  # The lock may have been held by another thread of the parent
+    if _listener is None:
+        return
+    try:
+        while True:
+            _queue.get_nowait()  # Records of the parent, which are written by the parent
+    except Empty:
+        pass
+    _listener = QueueListener(_queue, _file_handler, respect_handler_level=True)
+    _listener.start()
+
+
+register_at_fork(after_in_child=_restart_listener)
+
+
+def set_log_level(level) -> int:
+    """
+    Sets the level of the log.
+
+    Args:
+        level: The level name ("DEBUG", "INFO", "WARNING", ...) or number.
+
+    Returns:
+        The previous level.
+    """
+    root = getLogger()
+    previous = root.level
+    root.setLevel(log_level(level))
+    return previous
 
-basicConfig(
-    filename=LOGS_DIR / "mmcp.log",
-    level=DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
 
 LOGGER = getLogger(__name__)
 LOGGER.debug(f"Logger initialized at {LOGS_DIR}...")
@@ -26,6 +26,8 @@ def format_value(val):
             return [format_value(item) for item in val]
         elif isinstance(val, dict):
             return {k: format_value(v) for k, v in val.items()}
+        elif hasattr(val, "tocoo"):  # Sparse matrices are summarized instead of densified
+            return repr(val)
         else:
             return val
 
@@ -0,0 +1,137 @@
+from gc import collect, disable, enable, isenabled
+from time import perf_counter_ns, process_time_ns
+from tracemalloc import is_tracing, start as start_tracing, stop as stop_tracing, reset_peak, get_traced_memory
+from typing import NamedTuple, List
+
+from numpy import array, percentile, isnan, nan, float64
+
+from .logger_setup import LOGGER
+
+LOGGER.debug(f"Initialized {__name__}")
+
+NS_PER_SECOND = 1e9
+
+
+class TimingStats(NamedTuple):
+    """
+    The statistics of repeated timed calls. All times are in seconds; the statistics are NaN if every call failed.
+
+    ``times`` has one wall time per measured call, with NaN for the failed calls.
+    """
+    LOGGER.debug(f"Initialized {__name__}")
+    times: List[float]
+    cpu_times: List[float]
+    median: float
+    iqr: float
+    p95: float
+    mean: float
+    min: float
+    max: float
+    cpu_median: float
+    failures: int
+    peak_memory: int = None
+    error: str = None
+
+    def as_dict(self) -> dict:
+        """The statistics without the per-call times, as a JSON-friendly dictionary."""
+        # noinspection PyProtectedMember
+        return {k: v for k, v in self._asdict().items() if k not in ("times", "cpu_times")}
+
+    def __str__(self):
+        memory = "" if self.peak_memory is None else f", peak memory {self.peak_memory:,} B"
+        return (f"median {self.median:.6f}s (IQR {self.iqr:.6f}s, p95 {self.p95:.6f}s), CPU {self.cpu_median:.6f}s, "
+                f"{self.failures} failures{memory}")
+
+
+def timing_stats(times, cpu_times, failures: int = 0, peak_memory: int = None, error: str = None) -> TimingStats:
+    """
+    Summarizes wall and CPU times.
+
+    Args:
+        times: The wall times in seconds (NaN for failed calls).
+        cpu_times: The CPU times in seconds (NaN for failed calls).
+        failures: The number of failed measured calls.
+        peak_memory: The peak traced memory in bytes, if it was measured.
+        error: The message of the last failure.
+    """
+    times, cpu_times = array(times, dtype=float64), array(cpu_times, dtype=float64)
+    valid, cpu_valid = times[~isnan(times)], cpu_times[~isnan(cpu_times)]
+    if valid.size:
+        q25, q50, q75, q95 = percentile(valid, (25, 50, 75, 95)).tolist()
+        mean, minimum, maximum = float(valid.mean()), float(valid.min()), float(valid.max())
+    else:
+        q25 = q50 = q75 = q95 = mean = minimum = maximum = nan
+    cpu_median = float(percentile(cpu_valid, 50)) if cpu_valid.size else nan
+    return TimingStats(times.tolist(), cpu_times.tolist(), q50, q75 - q25, q95, mean, minimum, maximum, cpu_median,
+                       failures, peak_memory, error)
+
+
+def _peak_memory(function, errors) -> int:
+    """Runs the function once with ``tracemalloc`` and returns the peak of the memory it allocated."""
+    tracing = is_tracing()
+    if not tracing:
+        start_tracing()
+    try:
+        reset_peak()
+        baseline = get_traced_memory()[0]
+        try:
+            function()
+        except errors:
+            pass
+        return max(get_traced_memory()[1] - baseline, 0)
+    finally:
+        if not tracing:
+            stop_tracing()
+
+
+def measure(function, iterations: int = 10, warmup: int = 1, trace_memory: bool = False,
+            errors=(Exception,)) -> TimingStats:
+    """
+    Times repeated calls of a function.
+
+    Every call is timed with ``perf_counter_ns`` (wall) and ``process_time_ns`` (CPU of all threads) while the
+    garbage collector is disabled; garbage is collected between the calls, outside the timed section, and nothing
+    is logged or printed inside it. The peak memory is measured in one extra, untimed call, so tracing does not
+    slow down the timed calls.
+
+    Args:
+        function: The function to call without arguments.
+        iterations: The number of measured calls.
+        warmup: The number of calls before measuring.
+        trace_memory: Whether the peak memory of a call is measured with ``tracemalloc``.
+        errors: The exception types that count as failed calls (NaN times); other exceptions are raised.
+
+    Returns:
+        The timing statistics.
+    """
+    times, cpu_times, failures, error = list(), list(), 0, None
+    gc_enabled = isenabled()
+    try:
+        for run in range(warmup + iterations):
+            collect()
+            disable()
+            failed = None
+            start_cpu, start = process_time_ns(), perf_counter_ns()
+            try:
+                function()
+            except errors as e:
+                failed = e
+            end = perf_counter_ns()
+            end_cpu = process_time_ns()
+            if gc_enabled:
+                enable()
+
+            if failed is not None:
+                error = f"{type(failed).__name__}: {failed}"
+            if run >= warmup:
+                failures += failed is not None
+                times.append(nan if failed is not None else (end - start) / NS_PER_SECOND)
+                cpu_times.append(nan if failed is not None else (end_cpu - start_cpu) / NS_PER_SECOND)
+    finally:
+        if gc_enabled:
+            enable()
+
+    peak_memory = _peak_memory(function, errors) if trace_memory else None
+    stats = timing_stats(times, cpu_times, failures, peak_memory, error)
+    LOGGER.debug(f"Measured {iterations} calls after {warmup} warmup calls: {stats}")
+    return stats
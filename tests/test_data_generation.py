@@ -0,0 +1,44 @@
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from numpy import array_equal
+
+from mmcp.data import (PRESETS, generate_model_data, generate_data_json_file, parse_data_json_file, stream_data_file,
+                       tensor_shape, to_dense)
+
+
+class GenerateParseRoundTrip(TestCase):
+    """Every preset is written as a JSON file, streamed or at once, and parsed back to the same data."""
+    NUM_ELEMENTS, NUM_VARS, NUM_JOBS = 5, 8, 6
+
+    def assert_same_data(self, expected, parsed):
+        for field in ("c", "b", "criteria", "model_types", "processing_times", "weights"):
+            self.assertTrue(array_equal(getattr(expected, field), getattr(parsed, field)), field)
+        self.assertEqual(tensor_shape(parsed.A), (self.NUM_ELEMENTS, parsed.b.shape[1], self.NUM_VARS))
+        self.assertTrue(array_equal(to_dense(expected.A), to_dense(parsed.A)))
+        for d_i, parsed_d_i in zip(expected.d, parsed.d):
+            self.assertTrue(d_i is parsed_d_i is None or array_equal(d_i, parsed_d_i))
+        # JSON object keys are strings
+        self.assertEqual(list(map(str, expected.precedence_graph)), list(parsed.precedence_graph))
+        for predecessors, parsed_predecessors in zip(expected.precedence_graph.values(),
+                                                     parsed.precedence_graph.values()):
+            self.assertTrue(array_equal(predecessors, parsed_predecessors))
+
+    def test_presets(self):
+        for preset in PRESETS:
+            with self.subTest(preset=preset), TemporaryDirectory() as directory:
+                data = generate_model_data(self.NUM_ELEMENTS, self.NUM_VARS, self.NUM_JOBS, options=preset)
+
+                generated = join(directory, "generated.json")
+                generate_data_json_file(generated, data=data)
+                self.assert_same_data(data, parse_data_json_file(generated))
+
+                streamed = join(directory, "streamed.json")
+                stream_data_file(streamed, self.NUM_ELEMENTS, self.NUM_VARS, self.NUM_JOBS, chunk_size=2,
+                                 options=preset)
+                self.assert_same_data(data, parse_data_json_file(streamed))
+
+
+if __name__ == "__main__":
+    main()